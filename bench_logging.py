@@ -0,0 +1,80 @@
+"""
+Benchmark logging overhead in a recategorization loop.
+
+Categorizes N synthetic transactions with CategorizationService (user
+rules and keywords, AI disabled) three times: with logging fully disabled,
+at the configured level (INFO unless SPENDSIGHT_LOG_LEVEL is set) and at
+DEBUG, and reports the overhead of each relative to the disabled run.
+
+Usage:
+    python bench_logging.py [--rows 50000] [--repeat 3]
+"""
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import CategoryRule
+from services.categorization_service import CategorizationService
+from utils.logger import get_log_level
+
+CONCEPTS = [
+    "PAGO CON TARJETA MERCADONA MALAGA",
+    "RECIBO NETFLIX",
+    "COMPRA AMAZON.ES",
+    "TRANSFERENCIA A FAVOR DE JUAN",
+    "PAGO GIMNASIO",
+    "CARGO DESCONOCIDO 1234",
+]
+
+
+def run(service: CategorizationService, concepts: list, repeat: int) -> float:
+    """Best wall time of categorizing all concepts."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for concepto in concepts:
+            service.categorize_transaction(concepto, "Pago con tarjeta")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logging overhead")
+    parser.add_argument('--rows', type=int, default=50_000, help="Transactions to categorize")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    service = CategorizationService(db_session=None, project_id=None, enable_ai=False)
+    # User rules without a database: the matched ones log at DEBUG
+    service._rules_cache = [
+        CategoryRule(pattern="netflix", category="🎬 Ocio", priority=100),
+        CategoryRule(pattern="gimnasio", category="🏃 Deporte", priority=100),
+    ]
+    concepts = [CONCEPTS[i % len(CONCEPTS)] for i in range(args.rows)]
+    root = logging.getLogger()
+
+    logging.disable(logging.CRITICAL)
+    baseline = run(service, concepts, args.repeat)
+    logging.disable(logging.NOTSET)
+
+    root.setLevel(get_log_level())
+    configured = run(service, concepts, args.repeat)
+
+    root.setLevel(logging.DEBUG)
+    debug = run(service, concepts, args.repeat)
+    root.setLevel(get_log_level())
+
+    print(f"{args.rows:,} transactions, best of {args.repeat}:")
+    print(f"  logging disabled: {baseline * 1000:8.1f} ms")
+    print(f"  {logging.getLevelName(get_log_level()):>16}: {configured * 1000:8.1f} ms "
+          f"({(configured / baseline - 1) * 100:+.1f}%)")
+    print(f"  {'DEBUG':>16}: {debug * 1000:8.1f} ms ({(debug / baseline - 1) * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Merge near-duplicate AI training examples."""
+import sys
+sys.path.insert(0, 'src')
+
+from models.database import DatabaseManager
+from services.training_compaction_service import TrainingCompactionService
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def format_accuracy(value) -> str:
+    """Format an accuracy fraction, or n/a without held-out transactions."""
+    return "n/a" if value is None else f"{value:.1%}"
+
+
+def compact_training(project_id: int = 1, dry_run: bool = False):
+    """Compact training data."""
+    db = DatabaseManager()
+    session = db.get_session()
+
+    try:
+        print("\n" + "=" * 60)
+        print("COMPACTING AI TRAINING DATA" + (" (DRY RUN)" if dry_run else ""))
+        print("=" * 60 + "\n")
+
+        def progress_callback(message, current, total):
+            print(f"[{current}/{total}] {message}")
+
+        report = TrainingCompactionService(session, project_id).compact(progress_callback, dry_run)
+
+        # Show results
+        print("\n" + "=" * 60)
+        print("✅ TRAINING DATA COMPACTED!" if not dry_run else "✅ DRY RUN COMPLETE (nothing changed)")
+        print("=" * 60)
+        print(f"\nExamples: {report['examples_before']} → {report['examples_after']} "
+              f"({report['removed']} near-duplicates {'found' if dry_run else 'removed'})")
+        print(f"Similarity matrix: {report['matrix_mb_before']:.2f} MB → {report['matrix_mb_after']:.2f} MB")
+        print(f"\nHeld-out accuracy ({report['holdout_size']} transactions):")
+        print(f"  • Before: {format_accuracy(report['accuracy_before'])}")
+        print(f"  • After:  {format_accuracy(report['accuracy_after'])}")
+        print("=" * 60 + "\n")
+
+    except Exception as e:
+        logger.error(f"Training compaction failed: {e}", exc_info=True)
+        print(f"\n❌ Error: {e}\n")
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Merge near-duplicate AI training examples')
+    parser.add_argument('--project-id', type=int, default=1, help='Project ID (default: 1)')
+    parser.add_argument('--dry-run', action='store_true', help='Report without changing anything')
+
+    args = parser.parse_args()
+
+    compact_training(args.project_id, args.dry_run)
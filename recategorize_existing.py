@@ -15,6 +15,7 @@ from models.database import DatabaseManager
 from models.project import Project
 from models.transaction import Transaction
 from services.categorization_service import CategorizationService
+from services.aggregate_service import AggregateService
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -107,7 +108,8 @@ def recategorize_project(project_id: int):
                 session.commit()
                 print(f"  Progress: {i}/{len(transactions)} ({i*100//len(transactions)}%)")
 
-        # Final commit
+        # Final commit (bulk change, so aggregates are rebuilt once)
+        AggregateService(session, project_id).rebuild()
         session.commit()
 
         # Print results
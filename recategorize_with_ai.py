@@ -6,6 +6,7 @@ sys.path.insert(0, 'src')
 from models.database import DatabaseManager
 from models import Transaction
 from services.categorization_service import CategorizationService
+from services.aggregate_service import AggregateService
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -93,6 +94,7 @@ def recategorize_all_transactions(project_id: int, dry_run: bool = True):
 
         # Commit changes
         if not dry_run:
+            AggregateService(session, project_id).rebuild()
             session.commit()
             print("\n✅ Changes saved to database")
         else:
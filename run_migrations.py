@@ -1,4 +1,4 @@
-"""Script to run migration 002 for Phase 2 intelligence features."""
+"""Script to upgrade the database schema to the latest version."""
 import sys
 from pathlib import Path
 
@@ -6,20 +6,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from models.database import DatabaseManager
-from services.migration_002_phase2_intelligence import upgrade
+from services.schema_migrator import SchemaMigrator
 
 def main():
-    """Run the migration."""
-    print("Running migration 002: Phase 2 Intelligence features")
+    """Run pending migrations."""
+    print("Upgrading database schema")
     print("=" * 60)
 
     # Initialize database manager
     db_manager = DatabaseManager()
+    migrator = SchemaMigrator(db_manager)
 
-    # Run migration
+    # Run migrations
     try:
-        upgrade(db_manager)
-        print("\n✅ Migration completed successfully!")
+        applied = migrator.upgrade()
+        print(f"\n✅ Schema at version {migrator.current_version()} ({applied} migrations applied)")
     except Exception as e:
         print(f"\n❌ Migration failed: {e}")
         import traceback
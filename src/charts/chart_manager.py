@@ -1,23 +1,61 @@
 import tkinter as tk
 from tkinter import ttk
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import webbrowser
-import os
+import hashlib
+from pathlib import Path
 from datetime import datetime
 
+from utils.lazy_import import lazy_import
+
+# plotly takes longer to import than the rest of the GUI; load it with the first chart
+go = lazy_import('plotly.graph_objects')
+px = lazy_import('plotly.express')
+plotly_subplots = lazy_import('plotly.subplots')
+plotly_offline = lazy_import('plotly.offline')
+
+# Charts live next to the database, independent of the working directory
+CHARTS_DIR = Path(__file__).parent.parent.parent / "data" / "charts"
+
+DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>SpendSight Dashboard</title>
+<script src="plotly.min.js"></script>
+</head>
+<body>
+{figures}
+</body>
+</html>
+"""
+
 class ChartManager:
-    def __init__(self, parent_frame):
-        self.parent_frame = parent_frame
-        self.setup_charts_tab()
+    # Chart type -> output file name inside CHARTS_DIR
+    CHART_FILES = {
+        'pie': 'category_distribution.html',
+        'bar': 'category_analysis.html',
+        'monthly': 'monthly_overview.html',
+        'dashboard': 'dashboard.html'
+    }
+
+    def __init__(self, charts_frame):
+        """
+        Initialize chart manager.
+
+        Args:
+            charts_frame: Notebook tab frame the chart buttons are placed in
+                by setup_charts_tab()
+        """
+        self.charts_frame = charts_frame
+
+        # Store the last DataFrame for chart updates
+        self.last_df = None
+        self.last_fingerprint = None
+        # Chart type -> fingerprint of the data its file was built from
+        self.built_fingerprints = {}
 
     def setup_charts_tab(self):
-        # Create main frame for charts
-        self.charts_frame = ttk.Frame(self.parent_frame)
-        self.parent_frame.add(self.charts_frame, text="Charts")
-        
         # Create buttons frame
         self.buttons_frame = ttk.Frame(self.charts_frame)
         self.buttons_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -29,26 +67,72 @@ class ChartManager:
                   command=lambda: self.show_chart('bar')).pack(side=tk.LEFT, padx=5)
         ttk.Button(self.buttons_frame, text="View Monthly Overview", 
                   command=lambda: self.show_chart('monthly')).pack(side=tk.LEFT, padx=5)
-        
-        # Store the last DataFrame for chart updates
-        self.last_df = None
+        ttk.Button(self.buttons_frame, text="View Dashboard", 
+                  command=lambda: self.show_chart('dashboard')).pack(side=tk.LEFT, padx=5)
 
     def update_charts(self, df):
+        """
+        Record the data to chart; charts are only built when viewed.
+
+        Args:
+            df: Monthly/category aggregates (AggregateService.get_totals())
+        """
         self.last_df = df
-        self.create_all_charts(df)
+        self.last_fingerprint = self.fingerprint(df)
 
-    def create_all_charts(self, df):
-        # Create a directory for charts if it doesn't exist
-        if not os.path.exists('charts'):
-            os.makedirs('charts')
-        
-        # Create and save all charts
-        self.create_pie_chart(df)
-        self.create_bar_chart(df)
-        self.create_monthly_chart(df)
+    @staticmethod
+    def fingerprint(df):
+        """
+        Hash the contents of an aggregate DataFrame.
+
+        Args:
+            df: Monthly/category aggregates
+
+        Returns:
+            Hex digest that changes whenever any value changes
+        """
+        if df is None:
+            return None
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+        digest.update(",".join(map(str, df.columns)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def write_chart(self, fig, chart_type):
+        """
+        Write a figure as a compact HTML page.
+
+        The page holds only the figure JSON and loads plotly.js from a single
+        plotly.min.js copied once into CHARTS_DIR.
+        """
+        CHARTS_DIR.mkdir(parents=True, exist_ok=True)
+        fig.write_html(CHARTS_DIR / self.CHART_FILES[chart_type], include_plotlyjs='directory')
 
     def create_pie_chart(self, df):
-        category_totals = df.groupby("Categoría")["Importe"].sum().abs()
+        self.write_chart(self.build_pie_chart(df), 'pie')
+
+    def create_bar_chart(self, df):
+        self.write_chart(self.build_bar_chart(df), 'bar')
+
+    def create_monthly_chart(self, df):
+        self.write_chart(self.build_monthly_chart(df), 'monthly')
+
+    def create_dashboard(self, df):
+        """Write one page rendering all three figures with a single plotly.js load."""
+        figures = [self.build_pie_chart(df), self.build_bar_chart(df), self.build_monthly_chart(df)]
+        divs = "\n".join(fig.to_html(full_html=False, include_plotlyjs=False) for fig in figures)
+
+        # Share the plotly.min.js the individual charts load
+        CHARTS_DIR.mkdir(parents=True, exist_ok=True)
+        plotly_js = CHARTS_DIR / "plotly.min.js"
+        if not plotly_js.exists():
+            plotly_js.write_text(plotly_offline.get_plotlyjs(), encoding="utf-8")
+        (CHARTS_DIR / self.CHART_FILES['dashboard']).write_text(
+            DASHBOARD_TEMPLATE.format(figures=divs), encoding="utf-8"
+        )
+
+    def build_pie_chart(self, df):
+        category_totals = df.groupby("Categoría")["Total"].sum().abs()
         
         fig = px.pie(
             values=category_totals.values,
@@ -57,12 +141,15 @@ class ChartManager:
             template="plotly_white"
         )
         
-        fig.write_html('charts/category_distribution.html')
+        return fig
 
-    def create_bar_chart(self, df):
-        category_totals = df.groupby("Categoría")["Importe"].agg(['sum', 'count']).reset_index()
+    def build_bar_chart(self, df):
+        category_totals = df.groupby("Categoría").agg(
+            sum=("Total", "sum"),
+            count=("Cantidad", "sum")
+        ).reset_index()
         
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": True}]])
         
         # Add bars for total amounts
         fig.add_trace(
@@ -95,18 +182,21 @@ class ChartManager:
             template="plotly_white"
         )
         
-        fig.write_html('charts/category_analysis.html')
+        return fig
 
-    def create_monthly_chart(self, df):
-        monthly_data = df.groupby(df["Fecha"].dt.strftime("%Y-%m"))["Importe"].agg(['sum', 'count']).reset_index()
-        monthly_data = monthly_data.sort_values('Fecha')
+    def build_monthly_chart(self, df):
+        monthly_data = df.groupby("Periodo").agg(
+            sum=("Total", "sum"),
+            count=("Cantidad", "sum")
+        ).reset_index()
+        monthly_data = monthly_data.sort_values('Periodo')
         
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": True}]])
         
         # Add bars for monthly totals
         fig.add_trace(
             go.Bar(
-                x=monthly_data["Fecha"],
+                x=monthly_data["Periodo"],
                 y=monthly_data["sum"],
                 name="Monthly Total",
                 marker_color='rgb(55, 83, 109)'
@@ -117,7 +207,7 @@ class ChartManager:
         # Add line for transaction count
         fig.add_trace(
             go.Scatter(
-                x=monthly_data["Fecha"],
+                x=monthly_data["Periodo"],
                 y=monthly_data["count"],
                 name="Transaction Count",
                 mode='lines+markers',
@@ -134,17 +224,27 @@ class ChartManager:
             template="plotly_white"
         )
         
-        fig.write_html('charts/monthly_overview.html')
+        return fig
 
     def show_chart(self, chart_type):
+        """Build the chart if its data changed since it was last built, then open it."""
         if self.last_df is None:
             return
             
-        chart_files = {
-            'pie': 'charts/category_distribution.html',
-            'bar': 'charts/category_analysis.html',
-            'monthly': 'charts/monthly_overview.html'
+        chart_builders = {
+            'pie': self.create_pie_chart,
+            'bar': self.create_bar_chart,
+            'monthly': self.create_monthly_chart,
+            'dashboard': self.create_dashboard
         }
         
-        if chart_type in chart_files:
-            webbrowser.open('file://' + os.path.realpath(chart_files[chart_type])) 
\ No newline at end of file
+        if chart_type not in self.CHART_FILES:
+            return
+
+        chart_path = CHARTS_DIR / self.CHART_FILES[chart_type]
+        if (self.built_fingerprints.get(chart_type) != self.last_fingerprint
+                or not chart_path.exists()):
+            chart_builders[chart_type](self.last_df)
+            self.built_fingerprints[chart_type] = self.last_fingerprint
+
+        webbrowser.open(chart_path.resolve().as_uri()) 
\ No newline at end of file
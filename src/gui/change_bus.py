@@ -0,0 +1,77 @@
+"""Change notifications between GUI components."""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class TransactionChange:
+    """A single persisted edit to one transaction."""
+
+    transaction_id: int
+    fecha: datetime  # Transaction date (locates the aggregate month)
+    importe: float  # Transaction amount
+    columns: Dict[str, Any] = field(default_factory=dict)  # DataFrame column -> new value
+    old_category: Optional[str] = None  # Set when the category changed
+
+
+class ChangeBus:
+    """
+    Synchronous publish/subscribe bus running on the Tk thread.
+
+    Edits publish what changed after committing, and each view patches only
+    the rows and aggregate cells involved instead of reloading the project.
+    Bulk operations (imports, recategorization) still reload everything.
+
+    Usage:
+        bus.subscribe(ChangeBus.TRANSACTION_CHANGED, self.on_transaction_changed)
+        bus.publish(ChangeBus.TRANSACTION_CHANGED, TransactionChange(...))
+    """
+
+    TRANSACTION_CHANGED = 'transaction_changed'
+
+    def __init__(self):
+        """Initialize an empty bus."""
+        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        """
+        Register a callback for a topic.
+
+        Args:
+            topic: Topic name (e.g. ChangeBus.TRANSACTION_CHANGED)
+            callback: Called with the published event
+        """
+        self._subscribers[topic].append(callback)
+
+    def unsubscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        """
+        Remove a callback from a topic.
+
+        Args:
+            topic: Topic name
+            callback: Previously subscribed callback
+        """
+        if callback in self._subscribers[topic]:
+            self._subscribers[topic].remove(callback)
+
+    def publish(self, topic: str, event: Any) -> None:
+        """
+        Deliver an event to every subscriber of a topic.
+
+        A failing subscriber is logged and does not stop the others.
+
+        Args:
+            topic: Topic name
+            event: Event object passed to the callbacks
+        """
+        for callback in list(self._subscribers[topic]):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Error handling '{topic}' event: {e}", exc_info=True)
@@ -6,7 +6,10 @@ from typing import Callable, Optional
 from models.user_preferences import UserPreferences
 from services.model_downloader import ModelDownloader
 from services.initial_training_service import InitialTrainingService
+from services.training_compaction_service import TrainingCompactionService
 from services.ai_categorization_service import AICategorizationService
+from gui.job_runner import JobRunner
+from gui.widgets.progress_dialog import ProgressDialog
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -27,6 +30,7 @@ class SettingsDialog:
         parent,
         db_session,
         project_id: int,
+        job_runner: JobRunner,
         on_save: Optional[Callable] = None
     ):
         """
@@ -36,11 +40,13 @@ class SettingsDialog:
             parent: Parent window
             db_session: Database session
             project_id: Current project ID
+            job_runner: Runner for background jobs (initial training)
             on_save: Optional callback when settings are saved
         """
         self.parent = parent
         self.db_session = db_session
         self.project_id = project_id
+        self.job_runner = job_runner
         self.on_save = on_save
         self._should_recategorize_after_save = False
 
@@ -223,6 +229,7 @@ class SettingsDialog:
         stats_frame = ttk.LabelFrame(self.training_frame, text="Training Statistics", padding=10)
         stats_frame.pack(fill=tk.X, pady=(0, 10))
 
+        training_stats = None
         try:
             ai_service = AICategorizationService(self.db_session, self.project_id)
             training_stats = ai_service.get_training_stats()
@@ -243,7 +250,7 @@ class SettingsDialog:
 
         try:
             initial_training = InitialTrainingService(self.db_session, self.project_id)
-            readiness = initial_training.get_training_readiness()
+            readiness = initial_training.get_training_readiness(training_stats)
 
             readiness_colors = {
                 'excellent': 'green',
@@ -280,6 +287,12 @@ class SettingsDialog:
             command=self.build_initial_training
         ).pack(fill=tk.X, pady=2)
 
+        ttk.Button(
+            actions_frame,
+            text="Compact Training Data (Merge Near-Duplicates)",
+            command=self.compact_training_data
+        ).pack(fill=tk.X, pady=2)
+
         ttk.Button(
             actions_frame,
             text="Clear All Training Data",
@@ -352,7 +365,7 @@ class SettingsDialog:
             )
             # Refresh dialog
             self.dialog.destroy()
-            SettingsDialog(self.parent, self.db_session, self.project_id, self.on_save)
+            SettingsDialog(self.parent, self.db_session, self.project_id, self.job_runner, self.on_save)
         else:
             messagebox.showerror(
                 "Download Failed",
@@ -378,25 +391,14 @@ class SettingsDialog:
         if not response:
             return
 
-        # Create progress window
-        progress_window = tk.Toplevel(self.dialog)
-        progress_window.title("Building Training Data")
-        progress_window.geometry("400x100")
-        progress_window.transient(self.dialog)
-        progress_window.grab_set()
-
-        progress_label = ttk.Label(progress_window, text="Initializing...")
-        progress_label.pack(pady=20)
-
-        def update_progress(message, current, total):
-            progress_label.config(text=f"{message} ({current}/{total})")
-            progress_window.update()
-
-        try:
-            initial_training = InitialTrainingService(self.db_session, self.project_id)
-            stats = initial_training.build_initial_training(progress_callback=update_progress)
+        progress = ProgressDialog(
+            self.dialog,
+            "Building Training Data",
+            on_cancel=lambda: job.cancel()
+        )
 
-            progress_window.destroy()
+        def on_done(stats):
+            progress.close()
 
             messagebox.showinfo(
                 "Training Complete",
@@ -420,15 +422,103 @@ class SettingsDialog:
                 # Mark that we should recategorize
                 self._should_recategorize_after_save = True
 
-        except Exception as e:
-            progress_window.destroy()
-            logger.error(f"Failed to build training: {e}", exc_info=True)
+        def on_error(error):
+            progress.close()
             messagebox.showerror(
                 "Training Failed",
-                f"Failed to build training data:\n\n{str(e)}",
+                f"Failed to build training data:\n\n{str(error)}",
+                parent=self.dialog
+            )
+
+        def on_cancelled():
+            progress.close()
+            messagebox.showinfo(
+                "Training Cancelled",
+                "Building training data was cancelled.",
                 parent=self.dialog
             )
 
+        job = self.job_runner.submit(
+            "initial-training",
+            lambda ctx: InitialTrainingService(ctx.session, self.project_id).build_initial_training(
+                progress_callback=ctx.progress
+            ),
+            on_progress=progress.update_progress,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancelled=on_cancelled
+        )
+
+    def compact_training_data(self):
+        """Merge near-duplicate training examples and report the impact."""
+        response = messagebox.askyesno(
+            "Compact Training Data",
+            "This will merge near-identical AI training examples within each\n"
+            "category, keeping their usage statistics, and delete the duplicates.\n\n"
+            "Accuracy is measured on held-out transactions before and after.\n\n"
+            "Continue?",
+            parent=self.dialog
+        )
+
+        if not response:
+            return
+
+        progress = ProgressDialog(
+            self.dialog,
+            "Compacting Training Data",
+            on_cancel=lambda: job.cancel()
+        )
+
+        def format_accuracy(value):
+            return "n/a" if value is None else f"{value:.1%}"
+
+        def on_done(report):
+            progress.close()
+
+            messagebox.showinfo(
+                "Compaction Complete",
+                f"Examples: {report['examples_before']} → {report['examples_after']}\n"
+                f"Near-duplicates removed: {report['removed']}\n"
+                f"Similarity matrix: {report['matrix_mb_before']:.2f} MB → "
+                f"{report['matrix_mb_after']:.2f} MB\n\n"
+                f"Held-out accuracy ({report['holdout_size']} transactions):\n"
+                f"• Before: {format_accuracy(report['accuracy_before'])}\n"
+                f"• After: {format_accuracy(report['accuracy_after'])}",
+                parent=self.dialog
+            )
+
+            # Refresh training tab
+            for widget in self.training_frame.winfo_children():
+                widget.destroy()
+            self.setup_training_tab()
+
+        def on_error(error):
+            progress.close()
+            messagebox.showerror(
+                "Compaction Failed",
+                f"Failed to compact training data:\n\n{str(error)}",
+                parent=self.dialog
+            )
+
+        def on_cancelled():
+            progress.close()
+            messagebox.showinfo(
+                "Compaction Cancelled",
+                "Compacting training data was cancelled. Nothing was changed.",
+                parent=self.dialog
+            )
+
+        job = self.job_runner.submit(
+            "training-compaction",
+            lambda ctx: TrainingCompactionService(ctx.session, self.project_id).compact(
+                progress_callback=ctx.progress
+            ),
+            on_progress=progress.update_progress,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancelled=on_cancelled
+        )
+
     def clear_training_data(self):
         """Clear all training data."""
         response = messagebox.askyesno(
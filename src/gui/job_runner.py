@@ -0,0 +1,251 @@
+"""Background job execution for long-running GUI operations."""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from models.database import DatabaseManager
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation token has been triggered."""
+
+
+class CancellationToken:
+    """Thread-safe flag used to ask a running job to stop."""
+
+    def __init__(self):
+        """Initialize an untriggered token."""
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if cancellation was requested."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Stop the job if cancellation was requested.
+
+        Raises:
+            JobCancelled: If the token has been cancelled
+        """
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class JobContext:
+    """
+    Handle passed to a job function running on a worker thread.
+
+    Provides the job's own database session, its cancellation token and a
+    progress reporter. ``progress`` matches the ``progress_callback(message,
+    current, total)`` signature used by the services and doubles as a
+    cancellation point.
+    """
+
+    def __init__(self, job: 'Job', session, events: queue.Queue):
+        """
+        Initialize job context.
+
+        Args:
+            job: Job being executed
+            session: Database session owned by this job
+            events: Queue polled by the Tk thread
+        """
+        self.job = job
+        self.session = session
+        self.token = job.token
+        self._events = events
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if cancellation was requested."""
+        return self.token.cancelled
+
+    def raise_if_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested."""
+        self.token.raise_if_cancelled()
+
+    def progress(self, message: str, current: int = 0, total: int = 0) -> None:
+        """
+        Report progress to the GUI and honour pending cancellation.
+
+        Args:
+            message: Status text
+            current: Items processed so far
+            total: Total number of items (0 if unknown)
+
+        Raises:
+            JobCancelled: If the token has been cancelled
+        """
+        self._events.put((self.job, 'progress', (message, current, total)))
+        self.token.raise_if_cancelled()
+
+
+@dataclass(eq=False)
+class Job:
+    """A submitted job and the Tk-thread callbacks for its events."""
+
+    name: str
+    func: Callable[[JobContext], Any]
+    on_progress: Optional[Callable[[str, int, int], None]] = None
+    on_done: Optional[Callable[[Any], None]] = None
+    on_error: Optional[Callable[[Exception], None]] = None
+    on_cancelled: Optional[Callable[[], None]] = None
+    token: CancellationToken = field(default_factory=CancellationToken)
+
+    def cancel(self) -> None:
+        """Request cancellation of this job."""
+        self.token.cancel()
+
+
+class JobRunner:
+    """
+    Runs blocking operations on a thread pool without freezing Tk.
+
+    Every job gets its own database session, committed by the job itself
+    and rolled back on error or cancellation. Workers never touch widgets:
+    progress and results travel through a queue.Queue that the Tk thread
+    drains with root.after, where the job's callbacks are invoked.
+
+    Usage:
+        dialog = ProgressDialog(root, "Importing", on_cancel=lambda: job.cancel())
+        job = runner.submit(
+            "import",
+            lambda ctx: service.do_work(ctx.session, progress_callback=ctx.progress),
+            on_progress=dialog.update_progress,
+            on_done=self.show_results
+        )
+    """
+
+    POLL_INTERVAL_MS = 100
+
+    def __init__(self, root, db_manager: DatabaseManager, max_workers: int = 2):
+        """
+        Initialize job runner.
+
+        Args:
+            root: Tk root (or any widget) used to schedule queue polling
+            db_manager: Database manager providing per-job sessions
+            max_workers: Maximum number of jobs running at the same time
+        """
+        self.root = root
+        self.db_manager = db_manager
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._events: queue.Queue = queue.Queue()
+        self._active = set()
+        self._polling = False
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[[JobContext], Any],
+        on_progress: Optional[Callable[[str, int, int], None]] = None,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None
+    ) -> Job:
+        """
+        Start a job on a worker thread.
+
+        Args:
+            name: Job name used in logs
+            func: Function called with a JobContext; its return value is the result
+            on_progress: Called on the Tk thread with (message, current, total)
+            on_done: Called on the Tk thread with the result
+            on_error: Called on the Tk thread with the raised exception
+            on_cancelled: Called on the Tk thread if the job was cancelled
+
+        Returns:
+            Job handle (use job.cancel() to request cancellation)
+        """
+        job = Job(
+            name=name,
+            func=func,
+            on_progress=on_progress,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancelled=on_cancelled
+        )
+        self._active.add(job)
+        self._executor.submit(self._execute, job)
+        self._schedule_poll()
+        logger.info(f"Started job '{name}'")
+        return job
+
+    @property
+    def busy(self) -> bool:
+        """Check if any job is still running or has undelivered events."""
+        return bool(self._active)
+
+    def cancel_all(self) -> None:
+        """Request cancellation of every running job."""
+        for job in list(self._active):
+            job.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel running jobs and stop the worker threads."""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job: Job) -> None:
+        """Run a job on a worker thread (never touches Tk)."""
+        session = self.db_manager.get_session()
+        try:
+            job.token.raise_if_cancelled()
+            result = job.func(JobContext(job, session, self._events))
+            self._events.put((job, 'done', result))
+        except JobCancelled:
+            session.rollback()
+            logger.info(f"Job '{job.name}' cancelled")
+            self._events.put((job, 'cancelled', None))
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Job '{job.name}' failed: {e}", exc_info=True)
+            self._events.put((job, 'error', e))
+        finally:
+            session.close()
+
+    def _schedule_poll(self) -> None:
+        """Start polling the event queue if not already polling."""
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self) -> None:
+        """Deliver queued job events on the Tk thread."""
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                if kind == 'progress':
+                    if job.on_progress:
+                        job.on_progress(*payload)
+                    continue
+
+                self._active.discard(job)
+                if kind == 'done' and job.on_done:
+                    job.on_done(payload)
+                elif kind == 'error' and job.on_error:
+                    job.on_error(payload)
+                elif kind == 'cancelled' and job.on_cancelled:
+                    job.on_cancelled()
+            except Exception as e:
+                logger.error(f"Error in '{job.name}' {kind} callback: {e}", exc_info=True)
+
+        if self._active:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+        else:
+            self._polling = False
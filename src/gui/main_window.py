@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 from datetime import datetime
 import os
+import time
 import pandas as pd
 
 from models.database import DatabaseManager
@@ -10,31 +11,42 @@ from models.project import Project
 from models.transaction import Transaction
 from services.project_manager import ProjectManager
 from services.migration_service import MigrationService
+from services.transaction_loader import TransactionLoader
+from services.aggregate_service import AggregateService
 from services import CategorizationService, RecurringDetector, SearchService
 from utils.data_processor import DataProcessor, DataProcessingError
 from utils.validators import FileValidationError
 from utils.categories import get_all_categories
+from utils.sort_cache import SortCache
 from charts.chart_manager import ChartManager
 from utils.logger import setup_logger
-from gui.widgets.editable_treeview import CategoryEditableTreeview
+from gui.widgets.editable_treeview import EditableTreeview
+from gui.widgets.virtual_treeview import VirtualTreeview
 from gui.search_panel import SearchPanel
 from gui.widgets.tag_input import TagSelectorDialog
+from gui.widgets.progress_dialog import ProgressDialog
+from gui.job_runner import JobContext, JobRunner
+from gui.change_bus import ChangeBus, TransactionChange
 
 logger = setup_logger(__name__)
 
 class MainWindow:
-    def __init__(self, db_manager: DatabaseManager, project: Project):
+    def __init__(self, db_manager: DatabaseManager, project: Project, started_at: float = None):
         """
         Initialize main window with database integration.
 
         Args:
             db_manager: Database manager instance
             project: Active project
+            started_at: time.perf_counter() when opening the window was requested,
+                so the logged startup times include importing this module (default: now)
         """
+        self._started_at = started_at if started_at is not None else time.perf_counter()
         self.db_manager = db_manager
         self.project = project
         self.project_manager = ProjectManager(db_manager)
         self.migration_service = MigrationService(db_manager)
+        self.transaction_loader = TransactionLoader(db_manager)
 
         # Phase 2 services
         session = db_manager.get_session()
@@ -44,9 +56,23 @@ class MainWindow:
         session.close()
 
         self.root = tk.Tk()
-        self.setup_gui()
+        self.job_runner = JobRunner(self.root, db_manager)
+        self.change_bus = ChangeBus()
+        self.change_bus.subscribe(ChangeBus.TRANSACTION_CHANGED, self.on_transaction_changed)
+        self._recurring_job = None
+        self._search_job = None
+        self._search_options_version = 0
+        self._search_options_loaded = None  # Version the search panel lists reflect
+        self._load_job = None
         self.df = None  # Pandas DataFrame for current view
-        self.load_project_data()
+        self.month_index = {}  # "YYYY-MM" -> row slice of self.df
+        self.totals_df = None  # Monthly/category aggregates for summaries and charts
+        self._sort_cache = None  # Column sort orders of the displayed transactions
+        self._grouped_sort_cache = None  # Column sort orders of the grouped view
+        self.setup_gui()
+
+        # Data is loaded in the background once the empty window is on screen
+        self.root.after_idle(self._on_first_paint)
 
     def setup_gui(self):
         self.root.title(f"Bank Transaction Analyzer - {self.project.name}")
@@ -64,12 +90,9 @@ class MainWindow:
         info_frame = ttk.LabelFrame(self.controls_frame, text="Project Info", padding="5")
         info_frame.pack(fill=tk.X, padx=5, pady=5)
 
-        stats = self.project_manager.get_project_stats(self.project.id)
-        info_text = f"Project: {self.project.name} | Transactions: {stats['transaction_count']}"
-        if stats['earliest_date']:
-            info_text += f" | Period: {stats['earliest_date'].strftime('%Y-%m-%d')} to {stats['latest_date'].strftime('%Y-%m-%d')}"
-
-        ttk.Label(info_frame, text=info_text).pack()
+        # Stats are filled in by load_project_data
+        self.info_label = ttk.Label(info_frame, text=f"Project: {self.project.name} | Transactions: …")
+        self.info_label.pack()
 
         # Create buttons frame
         buttons_frame = ttk.Frame(self.controls_frame)
@@ -100,17 +123,27 @@ class MainWindow:
         self.grouped_frame = ttk.Frame(self.notebook)
         self.search_frame = ttk.Frame(self.notebook)
         self.recurring_frame = ttk.Frame(self.notebook)
+        self.charts_frame = ttk.Frame(self.notebook)
 
         self.notebook.add(self.transactions_frame, text="All Transactions")
         self.notebook.add(self.grouped_frame, text="Grouped by Category")
         self.notebook.add(self.search_frame, text="🔍 Search")
         self.notebook.add(self.recurring_frame, text="🔁 Recurring")
+        self.notebook.add(self.charts_frame, text="Charts")
 
-        # Setup transaction view with editable treeview
+        # Chart data is recorded from the start, the tab's widgets are built lazily
+        self.chart_manager = ChartManager(self.charts_frame)
+
+        # Setup transaction view with editable treeview (the initially selected tab);
+        # the other tabs are built the first time they are selected
         self.setup_all_transactions_tab()
-        self.setup_grouped_tab()
-        self.setup_search_tab()
-        self.setup_recurring_tab()
+        self._tab_builders = {
+            str(self.grouped_frame): self.setup_grouped_tab,
+            str(self.search_frame): self.setup_search_tab,
+            str(self.recurring_frame): self.setup_recurring_tab,
+            str(self.charts_frame): self.chart_manager.setup_charts_tab,
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
 
         # Create summary frame
         self.summary_frame = ttk.Frame(self.main_frame)
@@ -119,14 +152,29 @@ class MainWindow:
         self.summary_text = tk.Text(self.summary_frame, height=3, width=50)
         self.summary_text.pack(side=tk.LEFT, padx=5)
 
-        # Initialize chart manager
-        self.chart_manager = ChartManager(self.notebook)
+    def _on_tab_changed(self, event):
+        """Build a tab the first time it is selected."""
+        builder = self._tab_builders.pop(self.notebook.select(), None)
+        if builder:
+            started = time.perf_counter()
+            builder()
+            logger.debug("Built tab %s in %.0f ms", builder.__name__, (time.perf_counter() - started) * 1000)
+
+    def _is_tab_built(self, frame) -> bool:
+        """Check if a lazily built tab has been built."""
+        return str(frame) not in self._tab_builders
+
+    def _on_first_paint(self):
+        """Log time to first paint, then start loading the project data."""
+        self.root.update_idletasks()
+        logger.info(f"Time to first paint: {(time.perf_counter() - self._started_at) * 1000:.0f} ms")
+        self.load_project_data()
 
     def setup_all_transactions_tab(self):
         """Setup the all transactions tab with editable category column."""
         # Create editable Treeview with confidence and method columns
         columns = ("Fecha", "Concepto", "Movimiento", "Importe", "Categoría", "Confianza", "Método", "Tags", "Source")
-        self.tree = CategoryEditableTreeview(
+        self.tree = VirtualTreeview(
             self.transactions_frame,
             categories=get_all_categories(),
             columns=columns,
@@ -172,6 +220,9 @@ class MainWindow:
         # Bind custom event for Tags editing (generated by CategoryEditableTreeview)
         self.tree.bind('<<TagsEditRequested>>', self._on_tags_edit_requested)
 
+        # Placeholder shown while project data loads
+        self.loading_label = ttk.Label(self.transactions_frame, text="Loading project data...", font=('', 11))
+
         # Add legend for categorization methods
         legend_frame = ttk.Frame(self.transactions_frame)
         legend_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
@@ -200,36 +251,45 @@ class MainWindow:
         if column != "Categoría" or old_value == new_value:
             return
 
-        # Get transaction data from item
-        values = self.tree.item(item_id)['values']
-        fecha = pd.to_datetime(values[0])
-        concepto = values[1]
-        importe = float(values[3].replace("€", "").strip())
+        # Rows of the virtual grid are keyed by transaction id
+        transaction_id = self.tree.get_row_key(item_id)
 
-        logger.info(f"Category changed: {concepto} | {old_value} -> {new_value}")
+        logger.info(f"Category changed: transaction {transaction_id} | {old_value} -> {new_value}")
 
         # Update in database
         session = self.db_manager.get_session()
         try:
             # Find transaction
-            transaction = session.query(Transaction).filter_by(
-                project_id=self.project.id,
-                fecha=fecha,
-                concepto=concepto,
-                importe=importe
-            ).first()
+            transaction = session.get(Transaction, int(transaction_id)) if transaction_id is not None else None
 
             if transaction:
                 # Save original category if first edit
                 if not transaction.is_manually_edited:
                     transaction.categoria_original = old_value
 
+                aggregates = AggregateService(session, self.project.id)
+                aggregates.move(transaction.fecha, transaction.importe, transaction.categoria, new_value)
+
                 # Update category with manual categorization metadata
                 transaction.set_manual_categorization(new_value)
+                aggregates.flush()
                 session.commit()
 
                 logger.info(f"Updated transaction {transaction.id} category to {new_value}")
 
+                # Patch the affected row and aggregate cells
+                self.change_bus.publish(ChangeBus.TRANSACTION_CHANGED, TransactionChange(
+                    transaction_id=transaction.id,
+                    fecha=transaction.fecha,
+                    importe=transaction.importe,
+                    columns={
+                        'Categoría': new_value,
+                        'Categorization_Method': transaction.categorization_method,
+                        'AI_Confidence': float('nan'),
+                    },
+                    old_category=old_value
+                ))
+
                 # 🤖 Phase 2: Ask if user wants to create a rule
                 self.ask_create_rule(session, transaction, new_value)
 
@@ -238,11 +298,8 @@ class MainWindow:
 
                 # Auto-save indicator
                 self.show_save_indicator()
-
-                # Refresh views
-                self.load_project_data()
             else:
-                logger.warning(f"Transaction not found for update: {concepto}")
+                logger.warning(f"Transaction not found for update: {transaction_id}")
 
         except Exception as e:
             logger.error(f"Error updating category: {e}", exc_info=True)
@@ -251,6 +308,66 @@ class MainWindow:
         finally:
             session.close()
 
+    def on_transaction_changed(self, change: TransactionChange):
+        """
+        Patch loaded data after a single transaction was edited.
+
+        Updates the transaction's row in every DataFrame backing the views,
+        re-renders only that grid row and, for category changes, reloads the
+        aggregate cells of the transaction's month.
+
+        Args:
+            change: Published TransactionChange
+        """
+        frames = [self.df, self.tree.data]
+        if self._sort_cache is not None:
+            frames.append(self._sort_cache.df)
+
+        patched = set()
+        for frame in frames:
+            if not isinstance(frame, pd.DataFrame) or id(frame) in patched:
+                continue
+            if change.transaction_id not in frame.index:
+                continue
+            patched.add(id(frame))
+            for column, value in change.columns.items():
+                if isinstance(frame[column].dtype, pd.CategoricalDtype) and value not in frame[column].cat.categories:
+                    frame[column] = frame[column].cat.add_categories([value])
+                frame.loc[change.transaction_id, column] = value
+
+        if self._sort_cache is not None:
+            self._sort_cache.invalidate(*change.columns)
+        self.tree.refresh_row(change.transaction_id)
+
+        if 'Categoría' in change.columns or 'Tags' in change.columns:
+            self.invalidate_search_options()
+
+        if change.old_category is not None:
+            self.refresh_month_totals(AggregateService.month_key(change.fecha))
+
+    def refresh_month_totals(self, month: str):
+        """
+        Reload the aggregate cells of one month and refresh summary views.
+
+        Args:
+            month: "YYYY-MM" month whose totals changed
+        """
+        session = self.db_manager.get_session()
+        try:
+            month_totals = AggregateService(session, self.project.id).get_totals(month)
+        finally:
+            session.close()
+
+        totals = self.totals_df[self.totals_df["Periodo"] != month]
+        if not month_totals.empty:
+            totals = pd.concat([totals, month_totals], ignore_index=True)
+        self.totals_df = totals.sort_values(["Periodo", "Categoría"], ignore_index=True)
+
+        filtered_totals = self.filter_totals_by_month(self.totals_df)
+        self.update_grouped_view(filtered_totals)
+        self.update_summary(filtered_totals)
+        self.chart_manager.update_charts(filtered_totals)
+
     def ask_create_rule(self, session, transaction, new_category):
         """
         Ask user if they want to create a categorization rule.
@@ -266,11 +383,20 @@ class MainWindow:
         if not pattern:
             return
 
+        # Existing transactions of the same merchant (keyed lookup)
+        same_merchant = ""
+        if transaction.merchant_key:
+            count = CategorizationService(session, self.project.id).count_merchant_transactions(
+                transaction.merchant_key
+            )
+            same_merchant = f"Hay {count} transacciones de este comercio.\n"
+
         # Ask user
         response = messagebox.askyesno(
             "Crear regla de categorización",
             f"¿Quieres crear una regla para categorizar automáticamente "
             f"transacciones con '{pattern}' como '{new_category}'?\n\n"
+            f"{same_merchant}"
             f"Las futuras transacciones similares se categorizarán automáticamente.",
             icon='question'
         )
@@ -361,26 +487,18 @@ class MainWindow:
         request = self.tree._tag_edit_request
         item_id = request['item_id']
 
-        # Get the values from the item
-        values = self.tree.item(item_id)['values']
-
-        # Get transaction data (adjusted for new column layout)
-        fecha = pd.to_datetime(values[0])
-        concepto = values[1]
-        importe = float(values[3].replace("€", "").strip())
+        # Rows of the virtual grid are keyed by transaction id
+        transaction_id = self.tree.get_row_key(item_id)
+        if transaction_id is None:
+            return
 
         # Get transaction from database
         session = self.db_manager.get_session()
         try:
-            transaction = session.query(Transaction).filter_by(
-                project_id=self.project.id,
-                fecha=fecha,
-                concepto=concepto,
-                importe=importe
-            ).first()
+            transaction = session.get(Transaction, int(transaction_id))
 
             if not transaction:
-                logger.warning(f"Transaction not found: {concepto}")
+                logger.warning(f"Transaction not found: {transaction_id}")
                 return
 
             # Get all available tags in project
@@ -402,14 +520,19 @@ class MainWindow:
                 transaction.set_tags(new_tags)
                 session.commit()
 
-                logger.info(f"Updated tags for {concepto}: {new_tags}")
+                logger.info(f"Updated tags for {transaction.concepto}: {new_tags}")
+
+                # Patch the affected row
+                self.change_bus.publish(ChangeBus.TRANSACTION_CHANGED, TransactionChange(
+                    transaction_id=transaction.id,
+                    fecha=transaction.fecha,
+                    importe=transaction.importe,
+                    columns={'Tags': ", ".join(transaction.get_tags())}
+                ))
 
                 # Show confirmation
                 self.show_save_indicator()
 
-                # Refresh view
-                self.load_project_data()
-
         except Exception as e:
             logger.error(f"Error updating tags: {e}", exc_info=True)
             messagebox.showerror("Error", f"Error al actualizar tags: {str(e)}")
@@ -430,160 +553,190 @@ class MainWindow:
         """
         Recategorize all transactions using current rules and AI training.
 
-        Shows progress dialog during operation and refreshes UI when complete.
-        Displays statistics about how many transactions were recategorized.
+        Runs as a background job with a cancellable progress dialog and
+        refreshes the UI when complete. Displays statistics about how many
+        transactions were recategorized.
         """
-        # Count total transactions
         session = self.db_manager.get_session()
         try:
             total_count = session.query(Transaction).filter_by(
                 project_id=self.project.id
             ).count()
+        finally:
+            session.close()
 
-            if total_count == 0:
-                session.close()
-                messagebox.showinfo(
-                    "No Data",
-                    "No transactions to recategorize."
-                )
-                return
+        if total_count == 0:
+            messagebox.showinfo(
+                "No Data",
+                "No transactions to recategorize."
+            )
+            return
+
+        progress = ProgressDialog(
+            self.root,
+            "Recategorizing Transactions",
+            on_cancel=lambda: job.cancel()
+        )
 
-            # Create progress window
-            progress_window = tk.Toplevel(self.root)
-            progress_window.title("Recategorizing Transactions")
-            progress_window.geometry("450x120")
-            progress_window.transient(self.root)
-            progress_window.grab_set()
-
-            progress_label = ttk.Label(progress_window, text="Initializing...", font=('', 10))
-            progress_label.pack(pady=15)
-
-            progress_bar = ttk.Progressbar(
-                progress_window,
-                length=400,
-                mode='determinate',
-                maximum=total_count
+        def on_done(stats):
+            progress.close()
+            self._show_recategorization_results(stats)
+            # Refresh UI
+            self.load_project_data()
+
+        def on_error(error):
+            progress.close()
+            messagebox.showerror(
+                "Error",
+                f"Recategorization failed: {str(error)}"
             )
-            progress_bar.pack(pady=10, padx=25)
 
-            status_label = ttk.Label(progress_window, text=f"0/{total_count}", font=('', 9))
-            status_label.pack()
+        def on_cancelled():
+            progress.close()
+            messagebox.showinfo(
+                "Recategorization Cancelled",
+                "Recategorization cancelled.\n\n"
+                "Transactions processed before cancelling keep their new categories."
+            )
+            self.load_project_data()
 
-            # Get all transactions
-            transactions = session.query(Transaction).filter_by(
-                project_id=self.project.id
-            ).order_by(Transaction.id).all()
+        job = self.job_runner.submit(
+            "recategorize",
+            self._recategorize_job,
+            on_progress=progress.update_progress,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancelled=on_cancelled
+        )
 
-            # Track statistics
-            recategorized_count = 0
-            unchanged_count = 0
-            errors = []
+    def _recategorize_job(self, ctx: JobContext) -> dict:
+        """
+        Recategorize every transaction of the project (runs on a worker thread).
 
-            # Reinitialize categorization service for each batch
-            cat_service = CategorizationService(session, self.project.id)
+        Args:
+            ctx: Job context with the job's own session
 
-            # Process transactions in batches
-            batch_size = 50
-            for i, transaction in enumerate(transactions):
-                try:
-                    # Get old category
-                    old_category = transaction.categoria
-                    old_method = transaction.categorization_method
-                    old_confidence = transaction.ai_confidence
-
-                    # Recategorize
-                    result = cat_service.categorize_transaction(
-                        transaction.concepto,
-                        transaction.movimiento
-                    )
+        Returns:
+            Dictionary with recategorized, unchanged and errors
+        """
+        session = ctx.session
 
-                    new_category = result['category']
-                    new_method = result['method']
-                    new_confidence = result['confidence']
-
-                    # Update transaction
-                    transaction.categoria = new_category
-                    transaction.categorization_method = new_method
-                    transaction.ai_confidence = new_confidence if new_confidence > 0 else None
-
-                    # Count changes
-                    if old_category != new_category or old_method != new_method:
-                        recategorized_count += 1
-                    else:
-                        unchanged_count += 1
-
-                    # Commit in batches
-                    if (i + 1) % batch_size == 0:
-                        try:
-                            session.commit()
-                            logger.debug(f"Committed batch: {i + 1}/{total_count}")
-                        except Exception as e:
-                            logger.error(f"Error committing batch: {e}")
-                            session.rollback()
-                            errors.append(f"Batch error at transaction {i + 1}: {str(e)}")
-                            # Continue with next batch
-                            continue
-
-                    # Update progress
-                    progress_bar['value'] = i + 1
-                    status_label.config(text=f"{i + 1}/{total_count}")
-                    progress_label.config(
-                        text=f"Recategorizing transactions... ({recategorized_count} changed)"
-                    )
-                    progress_window.update()
+        # Get all transactions
+        transactions = session.query(Transaction).filter_by(
+            project_id=self.project.id
+        ).order_by(Transaction.id).all()
+        total_count = len(transactions)
 
-                except Exception as e:
-                    logger.error(f"Error recategorizing transaction {transaction.id}: {e}")
-                    errors.append(f"Transaction {transaction.id}: {str(e)}")
-                    unchanged_count += 1
+        # Track statistics
+        recategorized_count = 0
+        unchanged_count = 0
+        errors = []
+
+        cat_service = CategorizationService(session, self.project.id)
+        aggregates = AggregateService(session, self.project.id)
 
-            # Final commit
+        ctx.progress("Recategorizing transactions...", 0, total_count)
+
+        # Process transactions in batches
+        batch_size = 50
+        for i, transaction in enumerate(transactions):
             try:
-                session.commit()
-                logger.info(f"Recategorization complete: {recategorized_count} changed, {unchanged_count} unchanged")
-            except Exception as e:
-                logger.error(f"Error in final commit: {e}")
-                session.rollback()
-                errors.append(f"Final commit error: {str(e)}")
-
-            progress_window.destroy()
-
-            # Show results
-            if errors:
-                error_msg = "\n".join(errors[:5])  # Show first 5 errors
-                if len(errors) > 5:
-                    error_msg += f"\n... and {len(errors) - 5} more errors"
-                messagebox.showwarning(
-                    "Recategorization Complete (With Errors)",
-                    f"Recategorization complete!\n\n"
-                    f"Changed: {recategorized_count} transactions\n"
-                    f"Unchanged: {unchanged_count} transactions\n\n"
-                    f"Errors:\n{error_msg}",
-                    icon='warning'
-                )
-            else:
-                messagebox.showinfo(
-                    "Recategorization Complete",
-                    f"✓ Recategorization complete!\n\n"
-                    f"Changed: {recategorized_count} transactions\n"
-                    f"Unchanged: {unchanged_count} transactions\n\n"
-                    f"The UI is being refreshed with updated categories and confidence indicators."
+                # Get old category
+                old_category = transaction.categoria
+                old_method = transaction.categorization_method
+
+                # Recategorize
+                result = cat_service.categorize_transaction(
+                    transaction.concepto,
+                    transaction.movimiento
                 )
 
-            # Refresh UI
-            self.load_project_data()
+                new_category = result['category']
+                new_method = result['method']
+                new_confidence = result['confidence']
+
+                # Update transaction
+                aggregates.move(transaction.fecha, transaction.importe, old_category, new_category)
+                transaction.categoria = new_category
+                transaction.categorization_method = new_method
+                transaction.ai_confidence = new_confidence if new_confidence > 0 else None
+
+                # Count changes
+                if old_category != new_category or old_method != new_method:
+                    recategorized_count += 1
+                else:
+                    unchanged_count += 1
+
+            except Exception as e:
+                logger.error("Error recategorizing transaction %s: %s", transaction.id, e)
+                errors.append(f"Transaction {transaction.id}: {str(e)}")
+                unchanged_count += 1
 
+            # Commit in batches, then report progress (a cancellation point)
+            if (i + 1) % batch_size == 0:
+                try:
+                    aggregates.flush()
+                    session.commit()
+                    logger.debug("Committed batch: %d/%d", i + 1, total_count)
+                except Exception as e:
+                    logger.error(f"Error committing batch: {e}")
+                    session.rollback()
+                    aggregates.discard()
+                    errors.append(f"Batch error at transaction {i + 1}: {str(e)}")
+
+                ctx.progress(
+                    f"Recategorizing transactions... ({recategorized_count} changed)",
+                    i + 1,
+                    total_count
+                )
+
+        # Final commit
+        try:
+            aggregates.flush()
+            session.commit()
+            logger.info(f"Recategorization complete: {recategorized_count} changed, {unchanged_count} unchanged")
         except Exception as e:
-            logger.error(f"Recategorization error: {e}", exc_info=True)
-            messagebox.showerror(
-                "Error",
-                f"Recategorization failed: {str(e)}"
+            logger.error(f"Error in final commit: {e}")
+            session.rollback()
+            errors.append(f"Final commit error: {str(e)}")
+
+        return {
+            'recategorized': recategorized_count,
+            'unchanged': unchanged_count,
+            'errors': errors
+        }
+
+    def _show_recategorization_results(self, stats: dict):
+        """
+        Show the outcome of a recategorization job.
+
+        Args:
+            stats: Dictionary returned by _recategorize_job
+        """
+        errors = stats['errors']
+        if errors:
+            error_msg = "\n".join(errors[:5])  # Show first 5 errors
+            if len(errors) > 5:
+                error_msg += f"\n... and {len(errors) - 5} more errors"
+            messagebox.showwarning(
+                "Recategorization Complete (With Errors)",
+                f"Recategorization complete!\n\n"
+                f"Changed: {stats['recategorized']} transactions\n"
+                f"Unchanged: {stats['unchanged']} transactions\n\n"
+                f"Errors:\n{error_msg}",
+                icon='warning'
+            )
+        else:
+            messagebox.showinfo(
+                "Recategorization Complete",
+                f"✓ Recategorization complete!\n\n"
+                f"Changed: {stats['recategorized']} transactions\n"
+                f"Unchanged: {stats['unchanged']} transactions\n\n"
+                f"The UI is being refreshed with updated categories and confidence indicators."
             )
-        finally:
-            session.close()
 
     def import_file(self):
-        """Import Excel file into current project."""
+        """Import Excel files into current project as a background job."""
         filenames = filedialog.askopenfilenames(
             filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
         )
@@ -591,143 +744,207 @@ class MainWindow:
         if not filenames:
             return
 
-        try:
-            logger.info(f"Importing {len(filenames)} file(s) to project {self.project.name}")
+        logger.info(f"Importing {len(filenames)} file(s) to project {self.project.name}")
 
-            # 🤖 AI CATEGORIZATION: Create service and pass to importer for immediate AI analysis
-            session = self.db_manager.get_session()
-            cat_service = CategorizationService(session, self.project.id)
+        progress = ProgressDialog(
+            self.root,
+            "Importing Transactions",
+            on_cancel=lambda: job.cancel()
+        )
 
-            stats = self.migration_service.import_excel_to_project(
-                project_id=self.project.id,
-                file_paths=list(filenames),
-                skip_duplicates=True,
-                categorization_service=cat_service  # Pass service to enable AI during import
-            )
-            session.close()
+        def on_done(result):
+            progress.close()
+            stats, categorization_stats = result
+            self._show_import_results(stats, categorization_stats)
+            # Reload data
+            self.load_project_data()
 
-            # 🤖 Phase 2: Collect categorization statistics from imported data
-            categorization_stats = None
-            if stats['imported'] > 0:
-                session = self.db_manager.get_session()
-                try:
-                    # Get recently imported transactions (last minute)
-                    from datetime import datetime, timedelta
-                    recent_cutoff = datetime.now() - timedelta(minutes=1)
-
-                    recent_transactions = session.query(Transaction).filter(
-                        Transaction.project_id == self.project.id,
-                        Transaction.created_at >= recent_cutoff
-                    ).all()
-
-                    # Count categorization methods used during import
-                    categorization_stats = {
-                        'rule': 0,
-                        'ai': 0,
-                        'keyword': 0,
-                        'default': 0
-                    }
-
-                    for txn in recent_transactions:
-                        method = txn.categorization_method
-                        if method in categorization_stats:
-                            categorization_stats[method] += 1
-
-                    # Log results
-                    total_categorized = (
-                        categorization_stats.get('rule', 0) +
-                        categorization_stats.get('ai', 0) +
-                        categorization_stats.get('keyword', 0)
-                    )
-                    if total_categorized > 0:
-                        logger.info(
-                            f"Categorized {total_categorized} transactions during import: "
-                            f"rule={categorization_stats.get('rule', 0)}, "
-                            f"ai={categorization_stats.get('ai', 0)}, "
-                            f"keyword={categorization_stats.get('keyword', 0)}"
-                        )
+        def on_error(error):
+            progress.close()
+            messagebox.showerror("Error", f"Import failed: {str(error)}")
+
+        def on_cancelled():
+            progress.close()
+            messagebox.showinfo("Import Cancelled", "Import cancelled. No transactions were imported.")
+
+        job = self.job_runner.submit(
+            "import",
+            lambda ctx: self._import_job(ctx, list(filenames)),
+            on_progress=progress.update_progress,
+            on_done=on_done,
+            on_error=on_error,
+            on_cancelled=on_cancelled
+        )
 
-                except Exception as e:
-                    logger.error(f"Error collecting categorization stats: {e}", exc_info=True)
-                    categorization_stats = None
-                finally:
-                    session.close()
-
-            # Show results
-            msg = f"Import complete!\n\n"
-            msg += f"Imported: {stats['imported']} transactions\n"
-            msg += f"Skipped (duplicates): {stats['skipped']}\n"
-
-            # Show categorization breakdown if available
-            if categorization_stats:
-                total_cat = (
+    def _import_job(self, ctx: JobContext, file_paths: list) -> tuple:
+        """
+        Import files and collect categorization statistics (runs on a worker thread).
+
+        Args:
+            ctx: Job context with the job's own session, committed once the
+                import and the statistics are done
+            file_paths: Excel files to import
+
+        Returns:
+            Tuple of (import stats, categorization stats or None)
+        """
+        # 🤖 AI CATEGORIZATION: Create service and pass to importer for immediate AI analysis
+        cat_service = CategorizationService(ctx.session, self.project.id)
+
+        stats = self.migration_service.import_excel_to_project(
+            project_id=self.project.id,
+            file_paths=file_paths,
+            skip_duplicates=True,
+            categorization_service=cat_service,  # Pass service to enable AI during import
+            progress_callback=ctx.progress,
+            session=ctx.session
+        )
+
+        # 🤖 Phase 2: Collect categorization statistics from imported data
+        categorization_stats = None
+        if stats['imported'] > 0:
+            try:
+                # Get recently imported transactions (last minute)
+                from datetime import timedelta
+                recent_cutoff = datetime.now() - timedelta(minutes=1)
+
+                recent_transactions = ctx.session.query(Transaction).filter(
+                    Transaction.project_id == self.project.id,
+                    Transaction.created_at >= recent_cutoff
+                ).all()
+
+                # Count categorization methods used during import
+                categorization_stats = {
+                    'rule': 0,
+                    'ai': 0,
+                    'keyword': 0,
+                    'default': 0
+                }
+
+                for txn in recent_transactions:
+                    method = txn.categorization_method
+                    if method in categorization_stats:
+                        categorization_stats[method] += 1
+
+                # Log results
+                total_categorized = (
                     categorization_stats.get('rule', 0) +
                     categorization_stats.get('ai', 0) +
                     categorization_stats.get('keyword', 0)
                 )
-                if total_cat > 0:
-                    msg += f"\nCategorization:\n"
-                    if categorization_stats.get('rule', 0) > 0:
-                        msg += f"  • Rules: {categorization_stats['rule']}\n"
-                    if categorization_stats.get('ai', 0) > 0:
-                        msg += f"  • AI: {categorization_stats['ai']}\n"
-                    if categorization_stats.get('keyword', 0) > 0:
-                        msg += f"  • Keywords: {categorization_stats['keyword']}\n"
+                if total_categorized > 0:
+                    logger.info(
+                        f"Categorized {total_categorized} transactions during import: "
+                        f"rule={categorization_stats.get('rule', 0)}, "
+                        f"ai={categorization_stats.get('ai', 0)}, "
+                        f"keyword={categorization_stats.get('keyword', 0)}"
+                    )
 
-            if stats['errors']:
-                msg += f"\nErrors:\n" + "\n".join(stats['errors'])
+            except Exception as e:
+                logger.error(f"Error collecting categorization stats: {e}", exc_info=True)
+                categorization_stats = None
 
-            messagebox.showinfo("Import Complete", msg)
+        ctx.session.commit()
+        return stats, categorization_stats
 
-            # Reload data
-            self.load_project_data()
+    def _show_import_results(self, stats: dict, categorization_stats: dict = None):
+        """
+        Show the outcome of an import job.
 
-        except Exception as e:
-            logger.error(f"Import error: {e}", exc_info=True)
-            messagebox.showerror("Error", f"Import failed: {str(e)}")
+        Args:
+            stats: Import statistics (imported, skipped, errors)
+            categorization_stats: Optional counts per categorization method
+        """
+        msg = f"Import complete!\n\n"
+        msg += f"Imported: {stats['imported']} transactions\n"
+        msg += f"Skipped (duplicates): {stats['skipped']}\n"
+
+        # Show categorization breakdown if available
+        if categorization_stats:
+            total_cat = (
+                categorization_stats.get('rule', 0) +
+                categorization_stats.get('ai', 0) +
+                categorization_stats.get('keyword', 0)
+            )
+            if total_cat > 0:
+                msg += f"\nCategorization:\n"
+                if categorization_stats.get('rule', 0) > 0:
+                    msg += f"  • Rules: {categorization_stats['rule']}\n"
+                if categorization_stats.get('ai', 0) > 0:
+                    msg += f"  • AI: {categorization_stats['ai']}\n"
+                if categorization_stats.get('keyword', 0) > 0:
+                    msg += f"  • Keywords: {categorization_stats['keyword']}\n"
+
+        if stats['errors']:
+            msg += f"\nErrors:\n" + "\n".join(stats['errors'])
+
+        messagebox.showinfo("Import Complete", msg)
 
     def load_project_data(self):
-        """Load project data from database into DataFrame."""
-        session = self.db_manager.get_session()
-        try:
-            # Get all transactions for project
-            transactions = session.query(Transaction).filter_by(
-                project_id=self.project.id
-            ).order_by(Transaction.fecha.desc()).all()
+        """Load project data in the background and show it when ready."""
+        # A newer load supersedes a running one
+        if self._load_job:
+            self._load_job.cancel()
+
+        self.loading_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self.loading_label.lift()
+
+        def load(ctx):
+            stats = self.project_manager.get_project_stats(self.project.id)
+            df = self.transaction_loader.load_dataframe(self.project.id)
+            month_index = TransactionLoader.build_month_index(df)
+            ctx.raise_if_cancelled()
+
+            aggregates = AggregateService(ctx.session, self.project.id)
+            aggregates.ensure_built()
+            totals = aggregates.get_totals()
+            ctx.raise_if_cancelled()
+            return df, month_index, totals, stats
+
+        def on_error(error):
+            if job is self._load_job:
+                self.loading_label.place_forget()
+            messagebox.showerror("Error", f"Failed to load project data: {str(error)}")
+
+        job = self.job_runner.submit(
+            "load-project",
+            load,
+            on_done=lambda data: self.show_project_data(*data),
+            on_error=on_error
+        )
+        self._load_job = job
 
-            if not transactions:
-                self.df = pd.DataFrame()
-                self.update_month_filter()
-                self.update_filtered_view()
-                return
+    def show_project_data(self, df, month_index, totals, stats):
+        """
+        Display freshly loaded project data in every built view.
+
+        Args:
+            df: Transactions from TransactionLoader.load_dataframe()
+            month_index: Month -> row slice index of df
+            totals: Aggregates from AggregateService.get_totals()
+            stats: Project stats from ProjectManager.get_project_stats()
+        """
+        self._load_job = None
+        self.loading_label.place_forget()
 
-            # Convert to DataFrame
-            data = []
-            for t in transactions:
-                # Format tags for display
-                tags = t.get_tags()
-                tags_str = ", ".join(tags) if tags else ""
-
-                data.append({
-                    'Fecha': t.fecha,
-                    'Concepto': t.concepto,
-                    'Movimiento': t.movimiento,
-                    'Importe': t.importe,
-                    'Categoría': t.categoria,
-                    'AI_Confidence': t.ai_confidence,  # Include AI confidence
-                    'Categorization_Method': t.categorization_method,  # Include method
-                    'Tags': tags_str,
-                    'Source': t.source_file or ''
-                })
-
-            self.df = pd.DataFrame(data)
-            logger.info(f"Loaded {len(self.df)} transactions from database")
-
-            self.update_month_filter()
-            self.update_filtered_view()
+        info_text = f"Project: {self.project.name} | Transactions: {stats['transaction_count']}"
+        if stats['earliest_date']:
+            info_text += f" | Period: {stats['earliest_date'].strftime('%Y-%m-%d')} to {stats['latest_date'].strftime('%Y-%m-%d')}"
+        self.info_label.config(text=info_text)
 
-        finally:
-            session.close()
+        self.df = df
+        self.month_index = month_index
+        self.totals_df = totals
+
+        self.invalidate_search_options()
+        self.update_month_filter()
+        self.update_filtered_view()
+        if self._is_tab_built(self.recurring_frame):
+            self.show_recurring_patterns()
+
+        if not getattr(self, "_data_shown", False):
+            self._data_shown = True
+            logger.info(f"Project data shown after {(time.perf_counter() - self._started_at) * 1000:.0f} ms")
 
     def download_results(self):
         """Download current view to Excel."""
@@ -744,7 +961,7 @@ class MainWindow:
         if filename:
             try:
                 logger.info(f"Saving results to {filename}")
-                filtered_df = self.filter_by_month(self.df)
+                filtered_df = self.filter_by_month(self.df).drop(columns=["Periodo"])
                 filtered_df.to_excel(filename, index=False)
                 logger.info(f"Results saved successfully")
                 messagebox.showinfo("Success", f"Results saved to {filename}")
@@ -779,35 +996,40 @@ class MainWindow:
         # Bind double-click event
         self.grouped_tree.bind("<Double-1>", self.show_category_details)
 
-    def sort_treeview(self, col):
-        items = [(self.tree.set(item, col), item) for item in self.tree.get_children("")]
-
-        # Convert amounts to float for proper sorting
-        if col == "Importe":
-            items = [(float(value.replace("€", "").replace(",", "").strip()), item) for value, item in items]
-
-        # Convert dates for proper sorting
-        elif col == "Fecha":
-            items = [(datetime.strptime(value, "%Y-%m-%d"), item) for value, item in items]
+        if self._grouped_sort_cache is not None:
+            self.render_grouped_rows(self._grouped_sort_cache.df)
+
+    # Treeview column -> backing DataFrame column
+    SORT_COLUMNS = {
+        "Fecha": "Fecha",
+        "Concepto": "Concepto",
+        "Movimiento": "Movimiento",
+        "Importe": "Importe",
+        "Categoría": "Categoría",
+        "Confianza": "AI_Confidence",
+        "Método": "Categorization_Method",
+        "Tags": "Tags",
+        "Source": "Source",
+    }
 
-        items.sort(reverse=getattr(self, "reverse_sort", False))
+    def sort_treeview(self, col):
+        """Sort the transactions grid by a column of the backing DataFrame."""
+        if self._sort_cache is None or self._sort_cache.df.empty:
+            return
 
-        for index, (_, item) in enumerate(items):
-            self.tree.move(item, "", index)
+        ascending = not getattr(self, "reverse_sort", False)
+        sorted_df = self._sort_cache.sorted(self.SORT_COLUMNS[col], ascending)
+        self.tree.set_data(sorted_df, self.format_transaction_rows)
 
         self.reverse_sort = not getattr(self, "reverse_sort", False)
 
     def sort_grouped_treeview(self, col):
-        items = [(self.grouped_tree.set(item, col), item) for item in self.grouped_tree.get_children("")]
-
-        # Convert numeric values for proper sorting
-        if col in ["Total", "Cantidad"]:
-            items = [(float(value.replace("€", "").replace(",", "").strip()), item) for value, item in items]
-
-        items.sort(reverse=getattr(self, "reverse_sort_grouped", False))
+        """Sort the grouped view by a column of its backing DataFrame."""
+        if self._grouped_sort_cache is None or self._grouped_sort_cache.df.empty:
+            return
 
-        for index, (_, item) in enumerate(items):
-            self.grouped_tree.move(item, "", index)
+        ascending = not getattr(self, "reverse_sort_grouped", False)
+        self.render_grouped_rows(self._grouped_sort_cache.sorted(col, ascending))
 
         self.reverse_sort_grouped = not getattr(self, "reverse_sort_grouped", False)
 
@@ -851,60 +1073,113 @@ class MainWindow:
 
     def update_month_filter(self):
         if self.df is not None and not self.df.empty:
-            months = ["All Months"] + sorted(self.df["Fecha"].dt.strftime("%Y-%m").unique().tolist())
+            months = ["All Months"] + sorted(self.month_index)
             self.month_filter["values"] = months
             self.month_filter.set("All Months")
 
     def filter_by_month(self, df):
+        """
+        Restrict loaded transactions to the selected month.
+
+        Args:
+            df: DataFrame from load_project_data (sorted by date)
+
+        Returns:
+            Positional slice of the selected month's rows (all rows for "All Months")
+        """
         if df.empty:
             return df
 
         selected_month = self.month_var.get()
         if selected_month != "All Months":
-            return df[df["Fecha"].dt.strftime("%Y-%m") == selected_month]
+            return df.iloc[self.month_index.get(selected_month, slice(0, 0))]
         return df
 
-    def update_grouped_view(self, df):
-        # Clear previous items
-        for item in self.grouped_tree.get_children():
-            self.grouped_tree.delete(item)
+    def filter_totals_by_month(self, totals):
+        """
+        Restrict monthly aggregates to the selected month.
 
-        if df.empty:
+        Args:
+            totals: Aggregate DataFrame from AggregateService.get_totals()
+
+        Returns:
+            Aggregate rows of the selected month (all rows for "All Months")
+        """
+        if totals is None or totals.empty:
+            return totals
+
+        selected_month = self.month_var.get()
+        if selected_month != "All Months":
+            return totals[totals["Periodo"] == selected_month]
+        return totals
+
+    def update_grouped_view(self, totals):
+        """Show one row per category from the monthly aggregates."""
+        if totals is None or totals.empty:
+            self._grouped_sort_cache = None
+            self.render_grouped_rows(None)
             return
 
-        # Group data
-        grouped = df.groupby("Categoría").agg({
-            "Importe": ["sum", "count"]
-        }).reset_index()
+        # Collapse monthly aggregates into one row per category
+        grouped = totals.groupby("Categoría")[["Total", "Cantidad"]].sum().reset_index()
+        self._grouped_sort_cache = SortCache(grouped)
+        self.render_grouped_rows(grouped)
+
+    def render_grouped_rows(self, grouped):
+        """
+        Replace the grouped view's rows.
+
+        Args:
+            grouped: DataFrame with Categoría, Total and Cantidad (None to clear)
+        """
+        if not self._is_tab_built(self.grouped_frame):
+            return  # Rendered from _grouped_sort_cache when the tab is built
+
+        self.grouped_tree.delete(*self.grouped_tree.get_children())
 
-        # Add items
-        for _, row in grouped.iterrows():
+        if grouped is None:
+            return
+
+        for row in grouped.itertuples(index=False):
             values = (
-                row["Categoría"],
-                f"{row[('Importe', 'sum')]:.2f}€",
-                row[('Importe', 'count')]
+                row.Categoría,
+                f"{row.Total:.2f}€",
+                int(row.Cantidad)
             )
             self.grouped_tree.insert("", tk.END, values=values)
 
     def update_treeview(self, df):
-        """Update treeview with enhanced amount display, confidence indicators, and method."""
-        # Clear previous items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """Show transactions in the virtual grid (only visible rows are rendered)."""
+        self._sort_cache = SortCache(df)
+        self.tree.set_data(df, self.format_transaction_rows)
 
-        if df.empty:
-            return
+    @staticmethod
+    def format_transaction_rows(rows):
+        """
+        Format a window of transactions for display.
+
+        Adds +/- amounts with thousands separators, confidence indicators and
+        categorization method icons.
 
-        # Add items with enhanced formatting
-        for _, row in df.iterrows():
+        Args:
+            rows: DataFrame slice with the visible transactions
+
+        Returns:
+            List of (values, tags) tuples, one per row
+        """
+        method_icons = {
+            'ai': '🤖',      # AI categorization
+            'rule': '📋',    # Rule-based
+            'keyword': '🔑', # Keyword matching
+            'manual': '✋'   # Manual edit
+        }
+
+        formatted = []
+        for row in rows.to_dict('records'):
             # Format amount with +/- and thousands separator
             importe = row['Importe']
-            if importe >= 0:
-                amount_str = f"+{importe:,.2f}€"
-                amount_tag = 'income'
-            else:
-                amount_str = f"{importe:,.2f}€"  # Negative sign already present
-                amount_tag = 'expense'
+            amount_str = EditableTreeview.format_amount(importe)
+            amount_tag = 'income' if importe >= 0 else 'expense'
 
             # Get confidence indicator
             ai_confidence = row.get('AI_Confidence')
@@ -919,14 +1194,7 @@ class MainWindow:
                 confidence_indicator = "⚪"  # No AI (manual/keyword)
 
             # Get categorization method indicator
-            method = row.get('Categorization_Method')
-            method_icons = {
-                'ai': '🤖',      # AI categorization
-                'rule': '📋',    # Rule-based
-                'keyword': '🔑', # Keyword matching
-                'manual': '✋'   # Manual edit
-            }
-            method_indicator = method_icons.get(method, '')
+            method_indicator = method_icons.get(row.get('Categorization_Method'), '')
 
             # Determine if uncertain (medium confidence) for background color
             tags = [amount_tag]
@@ -944,17 +1212,18 @@ class MainWindow:
                 row.get("Tags", ""),
                 row["Source"]
             )
-            self.tree.insert("", tk.END, values=values, tags=tuple(tags))
+            formatted.append((values, tuple(tags)))
+        return formatted
 
-    def update_summary(self, df):
-        if df.empty:
+    def update_summary(self, totals):
+        if totals is None or totals.empty:
             summary = "No transactions"
             self.summary_text.delete(1.0, tk.END)
             self.summary_text.insert(tk.END, summary)
             return
 
-        total_income = df[df["Importe"] > 0]["Importe"].sum()
-        total_expenses = df[df["Importe"] < 0]["Importe"].sum()
+        total_income = totals["Ingresos"].sum()
+        total_expenses = totals["Gastos"].sum()
         balance = total_income + total_expenses
 
         summary = f"Total Income: {total_income:.2f}€\n"
@@ -967,10 +1236,11 @@ class MainWindow:
     def update_filtered_view(self):
         if self.df is not None:
             filtered_df = self.filter_by_month(self.df)
+            filtered_totals = self.filter_totals_by_month(self.totals_df)
             self.update_treeview(filtered_df)
-            self.update_grouped_view(filtered_df)
-            self.update_summary(filtered_df)
-            self.chart_manager.update_charts(filtered_df)
+            self.update_grouped_view(filtered_totals)
+            self.update_summary(filtered_totals)
+            self.chart_manager.update_charts(filtered_totals)
 
     def setup_search_tab(self):
         """Setup the search and filter tab."""
@@ -989,9 +1259,10 @@ class MainWindow:
         results_frame = ttk.LabelFrame(container, text="Search Results", padding=10)
         results_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        # Create Treeview for search results
+        # Create virtual grid for search results (read-only)
         columns = ("Fecha", "Concepto", "Importe", "Categoría", "Tags")
-        self.search_tree = ttk.Treeview(results_frame, columns=columns, show="headings")
+        self.search_tree = VirtualTreeview(results_frame, [], columns=columns, show="headings")
+        self.search_tree.editable_columns = []
 
         # Add column headings
         for col in columns:
@@ -1015,21 +1286,29 @@ class MainWindow:
 
     def execute_search(self, filters):
         """
-        Execute search with given filters.
+        Execute search with given filters in the background.
+
+        A newer search cancels the running one, and only the latest search's
+        results are displayed. The category and tag lists of the search panel
+        are re-read only after they were invalidated.
 
         Args:
             filters: Dictionary with filter criteria
         """
-        session = self.db_manager.get_session()
-        try:
-            # Create new search service instance
-            search_service = SearchService(session, self.project.id)
+        if self._search_job:
+            self._search_job.cancel()
 
-            # Update available categories and tags in search panel
-            self.search_panel.update_categories(search_service.get_all_categories())
-            self.search_panel.update_tags(search_service.get_all_tags())
+        options_version = self._search_options_version
+        refresh_options = self._search_options_loaded != options_version
+
+        def search(ctx):
+            search_service = SearchService(ctx.session, self.project.id)
+
+            options = None
+            if refresh_options:
+                options = (search_service.get_all_categories(), search_service.get_all_tags())
+                ctx.raise_if_cancelled()
 
-            # Execute search
             results = search_service.search(
                 text=filters.get('text'),
                 date_from=filters.get('date_from'),
@@ -1039,33 +1318,54 @@ class MainWindow:
                 categories=filters.get('categories'),
                 tags=filters.get('tags')
             )
+            ctx.raise_if_cancelled()
 
-            # Clear previous results
-            for item in self.search_tree.get_children():
-                self.search_tree.delete(item)
-
-            # Display results
-            for txn in results:
-                tags_str = ", ".join(txn.get_tags()) if txn.get_tags() else ""
-                values = (
+            # Format on the worker so the Tk thread only swaps the grid's data
+            rows = [
+                (
                     txn.fecha.strftime("%Y-%m-%d"),
                     txn.concepto,
                     f"{txn.importe:.2f}€",
                     txn.categoria,
-                    tags_str
+                    ", ".join(txn.get_tags())
                 )
-                self.search_tree.insert("", tk.END, values=values)
+                for txn in results
+            ]
+            return options, rows
 
-            # Update results count
-            self.search_results_label.config(text=f"Found {len(results)} transactions")
+        def on_done(result):
+            if job is not self._search_job:
+                return
+            self._search_job = None
+            options, rows = result
+            if options is not None:
+                self.search_panel.update_categories(options[0])
+                self.search_panel.update_tags(options[1])
+                self._search_options_loaded = options_version
+            self.display_search_results(rows)
+
+        def on_error(error):
+            if job is self._search_job:
+                self._search_job = None
+            messagebox.showerror("Error", f"Search failed: {str(error)}")
+
+        job = self.job_runner.submit("search", search, on_done=on_done, on_error=on_error)
+        self._search_job = job
+
+    def display_search_results(self, rows):
+        """
+        Show search results in the search tab.
 
-            logger.info(f"Search executed: {len(results)} results")
+        Args:
+            rows: List of formatted (Fecha, Concepto, Importe, Categoría, Tags) tuples
+        """
+        self.search_tree.set_data(rows, lambda window: [(values, ()) for values in window])
+        self.search_results_label.config(text=f"Found {len(rows)} transactions")
+        logger.info(f"Search executed: {len(rows)} results")
 
-        except Exception as e:
-            logger.error(f"Search error: {e}", exc_info=True)
-            messagebox.showerror("Error", f"Search failed: {str(e)}")
-        finally:
-            session.close()
+    def invalidate_search_options(self):
+        """Mark the search panel's category and tag lists as stale."""
+        self._search_options_version += 1
 
     def setup_recurring_tab(self):
         """Setup the recurring transactions tab."""
@@ -1126,59 +1426,101 @@ class MainWindow:
         self.recurring_results_label = ttk.Label(buttons_frame, text="")
         self.recurring_results_label.pack(side=tk.LEFT, padx=10)
 
-        # Load patterns initially
-        self.refresh_recurring_patterns()
+        if self.df is not None:
+            self.show_recurring_patterns()
 
-    def refresh_recurring_patterns(self):
-        """Detect and display recurring transaction patterns."""
+    def show_recurring_patterns(self):
+        """
+        Show the stored recurring patterns immediately.
+
+        Detection only runs again, in the background, if transactions changed
+        since the stored patterns were computed.
+        """
         session = self.db_manager.get_session()
         try:
-            # Create new detector instance
-            detector = RecurringDetector(session, self.project.id)
+            patterns, is_current = RecurringDetector(session, self.project.id).load_stored_patterns()
+        finally:
+            session.close()
 
-            # Detect patterns
-            patterns = detector.detect_recurring_patterns()
+        self.display_recurring_patterns(patterns)
+        if not is_current:
+            self.refresh_recurring_patterns()
 
-            # Clear previous results
-            for item in self.recurring_tree.get_children():
-                self.recurring_tree.delete(item)
+    def refresh_recurring_patterns(self):
+        """Detect recurring transaction patterns in the background, store and display them."""
+        # A newer refresh supersedes a running one
+        if self._recurring_job:
+            self._recurring_job.cancel()
 
-            # Display patterns
-            frequency_map = {
-                "weekly": "Semanal",
-                "monthly": "Mensual",
-                "yearly": "Anual"
-            }
+        self.recurring_results_label.config(text="Detecting patterns...")
 
-            for pattern in patterns:
-                next_date = pattern.next_expected_date.strftime("%Y-%m-%d") if pattern.next_expected_date else "N/A"
-                status = "✓ Activo" if pattern.is_active else "⚠ Inactivo"
+        def detect(ctx):
+            # Create new detector instance on the job's session
+            detector = RecurringDetector(ctx.session, self.project.id)
+            # Progress is a cancellation point: a newer refresh drops this one before storing
+            return detector.refresh_stored_patterns(progress_callback=ctx.progress)
 
-                values = (
-                    pattern.merchant_name,
-                    frequency_map.get(pattern.frequency, pattern.frequency),
-                    f"€{pattern.average_amount:.2f}",
-                    pattern.transaction_count,
-                    pattern.last_date.strftime("%Y-%m-%d"),
-                    next_date,
-                    f"{pattern.confidence:.0%}",
-                    status
-                )
-                self.recurring_tree.insert("", tk.END, values=values)
+        def on_done(patterns):
+            if job is not self._recurring_job:
+                return
+            self._recurring_job = None
+            self.display_recurring_patterns(patterns)
+
+        def on_error(error):
+            if job is not self._recurring_job:
+                return
+            self._recurring_job = None
+            self.recurring_results_label.config(text="")
+            messagebox.showerror("Error", f"Pattern detection failed: {str(error)}")
 
-            # Update results count
-            active_count = sum(1 for p in patterns if p.is_active)
-            self.recurring_results_label.config(
-                text=f"Found {len(patterns)} patterns ({active_count} active)"
+        job = self.job_runner.submit("recurring-detection", detect, on_done=on_done, on_error=on_error)
+        self._recurring_job = job
+
+    def display_recurring_patterns(self, patterns):
+        """
+        Show detected recurring patterns in the recurring tab.
+
+        Args:
+            patterns: List of RecurringPattern objects
+        """
+        # Clear previous results
+        for item in self.recurring_tree.get_children():
+            self.recurring_tree.delete(item)
+
+        # Display patterns
+        frequency_map = {
+            "weekly": "Semanal",
+            "biweekly": "Quincenal",
+            "monthly": "Mensual",
+            "bimonthly": "Bimestral",
+            "quarterly": "Trimestral",
+            "semiannual": "Semestral",
+            "yearly": "Anual"
+        }
+
+        for pattern in patterns:
+            next_date = pattern.next_expected_date.strftime("%Y-%m-%d") if pattern.next_expected_date else "N/A"
+            status = "✓ Activo" if pattern.is_active else "⚠ Inactivo"
+
+            values = (
+                pattern.merchant_name,
+                frequency_map.get(pattern.frequency, f"Cada {pattern.interval_days} días"),
+                f"€{pattern.average_amount:.2f}",
+                pattern.transaction_count,
+                pattern.last_date.strftime("%Y-%m-%d"),
+                next_date,
+                f"{pattern.confidence:.0%}",
+                status
             )
+            self.recurring_tree.insert("", tk.END, values=values)
 
-            logger.info(f"Detected {len(patterns)} recurring patterns")
+        # Update results count
+        active_count = sum(1 for p in patterns if p.is_active)
+        self.recurring_results_label.config(
+            text=f"Found {len(patterns)} patterns ({active_count} active)"
+        )
 
-        except Exception as e:
-            logger.error(f"Recurring detection error: {e}", exc_info=True)
-            messagebox.showerror("Error", f"Pattern detection failed: {str(e)}")
-        finally:
-            session.close()
+        logger.info(f"Showing {len(patterns)} recurring patterns")
 
     def open_settings(self):
         """Open AI settings dialog."""
@@ -1190,6 +1532,7 @@ class MainWindow:
                 self.root,
                 session,
                 self.project.id,
+                self.job_runner,
                 on_save=self.on_settings_saved
             )
             session.close()
@@ -1201,9 +1544,11 @@ class MainWindow:
             )
 
     def on_settings_saved(self):
-        """Called when settings are saved - reload data to apply changes."""
-        logger.info("Settings saved - reloading data")
-        self.load_project_data()
+        """Called when settings are saved - loaded transactions stay valid."""
+        # Preferences only affect future categorization; bulk changes such as
+        # recategorization reload the project themselves
+        logger.info("Settings saved")
 
     def run(self):
         self.root.mainloop()
+        self.job_runner.shutdown()
@@ -5,7 +5,6 @@ from typing import Optional
 from models.database import DatabaseManager
 from models.project import Project
 from services.project_manager import ProjectManager
-from services.migration_service import MigrationService
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -22,7 +21,6 @@ class ProjectSelector:
         """
         self.db_manager = db_manager
         self.project_manager = ProjectManager(db_manager)
-        self.migration_service = MigrationService(db_manager)
         self.selected_project = None
 
         # Create window
@@ -93,10 +91,10 @@ class ProjectSelector:
     def refresh_project_list(self):
         """Refresh the list of projects."""
         self.project_listbox.delete(0, tk.END)
-        self.projects = self.project_manager.list_projects()
+        projects_with_stats = self.project_manager.list_projects_with_stats()
+        self.projects = [project for project, _ in projects_with_stats]
 
-        for project in self.projects:
-            stats = self.project_manager.get_project_stats(project.id)
+        for project, stats in projects_with_stats:
             display_text = f"{project.name} ({stats['transaction_count']} transactions)"
             self.project_listbox.insert(tk.END, display_text)
 
@@ -203,7 +201,10 @@ class ProjectSelector:
 
                 # Import files
                 logger.info(f"Importing {len(file_paths)} files to project {project.name}")
-                stats = self.migration_service.import_excel_to_project(
+                # Excel import pulls in pandas; load it only when importing
+                from services.migration_service import MigrationService
+
+                stats = MigrationService(self.db_manager).import_excel_to_project(
                     project_id=project.id,
                     file_paths=list(file_paths),
                     skip_duplicates=True
@@ -23,8 +23,14 @@ class SearchPanel(ttk.LabelFrame):
     - Amount range (min/max)
     - Categories (multi-select)
     - Tags (multi-select)
+
+    Typing in the entries or changing a list selection searches once the
+    user pauses for SEARCH_DELAY_MS; Return and "Apply Filters" search
+    immediately.
     """
 
+    SEARCH_DELAY_MS = 300
+
     def __init__(
         self,
         parent,
@@ -44,6 +50,8 @@ class SearchPanel(ttk.LabelFrame):
         self.on_search = on_search
         self.available_categories = []
         self.available_tags = []
+        self._pending_search = None  # after() id of the debounced search
+        self._last_filters = None
 
         self._create_widgets()
 
@@ -59,6 +67,7 @@ class SearchPanel(ttk.LabelFrame):
         self.text_entry = ttk.Entry(text_frame)
         self.text_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
         self.text_entry.bind('<Return>', lambda e: self._execute_search())
+        self.text_entry.bind('<KeyRelease>', self._schedule_search)
 
         # Date range
         date_label = ttk.Label(self, text="Date Range:", font=('', 9, 'bold'))
@@ -86,6 +95,10 @@ class SearchPanel(ttk.LabelFrame):
         self.amount_max_entry = ttk.Entry(amount_frame, width=10)
         self.amount_max_entry.pack(side=tk.LEFT)
 
+        for entry in (self.amount_min_entry, self.amount_max_entry):
+            entry.bind('<Return>', lambda e: self._execute_search())
+            entry.bind('<KeyRelease>', self._schedule_search)
+
         # Categories
         category_label = ttk.Label(self, text="Categories:", font=('', 9, 'bold'))
         category_label.pack(anchor=tk.W, pady=(10, 5))
@@ -105,6 +118,7 @@ class SearchPanel(ttk.LabelFrame):
         )
         self.category_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         cat_scrollbar.config(command=self.category_listbox.yview)
+        self.category_listbox.bind('<<ListboxSelect>>', self._schedule_search)
 
         # Tags
         tag_label = ttk.Label(self, text="Tags:", font=('', 9, 'bold'))
@@ -125,6 +139,7 @@ class SearchPanel(ttk.LabelFrame):
         )
         self.tag_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         tag_scrollbar.config(command=self.tag_listbox.yview)
+        self.tag_listbox.bind('<<ListboxSelect>>', self._schedule_search)
 
         # Buttons
         button_frame = ttk.Frame(self)
@@ -144,11 +159,48 @@ class SearchPanel(ttk.LabelFrame):
         )
         self.clear_button.pack(side=tk.LEFT)
 
-    def _execute_search(self):
-        """Execute the search with current filter values."""
+    def _schedule_search(self, event=None):
+        """Restart the debounce timer; the search runs when input pauses."""
         if not self.on_search:
             return
+        self._cancel_pending_search()
+        self._pending_search = self.after(
+            self.SEARCH_DELAY_MS, lambda: self._execute_search(only_if_changed=True)
+        )
+
+    def _cancel_pending_search(self):
+        """Drop a scheduled debounced search."""
+        if self._pending_search is not None:
+            self.after_cancel(self._pending_search)
+            self._pending_search = None
+
+    def _execute_search(self, only_if_changed: bool = False):
+        """
+        Execute the search with current filter values.
 
+        Args:
+            only_if_changed: Skip the search if the filters equal the last ones
+                (keys such as arrows or Return fire debounced searches too)
+        """
+        self._cancel_pending_search()
+        if not self.on_search:
+            return
+
+        filters = self.get_filters()
+        if only_if_changed and filters == self._last_filters:
+            return
+        self._last_filters = filters
+
+        # Execute callback
+        self.on_search(filters)
+
+    def get_filters(self) -> Dict[str, Any]:
+        """
+        Collect the current filter values.
+
+        Returns:
+            Dictionary with filter criteria
+        """
         # Collect filter values
         filters = {
             'text': self.text_entry.get().strip() or None,
@@ -192,8 +244,7 @@ class SearchPanel(ttk.LabelFrame):
             self.tag_listbox.get(i) for i in selected_indices
         ] if selected_indices else None
 
-        # Execute callback
-        self.on_search(filters)
+        return filters
 
     def _clear_filters(self):
         """Clear all filter values."""
@@ -203,6 +254,8 @@ class SearchPanel(ttk.LabelFrame):
         self.amount_max_entry.delete(0, tk.END)
         self.category_listbox.selection_clear(0, tk.END)
         self.tag_listbox.selection_clear(0, tk.END)
+        self._cancel_pending_search()
+        self._last_filters = None
 
         # Execute search with empty filters
         if self.on_search:
@@ -216,11 +269,7 @@ class SearchPanel(ttk.LabelFrame):
             categories: List of category names
         """
         self.available_categories = categories
-
-        # Update listbox
-        self.category_listbox.delete(0, tk.END)
-        for category in categories:
-            self.category_listbox.insert(tk.END, category)
+        self._refill_listbox(self.category_listbox, categories)
 
     def update_tags(self, tags: List[str]):
         """
@@ -230,11 +279,18 @@ class SearchPanel(ttk.LabelFrame):
             tags: List of tag names
         """
         self.available_tags = tags
-
-        # Update listbox
-        self.tag_listbox.delete(0, tk.END)
-        for tag in tags:
-            self.tag_listbox.insert(tk.END, tag)
+        self._refill_listbox(self.tag_listbox, tags)
+
+    @staticmethod
+    def _refill_listbox(listbox: tk.Listbox, items: List[str]):
+        """Replace a listbox's items, keeping still-present selections."""
+        selected = {listbox.get(i) for i in listbox.curselection()}
+
+        listbox.delete(0, tk.END)
+        for index, item in enumerate(items):
+            listbox.insert(tk.END, item)
+            if item in selected:
+                listbox.selection_set(index)
 
     def set_search_text(self, text: str):
         """
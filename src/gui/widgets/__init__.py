@@ -1,10 +1,12 @@
 """Reusable UI widgets package."""
 from .tag_input import TagInputWidget, TagSelectorDialog
 from .date_range_picker import DateRangePicker, SimpleDateRangePicker
+from .progress_dialog import ProgressDialog
 
 __all__ = [
     'TagInputWidget',
     'TagSelectorDialog',
     'DateRangePicker',
-    'SimpleDateRangePicker'
+    'SimpleDateRangePicker',
+    'ProgressDialog'
 ]
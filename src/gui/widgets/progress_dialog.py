@@ -0,0 +1,87 @@
+"""Progress dialog for background jobs."""
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+
+
+class ProgressDialog:
+    """
+    Modal progress window with an optional Cancel button.
+
+    Only updated from the Tk thread (e.g. as a JobRunner on_progress
+    callback); it never calls update() itself, so the event loop keeps
+    running while the job works.
+    """
+
+    def __init__(
+        self,
+        parent,
+        title: str,
+        message: str = "Initializing...",
+        on_cancel: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize progress dialog.
+
+        Args:
+            parent: Parent window
+            title: Window title
+            message: Initial status text
+            on_cancel: Callback for the Cancel button (no button if None)
+        """
+        self.on_cancel = on_cancel
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("450x150")
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.message_label = ttk.Label(self.window, text=message, font=('', 10))
+        self.message_label.pack(pady=(15, 5))
+
+        self.progress_bar = ttk.Progressbar(self.window, length=400, mode='indeterminate')
+        self.progress_bar.pack(pady=5, padx=25)
+        self.progress_bar.start(15)
+
+        self.status_label = ttk.Label(self.window, text="", font=('', 9))
+        self.status_label.pack()
+
+        self.cancel_button = None
+        if on_cancel:
+            self.cancel_button = ttk.Button(self.window, text="Cancel", command=self.cancel)
+            self.cancel_button.pack(pady=(5, 10))
+
+    def update_progress(self, message: str, current: int = 0, total: int = 0) -> None:
+        """
+        Show job progress.
+
+        Args:
+            message: Status text
+            current: Items processed so far
+            total: Total number of items (0 for an indeterminate bar)
+        """
+        self.message_label.config(text=message)
+        if total:
+            if str(self.progress_bar['mode']) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate')
+            self.progress_bar.config(maximum=total, value=current)
+            self.status_label.config(text=f"{current}/{total}")
+
+    def cancel(self) -> None:
+        """Request cancellation; the dialog stays open until the job stops."""
+        if not self.on_cancel:
+            return
+        self.on_cancel()
+        self.message_label.config(text="Cancelling...")
+        if self.cancel_button:
+            self.cancel_button.config(state=tk.DISABLED)
+
+    def close(self) -> None:
+        """Close the dialog."""
+        self.progress_bar.stop()
+        self.window.grab_release()
+        self.window.destroy()
@@ -0,0 +1,307 @@
+"""Virtualized treeview that only renders the visible rows."""
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .editable_treeview import CategoryEditableTreeview
+
+# formatter(rows) -> [(values, tags), ...] for a window of the backing data
+RowFormatter = Callable[[Any], List[Tuple[tuple, tuple]]]
+
+
+class VirtualTreeview(CategoryEditableTreeview):
+    """
+    Category-editable treeview backed by a DataFrame (or sequence) instead of items.
+
+    Only as many Treeview items as fit on screen exist. Scrolling moves a
+    window over the backing data and rewrites those pooled items in place,
+    so loading or filtering 100k rows costs the same as 40. The scrollbar
+    attached through ``yscrollcommand`` reflects the position in the whole
+    data set.
+
+    Inline category/tag editing works as in CategoryEditableTreeview; use
+    get_row_key(item_id) to find the backing row (the DataFrame index label)
+    of an edited item.
+    """
+
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, parent, categories: List[str], **kwargs):
+        """
+        Initialize virtual treeview.
+
+        Args:
+            parent: Parent widget
+            categories: List of available categories
+            **kwargs: Additional Treeview arguments
+        """
+        yscrollcommand = kwargs.pop('yscrollcommand', None)
+        super().__init__(parent, categories, **kwargs)
+
+        self._data: Sequence = []
+        self._formatter: Optional[RowFormatter] = None
+        self._offset = 0
+        self._pool: List[str] = []
+        self._yscrollcommand = yscrollcommand
+        self._selected_keys = set()
+
+        self.bind('<Configure>', lambda e: self._resize_pool())
+        self.bind('<MouseWheel>', self._on_mousewheel)
+        self.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        self.bind('<Button-5>', lambda e: self._scroll_by(3))
+        self.bind('<Up>', lambda e: self._on_arrow(-1))
+        self.bind('<Down>', lambda e: self._on_arrow(1))
+        self.bind('<Prior>', lambda e: self._scroll_by(-self.page_size) or 'break')
+        self.bind('<Next>', lambda e: self._scroll_by(self.page_size) or 'break')
+        self.bind('<<TreeviewSelect>>', self._on_select, add='+')
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+
+    def set_data(self, data, formatter: RowFormatter, keep_position: bool = False) -> None:
+        """
+        Replace the backing data.
+
+        Args:
+            data: DataFrame (rows keyed by index label) or any sliceable sequence
+            formatter: Converts a window of data into (values, tags) per row
+            keep_position: Keep the scroll offset instead of returning to the top
+        """
+        self._data = data
+        self._formatter = formatter
+        if not keep_position:
+            self._offset = 0
+            self._selected_keys.clear()
+        self._render()
+
+    @property
+    def data(self):
+        """Backing data currently displayed."""
+        return self._data
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows in the backing data."""
+        return len(self._data)
+
+    def get_row_key(self, item_id: str):
+        """
+        Get the backing row of a pooled item.
+
+        Args:
+            item_id: Treeview item ID
+
+        Returns:
+            DataFrame index label (or sequence position), None if the item is empty
+        """
+        if item_id not in self._pool:
+            return None
+        position = self._offset + self._pool.index(item_id)
+        if position >= self.row_count:
+            return None
+        if isinstance(self._data, pd.DataFrame):
+            return self._data.index[position]
+        return position
+
+    def refresh(self) -> None:
+        """Re-render the visible window (after the backing data changed in place)."""
+        self._render()
+
+    def refresh_row(self, key) -> None:
+        """
+        Re-render one backing row if it is currently visible.
+
+        Args:
+            key: DataFrame index label (or sequence position)
+        """
+        position = self._position_of(key)
+        index = position - self._offset
+        if position < 0 or not 0 <= index < len(self._pool) or not self._formatter:
+            return
+
+        if isinstance(self._data, pd.DataFrame):
+            window = self._data.iloc[position:position + 1]
+        else:
+            window = self._data[position:position + 1]
+        values, tags = self._formatter(window)[0]
+        self.item(self._pool[index], values=values, tags=tags)
+
+    # ------------------------------------------------------------------
+    # Scrolling
+    # ------------------------------------------------------------------
+
+    @property
+    def page_size(self) -> int:
+        """Number of rows that fit in the widget."""
+        return max(len(self._pool), 1)
+
+    def configure(self, cnf=None, **kwargs):
+        """Intercept yscrollcommand so the scrollbar tracks the backing data."""
+        if isinstance(cnf, dict) and 'yscrollcommand' in cnf:
+            cnf = dict(cnf)
+            self._yscrollcommand = cnf.pop('yscrollcommand')
+        intercepted = 'yscrollcommand' in kwargs
+        if intercepted:
+            self._yscrollcommand = kwargs.pop('yscrollcommand')
+            self._update_scrollbar()
+        if intercepted and not cnf and not kwargs:
+            return None
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def yview(self, *args):
+        """
+        Scroll the window over the backing data (scrollbar command protocol).
+
+        Args:
+            *args: ('moveto', fraction) or ('scroll', n, 'units'|'pages')
+
+        Returns:
+            (first, last) visible fractions when called without arguments
+        """
+        if not args:
+            return self._visible_fractions()
+
+        if args[0] == 'moveto':
+            max_offset = max(self.row_count - self.page_size, 0)
+            self._set_offset(round(float(args[1]) * self.row_count), max_offset)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                amount *= self.page_size
+            self._scroll_by(amount)
+        return None
+
+    def see_row(self, key) -> None:
+        """
+        Scroll so that a backing row is visible.
+
+        Args:
+            key: DataFrame index label (or sequence position)
+        """
+        position = self._position_of(key)
+        if position < 0:
+            return
+        if position < self._offset or position >= self._offset + self.page_size:
+            self._set_offset(position - self.page_size // 2)
+
+    def _position_of(self, key) -> int:
+        """Row position of a backing row key (-1 if absent)."""
+        if isinstance(self._data, pd.DataFrame):
+            return int(self._data.index.get_indexer([key])[0])
+        return key if 0 <= key < self.row_count else -1
+
+    def _scroll_by(self, rows: int) -> None:
+        """Move the window by a number of rows."""
+        self._set_offset(self._offset + rows)
+
+    def _set_offset(self, offset: int, max_offset: Optional[int] = None) -> None:
+        """Clamp and apply a new window offset."""
+        if max_offset is None:
+            max_offset = max(self.row_count - self.page_size, 0)
+        offset = min(max(offset, 0), max_offset)
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_mousewheel(self, event):
+        """Scroll three rows per wheel notch."""
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def _on_arrow(self, step: int):
+        """Move the selection, scrolling at the edges of the window."""
+        focus = self.focus()
+        if focus in self._pool:
+            index = self._pool.index(focus) + step
+            if 0 <= index < len(self._pool) and self.get_row_key(self._pool[index]) is not None:
+                return None  # Let Treeview move within the window
+        self._scroll_by(step)
+        return 'break'
+
+    def _visible_fractions(self) -> Tuple[float, float]:
+        """Visible part of the backing data as (first, last) fractions."""
+        total = self.row_count
+        if total == 0:
+            return 0.0, 1.0
+        first = self._offset / total
+        last = min(self._offset + self.page_size, total) / total
+        return first, last
+
+    def _update_scrollbar(self) -> None:
+        """Report the window position to the attached scrollbar."""
+        if self._yscrollcommand:
+            self._yscrollcommand(*self._visible_fractions())
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _row_height(self) -> int:
+        """Height of a Treeview row in pixels."""
+        style = self.cget('style') or 'Treeview'
+        height = ttk.Style(self).lookup(style, 'rowheight')
+        try:
+            return int(height) or self.DEFAULT_ROW_HEIGHT
+        except (TypeError, ValueError):
+            return self.DEFAULT_ROW_HEIGHT
+
+    def _resize_pool(self) -> None:
+        """Create or drop pooled items so they exactly fill the widget."""
+        heading_height = self._row_height() + 4 if 'headings' in str(self.cget('show')) else 0
+        visible = max((self.winfo_height() - heading_height) // self._row_height(), 1)
+
+        if visible == len(self._pool):
+            return
+
+        while len(self._pool) < visible:
+            self._pool.append(super().insert('', tk.END, iid=f"row{len(self._pool)}"))
+        while len(self._pool) > visible:
+            self.delete(self._pool.pop())
+
+        self._set_offset(self._offset)
+        self._render()
+
+    def _render(self) -> None:
+        """Write the visible window of the backing data into the pooled items."""
+        # Pooled items are about to show other rows
+        self._cancel_edit()
+        self._cancel_combo_edit()
+
+        rows: List[Tuple[tuple, tuple]] = []
+        if self._formatter and self.row_count:
+            stop = min(self._offset + len(self._pool), self.row_count)
+            if isinstance(self._data, pd.DataFrame):
+                window = self._data.iloc[self._offset:stop]
+            else:
+                window = self._data[self._offset:stop]
+            rows = self._formatter(window)
+
+        selected = []
+        for index, item_id in enumerate(self._pool):
+            if index < len(rows):
+                values, tags = rows[index]
+                self.item(item_id, values=values, tags=tags)
+                if self.get_row_key(item_id) in self._selected_keys:
+                    selected.append(item_id)
+            else:
+                self.item(item_id, values=(), tags=())
+
+        # Keep the selection attached to data rows, not to recycled items
+        self.selection_set(selected)
+
+        super().yview_moveto(0)
+        self._update_scrollbar()
+
+    def _on_select(self, event):
+        """Remember which data rows are selected."""
+        visible_keys = {self.get_row_key(item_id) for item_id in self._pool}
+        self._selected_keys -= visible_keys
+        self._selected_keys.update(
+            key for key in (self.get_row_key(item_id) for item_id in self.selection())
+            if key is not None
+        )
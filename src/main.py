@@ -1,27 +1,62 @@
 """Main entry point for SpendSight BBVA application."""
-from models.database import DatabaseManager
-from gui.project_selector import ProjectSelector
-from gui.main_window import MainWindow
+import argparse
+import time
+
+from utils.startup_profiler import StartupProfiler
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-def main():
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="SpendSight BBVA")
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help="Log import times (like python -X importtime) and the time to each window"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Run the application."""
+    args = parse_args(argv)
+    profiler = None
+    if args.profile_startup:
+        profiler = StartupProfiler()
+        profiler.install()
+
+    # GUI and services are imported here so the profiler sees them; the main
+    # window's dependencies (pandas, charts) load only once a project is opened
+    from models.database import DatabaseManager
+    from services.schema_migrator import SchemaMigrator
+    from gui.project_selector import ProjectSelector
+
     # Initialize database
     db_manager = DatabaseManager()
-    db_manager.create_tables()
+    # Create or upgrade the schema (a single version check when current)
+    SchemaMigrator(db_manager).upgrade()
 
     logger.info("Starting SpendSight BBVA")
 
     # Show project selector
     selector = ProjectSelector(db_manager)
+    if profiler:
+        selector.root.after_idle(lambda: profiler.report("project selector"))
     selected_project = selector.run()
 
     # If project selected, open main window
     if selected_project:
         logger.info(f"Opening project: {selected_project.name}")
-        app = MainWindow(db_manager, selected_project)
+        # Startup times are measured from here, so they include the main
+        # window's imports but not the time spent in the project selector
+        opened_at = time.perf_counter()
+        from gui.main_window import MainWindow
+
+        app = MainWindow(db_manager, selected_project, started_at=opened_at)
+        if profiler:
+            app.root.after_idle(lambda: (profiler.report("main window"), profiler.uninstall()))
         app.run()
     else:
         logger.info("No project selected, exiting")
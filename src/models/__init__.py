@@ -7,6 +7,8 @@ from .movement_type import MovementType
 from .category_training_example import CategoryTrainingExample
 from .transaction_embedding import TransactionEmbedding
 from .user_preferences import UserPreferences
+from .monthly_category_total import MonthlyCategoryTotal
+from .recurring_pattern import RecurringPatternRecord
 
 __all__ = [
     'Base',
@@ -18,4 +20,6 @@ __all__ = [
     'CategoryTrainingExample',
     'TransactionEmbedding',
     'UserPreferences',
+    'MonthlyCategoryTotal',
+    'RecurringPatternRecord',
 ]
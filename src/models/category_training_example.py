@@ -2,9 +2,11 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import numpy as np
+from utils.lazy_import import lazy_import
 from .database import Base
 
+np = lazy_import('numpy')
+
 
 class CategoryTrainingExample(Base):
     """
@@ -39,14 +41,16 @@ class CategoryTrainingExample(Base):
 
     # Indexes for performance
     __table_args__ = (
-        Index('idx_project_category', 'project_id', 'category'),
+        Index('idx_training_project_category', 'project_id', 'category'),
         Index('idx_project_source', 'project_id', 'source'),
+        # Covers AICategorizationService.get_training_stats
+        Index('idx_training_stats', 'project_id', 'category', 'source', 'times_used'),
     )
 
     def __repr__(self):
         return f"<CategoryTrainingExample(id={self.id}, category='{self.category}', source='{self.source}')>"
 
-    def set_embedding(self, embedding_vector: np.ndarray) -> None:
+    def set_embedding(self, embedding_vector: 'np.ndarray') -> None:
         """
         Store embedding vector as binary data.
 
@@ -60,7 +64,7 @@ class CategoryTrainingExample(Base):
         embedding_float32 = embedding_vector.astype(np.float32)
         self.embedding = embedding_float32.tobytes()
 
-    def get_embedding(self) -> np.ndarray:
+    def get_embedding(self) -> 'np.ndarray':
         """
         Retrieve embedding vector from binary storage.
 
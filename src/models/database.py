@@ -1,5 +1,5 @@
 """SQLAlchemy database setup and configuration."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
 from pathlib import Path
 
@@ -26,8 +26,22 @@ class DatabaseManager:
 
         self.db_path = db_path
         self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
+        event.listen(self.engine, 'connect', self._configure_connection)
         self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
 
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record):
+        """
+        Configure each new SQLite connection.
+
+        WAL lets background jobs write while the GUI thread reads, and the
+        busy timeout makes a second writer wait instead of failing.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
     def create_tables(self):
         """Create all tables in the database."""
         Base.metadata.create_all(bind=self.engine)
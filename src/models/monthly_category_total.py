@@ -0,0 +1,34 @@
+"""Materialized monthly/category aggregates for fast summaries."""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, PrimaryKeyConstraint
+from .database import Base
+
+
+class MonthlyCategoryTotal(Base):
+    """
+    Pre-aggregated transaction totals per project, month and category.
+
+    Maintained incrementally by AggregateService whenever transactions are
+    imported, recategorized or deleted, so summary views and charts read a
+    few hundred rows instead of re-scanning every transaction.
+    """
+    __tablename__ = 'monthly_category_totals'
+
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    month = Column(String(7), nullable=False)  # "YYYY-MM"
+    category = Column(String(100), nullable=False)
+
+    # Aggregates
+    total = Column(Float, nullable=False, default=0.0)  # Sum of all amounts
+    count = Column(Integer, nullable=False, default=0)  # Number of transactions
+    income = Column(Float, nullable=False, default=0.0)  # Sum of positive amounts
+    expense = Column(Float, nullable=False, default=0.0)  # Sum of negative amounts
+
+    __table_args__ = (
+        PrimaryKeyConstraint('project_id', 'month', 'category'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<MonthlyCategoryTotal(project_id={self.project_id}, month='{self.month}', "
+            f"category='{self.category}', total={self.total}, count={self.count})>"
+        )
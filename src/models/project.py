@@ -18,5 +18,11 @@ class Project(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Incremented once per database transaction that inserts, deletes or
+    # edits the project's transactions (see transaction.bump_data_version);
+    # derived results record the version they were computed from
+    data_version = Column(Integer, nullable=False, default=0, server_default='0')
+    recurring_version = Column(Integer, nullable=True)  # data_version of stored recurring patterns
+
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,38 @@
+"""Persisted recurring transaction patterns."""
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Index
+from .database import Base
+
+
+class RecurringPatternRecord(Base):
+    """
+    A recurring pattern found by RecurringDetector, stored per project.
+
+    The stored set reflects the project's data_version recorded in
+    Project.recurring_version; it is replaced as a whole whenever detection
+    runs again, so the recurring tab can show it without rescanning.
+    """
+    __tablename__ = 'recurring_patterns'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+
+    merchant_name = Column(String(255), nullable=False)
+    category = Column(String(100), nullable=True)
+    frequency = Column(String(20), nullable=False)  # "weekly", "biweekly", "monthly", ..., "yearly", or "custom"
+    interval_days = Column(Integer, nullable=False)
+    average_amount = Column(Float, nullable=False)
+    amount_variance = Column(Float, nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+    last_date = Column(DateTime, nullable=False)
+    confidence = Column(Float, nullable=False)
+    transaction_ids = Column(Text, nullable=False)  # JSON array of transaction IDs
+
+    __table_args__ = (
+        Index('uq_recurring_project_merchant', 'project_id', 'merchant_name', unique=True),
+    )
+
+    def __repr__(self):
+        return (
+            f"<RecurringPatternRecord(project_id={self.project_id}, merchant='{self.merchant_name}', "
+            f"frequency='{self.frequency}', confidence={self.confidence:.2f})>"
+        )
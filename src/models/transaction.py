@@ -1,10 +1,19 @@
 """Transaction ORM model."""
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index, event, inspect
+from sqlalchemy.orm import Session, relationship
 from datetime import datetime
+import hashlib
 import json
-from typing import List
+from typing import Iterable, List
+from utils.merchants import normalize_merchant
 from .database import Base
+from .project import Project
+
+
+def _default_merchant_key(context):
+    """Compute merchant_key on insert when the caller did not set it."""
+    return normalize_merchant(context.get_current_parameters().get('concepto'))
+
 
 class Transaction(Base):
     """
@@ -35,6 +44,13 @@ class Transaction(Base):
     # Tags (JSON array stored as TEXT)
     tags = Column(Text, nullable=True)  # JSON array: ["work", "reimbursable", "vacation"]
 
+    # Duplicate detection (hash of date + concepto + importe, see compute_dedupe_key)
+    # NULL when the transaction was imported without duplicate checking
+    dedupe_key = Column(String(16), nullable=True)
+
+    # Normalized merchant (see utils.merchants.normalize_merchant), computed once on insert
+    merchant_key = Column(String(100), nullable=True, default=_default_merchant_key)
+
     # Metadata
     source_file = Column(String(255), nullable=True)  # Original Excel filename
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -44,11 +60,43 @@ class Transaction(Base):
     __table_args__ = (
         Index('idx_project_date', 'project_id', 'fecha'),
         Index('idx_project_category', 'project_id', 'categoria'),
+        Index('idx_project_method', 'project_id', 'categorization_method'),
+        Index('idx_project_concepto', 'project_id', 'concepto'),
+        Index('uq_project_dedupe_key', 'project_id', 'dedupe_key', unique=True),
+        Index('idx_project_merchant', 'project_id', 'merchant_key'),
     )
 
     def __repr__(self):
         return f"<Transaction(id={self.id}, fecha={self.fecha}, importe={self.importe}, categoria='{self.categoria}')>"
 
+    @staticmethod
+    def compute_dedupe_key(fecha, concepto: str, importe: float, account: str = None) -> str:
+        """
+        Compute the compact duplicate-detection key of a transaction.
+
+        Two transactions on the same day with the same concepto and amount
+        (rounded to cents) get the same key.
+
+        Args:
+            fecha: Transaction date (datetime, or ISO string as stored by SQLite)
+            concepto: Transaction description
+            importe: Transaction amount
+            account: Source account identifier (optional)
+
+        Returns:
+            16-character hex string (64-bit BLAKE2b hash)
+        """
+        if isinstance(fecha, str):
+            fecha_str = fecha[:10]
+        else:
+            fecha_str = fecha.strftime('%Y-%m-%d')
+
+        text = f"{fecha_str}|{concepto}|{float(importe):.2f}"
+        if account:
+            text = f"{text}|{account}"
+
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
     @property
     def is_manually_edited(self):
         """Check if category was manually edited."""
@@ -165,3 +213,79 @@ class Transaction(Base):
         self.categoria = category
         self.categorization_method = 'manual'
         self.ai_confidence = None
+
+
+# Transaction columns that derived results (such as stored recurring
+# patterns) depend on; tag edits do not count
+DATA_VERSION_COLUMNS = ('project_id', 'fecha', 'concepto', 'importe', 'categoria')
+
+# session.info key: projects whose data_version the open transaction bumped
+_BUMPED_PROJECTS = 'data_version_bumped'
+
+
+def bump_data_version(session: Session, project_ids: Iterable[int]) -> None:
+    """
+    Bump projects.data_version once per database transaction.
+
+    Transaction objects flushed by the ORM are handled by a before_flush
+    hook; code writing transactions with Core statements (bulk inserts)
+    calls this itself, inside the same transaction.
+
+    Args:
+        session: Session whose transaction changes the data
+        project_ids: Projects whose transactions changed
+    """
+    bumped = session.info.setdefault(_BUMPED_PROJECTS, set())
+    pending = {project_id for project_id in project_ids if project_id is not None} - bumped
+    if pending:
+        projects = Project.__table__
+        session.connection().execute(
+            projects.update()
+            .where(projects.c.id.in_(pending))
+            .values(data_version=projects.c.data_version + 1)
+        )
+        bumped.update(pending)
+
+
+def data_version_recorded(session: Session, project_id: int) -> None:
+    """
+    Note that a derived result recorded the project's current data_version.
+
+    Later changes in the same transaction bump the version again, so the
+    recorded result becomes outdated.
+
+    Args:
+        session: Session that recorded the version
+        project_id: Project ID
+    """
+    session.info.get(_BUMPED_PROJECTS, set()).discard(project_id)
+
+
+@event.listens_for(Session, 'before_flush')
+def _bump_for_changed_transactions(session, flush_context, instances):
+    """Bump the data version of projects whose transactions are flushed."""
+    project_ids = set()
+    for txn in session.new | session.deleted:
+        if isinstance(txn, Transaction):
+            project_ids.add(txn.project_id)
+    for txn in session.dirty:
+        if not isinstance(txn, Transaction):
+            continue
+        state = inspect(txn)
+        for column in DATA_VERSION_COLUMNS:
+            history = state.attrs[column].history
+            if history.has_changes():
+                project_ids.add(txn.project_id)
+                if column == 'project_id':
+                    project_ids.update(history.deleted)
+    # Rows without a project yet have no version to bump
+    project_ids.discard(None)
+    if project_ids:
+        bump_data_version(session, project_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _reset_bumped_projects(session):
+    """The next transaction bumps again on its first change."""
+    session.info.pop(_BUMPED_PROJECTS, None)
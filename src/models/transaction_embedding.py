@@ -1,9 +1,11 @@
 """Transaction embedding cache for faster AI categorization."""
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, Index
 from datetime import datetime
-import numpy as np
+from utils.lazy_import import lazy_import
 from .database import Base
 
+np = lazy_import('numpy')
+
 
 class TransactionEmbedding(Base):
     """
@@ -45,7 +47,7 @@ class TransactionEmbedding(Base):
     def __repr__(self):
         return f"<TransactionEmbedding(id={self.id}, hash='{self.text_hash[:8]}...', times_used={self.times_used})>"
 
-    def set_embedding(self, embedding_vector: np.ndarray) -> None:
+    def set_embedding(self, embedding_vector: 'np.ndarray') -> None:
         """
         Store embedding vector as binary data.
 
@@ -59,7 +61,7 @@ class TransactionEmbedding(Base):
         embedding_float32 = embedding_vector.astype(np.float32)
         self.embedding = embedding_float32.tobytes()
 
-    def get_embedding(self) -> np.ndarray:
+    def get_embedding(self) -> 'np.ndarray':
         """
         Retrieve embedding vector from binary storage.
 
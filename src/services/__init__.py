@@ -1,13 +1,35 @@
 """Business logic services package."""
-from .project_manager import ProjectManager
-from .categorization_service import CategorizationService
-from .recurring_detector import RecurringDetector, RecurringPattern
-from .search_service import SearchService
+import importlib
+
+# Exported name -> submodule; submodules (and numpy/pandas with them) are
+# imported on first access, so e.g. the schema migrator does not pull them in
+_EXPORTS = {
+    'ProjectManager': '.project_manager',
+    'CategorizationService': '.categorization_service',
+    'RecurringDetector': '.recurring_detector',
+    'RecurringPattern': '.recurring_detector',
+    'SearchService': '.search_service',
+    'TransactionLoader': '.transaction_loader',
+}
 
 __all__ = [
     'ProjectManager',
     'CategorizationService',
     'RecurringDetector',
     'RecurringPattern',
-    'SearchService'
+    'SearchService',
+    'TransactionLoader'
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
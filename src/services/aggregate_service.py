@@ -0,0 +1,260 @@
+"""Incremental maintenance of the monthly/category aggregate table."""
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import MonthlyCategoryTotal, Transaction
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Only get_totals needs pandas; the project selector uses this service without it
+pd = lazy_import('pandas')
+
+
+class AggregateService:
+    """
+    Keeps monthly_category_totals in sync with the transactions table.
+
+    Mutations are accumulated as deltas per (month, category) and written
+    with one upsert per touched cell on flush(). Callers flush inside the
+    same session transaction that changes the transactions, then commit.
+
+    Usage:
+        aggregates = AggregateService(session, project_id)
+        aggregates.add(txn.fecha, txn.categoria, txn.importe)
+        aggregates.move(txn.fecha, txn.importe, old_category, new_category)
+        aggregates.flush()
+        session.commit()
+    """
+
+    # Column names of the DataFrame returned by get_totals()
+    COLUMNS = ['Periodo', 'Categoría', 'Total', 'Cantidad', 'Ingresos', 'Gastos']
+
+    REBUILD_QUERY = text("""
+        INSERT INTO monthly_category_totals
+            (project_id, month, category, total, count, income, expense)
+        SELECT
+            project_id,
+            strftime('%Y-%m', fecha),
+            categoria,
+            SUM(importe),
+            COUNT(*),
+            SUM(CASE WHEN importe > 0 THEN importe ELSE 0 END),
+            SUM(CASE WHEN importe < 0 THEN importe ELSE 0 END)
+        FROM transactions
+        WHERE project_id = :project_id
+        GROUP BY project_id, strftime('%Y-%m', fecha), categoria
+    """)
+
+    def __init__(self, db_session: Session, project_id: int):
+        """
+        Initialize aggregate service.
+
+        Args:
+            db_session: SQLAlchemy database session
+            project_id: Current project ID
+        """
+        self.db_session = db_session
+        self.project_id = project_id
+        # (month, category) -> [total, count, income, expense]
+        self._pending: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0.0, 0, 0.0, 0.0])
+
+    @staticmethod
+    def month_key(fecha) -> str:
+        """
+        Get the aggregate month key for a transaction date.
+
+        Args:
+            fecha: Transaction date (datetime, date or pandas Timestamp)
+
+        Returns:
+            Month string in "YYYY-MM" format
+        """
+        return f"{fecha.year:04d}-{fecha.month:02d}"
+
+    def add(self, fecha, categoria: str, importe: float, sign: int = 1) -> None:
+        """
+        Record a transaction being added (sign=1) or removed (sign=-1).
+
+        Args:
+            fecha: Transaction date
+            categoria: Transaction category
+            importe: Transaction amount
+            sign: 1 for inserts, -1 for deletes
+        """
+        delta = self._pending[(self.month_key(fecha), categoria)]
+        delta[0] += sign * importe
+        delta[1] += sign
+        if importe > 0:
+            delta[2] += sign * importe
+        elif importe < 0:
+            delta[3] += sign * importe
+
+    def remove(self, fecha, categoria: str, importe: float) -> None:
+        """
+        Record a transaction being deleted.
+
+        Args:
+            fecha: Transaction date
+            categoria: Transaction category
+            importe: Transaction amount
+        """
+        self.add(fecha, categoria, importe, sign=-1)
+
+    def move(self, fecha, importe: float, old_category: str, new_category: str) -> None:
+        """
+        Record a transaction changing category.
+
+        Args:
+            fecha: Transaction date
+            importe: Transaction amount
+            old_category: Category before the edit
+            new_category: Category after the edit
+        """
+        if old_category == new_category:
+            return
+        self.remove(fecha, old_category, importe)
+        self.add(fecha, new_category, importe)
+
+    def add_transactions(self, transactions: Iterable[Transaction], sign: int = 1) -> None:
+        """
+        Record several transactions being added or removed.
+
+        Args:
+            transactions: Transaction objects (or rows with fecha/categoria/importe)
+            sign: 1 for inserts, -1 for deletes
+        """
+        for txn in transactions:
+            self.add(txn.fecha, txn.categoria, txn.importe, sign=sign)
+
+    @property
+    def has_pending(self) -> bool:
+        """Check if there are deltas waiting to be flushed."""
+        return bool(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write accumulated deltas to the aggregate table (without committing).
+
+        Returns:
+            Number of (month, category) cells touched
+        """
+        if not self._pending:
+            return 0
+
+        table = MonthlyCategoryTotal.__table__
+        rows = [
+            {
+                'project_id': self.project_id,
+                'month': month,
+                'category': category,
+                'total': delta[0],
+                'count': delta[1],
+                'income': delta[2],
+                'expense': delta[3],
+            }
+            for (month, category), delta in self._pending.items()
+            if delta[1] != 0 or delta[0] != 0
+        ]
+
+        if rows:
+            statement = sqlite_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.project_id, table.c.month, table.c.category],
+                set_={
+                    'total': table.c.total + statement.excluded.total,
+                    'count': table.c.count + statement.excluded.count,
+                    'income': table.c.income + statement.excluded.income,
+                    'expense': table.c.expense + statement.excluded.expense,
+                }
+            )
+            self.db_session.execute(statement, rows)
+
+            # Drop cells that no longer hold any transaction
+            self.db_session.query(MonthlyCategoryTotal).filter(
+                MonthlyCategoryTotal.project_id == self.project_id,
+                MonthlyCategoryTotal.count <= 0
+            ).delete(synchronize_session=False)
+
+        touched = len(self._pending)
+        self._pending.clear()
+        return touched
+
+    def discard(self) -> None:
+        """Drop pending deltas (e.g. after a rollback)."""
+        self._pending.clear()
+
+    def rebuild(self) -> None:
+        """
+        Recompute the project's aggregates from scratch (without committing).
+
+        Used for bulk operations and to backfill projects created before the
+        aggregate table existed.
+        """
+        self._pending.clear()
+        self.clear()
+        self.db_session.execute(self.REBUILD_QUERY, {'project_id': self.project_id})
+        logger.info(f"Rebuilt monthly category totals for project {self.project_id}")
+
+    def clear(self) -> None:
+        """Delete all aggregate rows of the project (without committing)."""
+        self.db_session.query(MonthlyCategoryTotal).filter(
+            MonthlyCategoryTotal.project_id == self.project_id
+        ).delete(synchronize_session=False)
+
+    def ensure_built(self) -> bool:
+        """
+        Backfill the aggregates if the project has transactions but no totals.
+
+        Returns:
+            True if a rebuild was performed (and committed)
+        """
+        has_totals = self.db_session.query(
+            self.db_session.query(MonthlyCategoryTotal)
+            .filter(MonthlyCategoryTotal.project_id == self.project_id)
+            .exists()
+        ).scalar()
+        if has_totals:
+            return False
+
+        has_transactions = self.db_session.query(
+            self.db_session.query(Transaction)
+            .filter(Transaction.project_id == self.project_id)
+            .exists()
+        ).scalar()
+        if not has_transactions:
+            return False
+
+        self.rebuild()
+        self.db_session.commit()
+        return True
+
+    def get_totals(self, month: Optional[str] = None) -> 'pd.DataFrame':
+        """
+        Read the aggregates as a DataFrame.
+
+        Args:
+            month: Optional "YYYY-MM" month to restrict to
+
+        Returns:
+            DataFrame with columns Periodo, Categoría, Total, Cantidad,
+            Ingresos and Gastos, sorted by month and category
+        """
+        query = self.db_session.query(
+            MonthlyCategoryTotal.month,
+            MonthlyCategoryTotal.category,
+            MonthlyCategoryTotal.total,
+            MonthlyCategoryTotal.count,
+            MonthlyCategoryTotal.income,
+            MonthlyCategoryTotal.expense
+        ).filter(MonthlyCategoryTotal.project_id == self.project_id)
+
+        if month:
+            query = query.filter(MonthlyCategoryTotal.month == month)
+
+        rows = query.order_by(MonthlyCategoryTotal.month, MonthlyCategoryTotal.category).all()
+        return pd.DataFrame.from_records(rows, columns=self.COLUMNS)
@@ -1,16 +1,22 @@
 """AI-powered categorization service using sentence-transformers."""
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import numpy as np
 from datetime import datetime
 import os
 
 from models import CategoryTrainingExample, TransactionEmbedding, Transaction
+from utils.lazy_import import lazy_import
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Imports torch; loaded with the model, not with the service
+sentence_transformers = lazy_import('sentence_transformers')
+
 
 class AICategorizationService:
     """
@@ -24,10 +30,17 @@ class AICategorizationService:
     HIGH_CONFIDENCE = 0.85  # Auto-apply with 🟢 indicator
     MEDIUM_CONFIDENCE = 0.70  # Apply but mark uncertain with 🟡 indicator
 
+    # A category's score weighs its best, second and third matches
+    TOP_MATCH_WEIGHTS = [0.5, 0.3, 0.2]
+
     # Model configuration
     MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
     EMBEDDING_DIM = 384
 
+    # Batch sizes for generate_embeddings()
+    ENCODE_BATCH_SIZE = 64  # Texts per model.encode call
+    HASH_LOOKUP_SIZE = 500  # Hashes per cache IN query (SQLite variable limit)
+
     def __init__(self, db_session: Session, project_id: int):
         """
         Initialize AI categorization service.
@@ -50,7 +63,7 @@ class AICategorizationService:
         """
         if self._model is None:
             try:
-                from sentence_transformers import SentenceTransformer
+                SentenceTransformer = sentence_transformers.SentenceTransformer
 
                 model_path = self._get_model_path()
 
@@ -181,20 +194,104 @@ class AICategorizationService:
 
             self.db_session.add(cache_entry)
             self.db_session.commit()
-            logger.debug(f"Cached embedding for '{concepto[:30]}...'")
+            logger.debug("Cached embedding for '%.30s...'", concepto)
 
         except IntegrityError:
             # Already cached by another process - that's OK
             self.db_session.rollback()
-            logger.debug(f"Embedding '{text_hash[:8]}...' already cached concurrently")
+            logger.debug("Embedding '%.8s...' already cached concurrently", text_hash)
 
         except Exception as e:
             # Other error - log but don't fail
             self.db_session.rollback()
-            logger.debug(f"Could not cache embedding: {e}")
+            logger.debug("Could not cache embedding: %s", e)
 
         return embedding
 
+    def generate_embeddings(
+        self,
+        texts: List[Tuple[str, Optional[str]]],
+        progress_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> List[np.ndarray]:
+        """
+        Generate embedding vectors for many transaction texts at once.
+
+        Cached embeddings are read with a few IN queries; the rest are
+        encoded by the model in batches and added to the cache. The new
+        cache rows are flushed, not committed: the caller commits.
+
+        Args:
+            texts: (concepto, movimiento) pairs; movimiento may be None
+            progress_callback: Optional callback(message, current, total),
+                called after each encoded batch
+
+        Returns:
+            One embedding per input pair, in input order
+        """
+        hashes = [TransactionEmbedding.compute_text_hash(c, m) for c, m in texts]
+        unique_hashes = list(dict.fromkeys(hashes))
+
+        embeddings: Dict[str, np.ndarray] = {}
+        for start in range(0, len(unique_hashes), self.HASH_LOOKUP_SIZE):
+            chunk = unique_hashes[start:start + self.HASH_LOOKUP_SIZE]
+            rows = (
+                self.db_session.query(TransactionEmbedding.text_hash, TransactionEmbedding.embedding)
+                .filter(
+                    TransactionEmbedding.project_id == self.project_id,
+                    TransactionEmbedding.text_hash.in_(chunk)
+                )
+                .all()
+            )
+            for text_hash, blob in rows:
+                embeddings[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+        # First occurrence of each uncached text
+        missing = {}
+        for text_hash, (concepto, movimiento) in zip(hashes, texts):
+            if text_hash not in embeddings and text_hash not in missing:
+                missing[text_hash] = (concepto, movimiento)
+
+        logger.info(
+            f"Embeddings: {len(unique_hashes) - len(missing)} cached, {len(missing)} to encode"
+        )
+
+        if missing:
+            model = self._load_model()
+            pending = list(missing.items())
+            cache_rows = []
+            for start in range(0, len(pending), self.ENCODE_BATCH_SIZE):
+                batch = pending[start:start + self.ENCODE_BATCH_SIZE]
+                vectors = model.encode(
+                    [f"{c} {m}" if m else c for _, (c, m) in batch],
+                    batch_size=self.ENCODE_BATCH_SIZE,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+                for (text_hash, (concepto, movimiento)), vector in zip(batch, vectors):
+                    vector = vector.astype(np.float32)
+                    embeddings[text_hash] = vector
+                    cache_rows.append({
+                        'project_id': self.project_id,
+                        'text_hash': text_hash,
+                        'concepto': concepto,
+                        'movimiento': movimiento,
+                        'embedding': vector.tobytes(),
+                        'model_version': self.MODEL_NAME
+                    })
+                if progress_callback:
+                    progress_callback(
+                        "Encoding transaction texts...", start + len(batch), len(pending)
+                    )
+
+            # text_hash is unique across projects: keep any existing entry
+            table = TransactionEmbedding.__table__
+            self.db_session.execute(
+                sqlite_insert(table).on_conflict_do_nothing(index_elements=[table.c.text_hash]),
+                cache_rows
+            )
+
+        return [embeddings[text_hash] for text_hash in hashes]
+
     def categorize_with_confidence(
         self,
         concepto: str,
@@ -254,14 +351,14 @@ class AICategorizationService:
                     category_scores[cat] = []
 
                 # Keep top-3 matches per category
-                if len(category_scores[cat]) < 3:
+                if len(category_scores[cat]) < len(self.TOP_MATCH_WEIGHTS):
                     category_scores[cat].append(sim['confidence'])
 
             # Calculate weighted average per category
             category_confidences = {}
             for cat, scores in category_scores.items():
                 # Weight: 0.5 for best, 0.3 for second, 0.2 for third
-                weights = [0.5, 0.3, 0.2][:len(scores)]
+                weights = self.TOP_MATCH_WEIGHTS[:len(scores)]
                 weighted_score = sum(s * w for s, w in zip(scores, weights))
                 category_confidences[cat] = weighted_score
 
@@ -327,7 +424,7 @@ class AICategorizationService:
         except IntegrityError:
             # Ignore concurrent usage updates
             self.db_session.rollback()
-            logger.debug(f"Concurrent update ignored for example {example_id}")
+            logger.debug("Concurrent update ignored for example %s", example_id)
 
     def learn_from_correction(
         self,
@@ -361,7 +458,7 @@ class AICategorizationService:
             )
 
             if existing:
-                logger.debug(f"Training example already exists for '{transaction.concepto}'")
+                logger.debug("Training example already exists for '%s'", transaction.concepto)
                 return None
 
             # Generate embedding
@@ -388,7 +485,7 @@ class AICategorizationService:
             except IntegrityError:
                 # Example already created by concurrent process
                 self.db_session.rollback()
-                logger.debug(f"Training example already created concurrently for '{transaction.concepto}'")
+                logger.debug("Training example already created concurrently for '%s'", transaction.concepto)
                 return None
 
             # Invalidate cache
@@ -441,12 +538,25 @@ class AICategorizationService:
         """
         Get statistics about training data.
 
+        Computed by one GROUP BY over the idx_training_stats index, without
+        loading examples or their embeddings.
+
         Returns:
             Dictionary with training statistics
         """
-        examples = self._load_training_examples()
+        rows = (
+            self.db_session.query(
+                CategoryTrainingExample.category,
+                CategoryTrainingExample.source,
+                func.count(),
+                func.sum(CategoryTrainingExample.times_used)
+            )
+            .filter(CategoryTrainingExample.project_id == self.project_id)
+            .group_by(CategoryTrainingExample.category, CategoryTrainingExample.source)
+            .all()
+        )
 
-        if not examples:
+        if not rows:
             return {
                 'total_examples': 0,
                 'categories': {},
@@ -454,21 +564,21 @@ class AICategorizationService:
                 'avg_usage': 0
             }
 
-        # Count by category
         categories = {}
-        for ex in examples:
-            categories[ex.category] = categories.get(ex.category, 0) + 1
-
-        # Count by source
         sources = {}
-        for ex in examples:
-            sources[ex.source] = sources.get(ex.source, 0) + 1
+        total_examples = 0
+        total_usage = 0
+        for category, source, count, usage in rows:
+            categories[category] = categories.get(category, 0) + count
+            sources[source] = sources.get(source, 0) + count
+            total_examples += count
+            total_usage += usage or 0
 
         # Average usage
-        avg_usage = sum(ex.times_used for ex in examples) / len(examples)
+        avg_usage = total_usage / total_examples
 
         return {
-            'total_examples': len(examples),
+            'total_examples': total_examples,
             'categories': categories,
             'sources': sources,
             'avg_usage': avg_usage,
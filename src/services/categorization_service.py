@@ -1,9 +1,12 @@
 """Smart categorization service with rule learning and AI integration."""
 from typing import List, Optional, Tuple, Dict
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from models import CategoryRule, Transaction
+from services.aggregate_service import AggregateService
 from utils.categories import get_default_category, CATEGORIES
+from utils.merchants import normalize_merchant
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -121,7 +124,7 @@ class CategorizationService:
         user_rules = self._load_rules()
         for rule in user_rules:
             if rule.match(concepto):
-                logger.debug(f"Matched user rule: {rule.pattern} -> {rule.category}")
+                logger.debug("Matched user rule: %s -> %s", rule.pattern, rule.category)
                 return {
                     'category': rule.category,
                     'confidence': 1.0,
@@ -145,8 +148,8 @@ class CategorizationService:
                     priority = int(50 + (ai_confidence - 0.70) * 133)  # Scale to 50-90
 
                     logger.debug(
-                        f"AI categorization: {concepto[:30]}... -> {ai_category} "
-                        f"(confidence: {ai_confidence:.2%})"
+                        "AI categorization: %.30s... -> %s (confidence: %.2f%%)",
+                        concepto, ai_category, ai_confidence * 100
                     )
 
                     return {
@@ -158,8 +161,8 @@ class CategorizationService:
                     }
                 elif ai_category:
                     logger.debug(
-                        f"AI confidence too low ({ai_confidence:.2%}), "
-                        "falling back to keywords"
+                        "AI confidence too low (%.2f%%), falling back to keywords",
+                        ai_confidence * 100
                     )
 
             except Exception as e:
@@ -179,7 +182,7 @@ class CategorizationService:
                         priority = 50
                         break
 
-            logger.debug(f"Keyword match: {concepto[:30]}... -> {category}")
+            logger.debug("Keyword match: %.30s... -> %s", concepto, category)
 
             return {
                 'category': category,
@@ -212,8 +215,7 @@ class CategorizationService:
         Returns:
             CategoryRule object if created, None if rule already exists
         """
-        # Extract a pattern from the transaction concept
-        # For now, use the first significant word (>3 chars)
+        # Extract a pattern from the transaction concept (its merchant key)
         pattern = self._extract_pattern(transaction.concepto)
 
         if not pattern:
@@ -248,7 +250,7 @@ class CategorizationService:
         except IntegrityError:
             # Rule already exists (race condition)
             self.db_session.rollback()
-            logger.debug(f"Rule already exists for pattern '{pattern}'")
+            logger.debug("Rule already exists for pattern '%s'", pattern)
             return None
 
         self.invalidate_cache()
@@ -259,10 +261,9 @@ class CategorizationService:
         """
         Extract a meaningful pattern from a transaction concept.
 
-        Strategy:
-        1. Split into words
-        2. Find the first significant word (>3 characters, not a number)
-        3. Return that word as the pattern
+        Uses the concept's merchant key (the same key stored in
+        Transaction.merchant_key), lowercased; it always occurs in the concept,
+        so the resulting rule matches it.
 
         Args:
             concepto: Transaction description
@@ -273,30 +274,43 @@ class CategorizationService:
         if not concepto:
             return None
 
-        # Remove common prefixes and clean
-        concepto_clean = concepto.strip()
-
-        # Split into words and find first significant one
-        words = concepto_clean.split()
-        for word in words:
-            # Remove punctuation
-            word_clean = ''.join(c for c in word if c.isalnum())
-
-            # Check if it's a significant word
-            if len(word_clean) > 3 and not word_clean.isdigit():
-                return word_clean.lower()
+        merchant_key = normalize_merchant(concepto)
+        if merchant_key:
+            return merchant_key.lower()
 
-        # If no significant word found, use the whole concept (truncated)
+        # If no merchant found, use the whole concept (truncated)
+        concepto_clean = concepto.strip()
         if len(concepto_clean) > 3:
             return concepto_clean[:50].lower()
 
         return None
 
+    def count_merchant_transactions(self, merchant_key: str) -> int:
+        """
+        Count the project's transactions of a merchant.
+
+        Args:
+            merchant_key: Merchant key as stored in Transaction.merchant_key
+
+        Returns:
+            Number of transactions with that merchant key
+        """
+        return (
+            self.db_session.query(func.count(Transaction.id))
+            .filter(
+                Transaction.project_id == self.project_id,
+                Transaction.merchant_key == merchant_key
+            )
+            .scalar()
+        )
+
     def apply_rules_to_transactions(self, transactions: List[Transaction]) -> Dict[str, int]:
         """
         Apply categorization rules to a list of transactions.
 
         This is used during import to auto-categorize new transactions.
+        Category changes of persisted transactions are applied to the
+        monthly aggregates; the caller is responsible for committing.
 
         Args:
             transactions: List of Transaction objects to categorize
@@ -317,6 +331,8 @@ class CategorizationService:
             'default': 0
         }
 
+        aggregates = AggregateService(self.db_session, self.project_id)
+
         for transaction in transactions:
             # Skip if already manually categorized
             if transaction.is_manually_edited:
@@ -329,6 +345,13 @@ class CategorizationService:
             )
 
             # Apply categorization
+            if transaction.id is not None:
+                aggregates.move(
+                    transaction.fecha,
+                    transaction.importe,
+                    transaction.categoria,
+                    result['category']
+                )
             transaction.categoria = result['category']
             transaction.ai_confidence = result['confidence']
             transaction.categorization_method = result['method']
@@ -338,6 +361,8 @@ class CategorizationService:
             if method in stats:
                 stats[method] += 1
 
+        aggregates.flush()
+
         return stats
 
     def get_all_rules(self) -> List[CategoryRule]:
@@ -1,11 +1,14 @@
 """Initial training service for bootstrapping AI from existing data."""
-from typing import List, Dict, Callable, Optional
-from sqlalchemy.orm import Session
+from typing import Callable, Dict, List, Optional, Tuple
 from collections import defaultdict
+import numpy as np
+from sqlalchemy import distinct, func, insert, text
+from sqlalchemy.orm import Session
 
-from models import Transaction, CategoryRule
+from models import Transaction, CategoryRule, CategoryTrainingExample
 from services.ai_categorization_service import AICategorizationService
 from utils.logger import setup_logger
+from utils.vectors import normalize_rows
 
 logger = setup_logger(__name__)
 
@@ -18,8 +21,72 @@ class InitialTrainingService:
     1. Learn from manually edited transactions
     2. Extract patterns from category rules
     3. Sample representative transactions from each category
+
+    The build runs a fixed number of statements regardless of the number
+    of rules or categories: one candidate query (with an anti-join against
+    existing examples), one batched encode and one bulk insert.
+
+    Representatives are chosen for diversity: a category's candidate pool
+    is clustered around farthest-point centers in embedding space and one
+    medoid per cluster is kept, so near-duplicates ("MERCADONA 1234" x10)
+    yield a single example.
     """
 
+    EXAMPLES_PER_RULE = 5  # Max matching transactions learned per rule
+    SAMPLES_PER_CATEGORY = 10  # Representatives top categories up to this many examples
+    MIN_CATEGORY_SIZE = 5  # Categories with fewer transactions get no representatives
+    REPRESENTATIVE_POOL_SIZE = 50  # Transactions per category clustered for representatives
+    DUPLICATE_SIMILARITY = 0.9  # Cosine similarity above which a sample adds nothing new
+
+    # Candidates from all three strategies that are not training examples yet.
+    # priority orders the strategies (a text learned from a manual edit is not
+    # added again as a rule match); the representative pool is every total/N-th
+    # transaction of a category by date.
+    CANDIDATE_QUERY = text("""
+        WITH candidates AS (
+            SELECT 0 AS priority, 'manual' AS source, concepto, movimiento,
+                   categoria AS category, 0 AS position
+            FROM transactions
+            WHERE project_id = :project_id AND categoria_original IS NOT NULL
+
+            UNION ALL
+
+            SELECT 1, 'rule', t.concepto, t.movimiento, r.category, 0
+            FROM category_rules r
+            JOIN transactions t ON t.id IN (
+                SELECT m.id FROM transactions m
+                WHERE m.project_id = :project_id
+                  AND m.concepto LIKE '%' || r.pattern || '%'
+                LIMIT :per_rule
+            )
+            WHERE r.project_id = :project_id
+
+            UNION ALL
+
+            SELECT 2, 'initial', concepto, movimiento, categoria, position
+            FROM (
+                SELECT concepto, movimiento, categoria, categoria_original,
+                       ROW_NUMBER() OVER (PARTITION BY categoria ORDER BY fecha, id) - 1 AS position,
+                       COUNT(*) OVER (PARTITION BY categoria) AS total
+                FROM transactions
+                WHERE project_id = :project_id
+            )
+            WHERE total >= :min_category_size
+              AND position % MAX(1, total / :pool_size) = 0
+              AND position / MAX(1, total / :pool_size) < :pool_size
+              AND (categoria_original IS NULL OR categoria = categoria_original)
+        )
+        SELECT c.source, c.concepto, c.movimiento, c.category
+        FROM candidates c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM category_training_examples e
+            WHERE e.project_id = :project_id
+              AND e.concepto = c.concepto
+              AND e.category = c.category
+        )
+        ORDER BY c.priority, c.category, c.position
+    """)
+
     def __init__(self, db_session: Session, project_id: int):
         """
         Initialize initial training service.
@@ -39,209 +106,265 @@ class InitialTrainingService:
         """
         Build initial training dataset from existing project data.
 
+        Nothing is committed until all examples are encoded, so a build
+        cancelled from the progress callback leaves no partial training data.
+
         Args:
-            progress_callback: Optional callback(message, current, total)
+            progress_callback: Optional callback(message, current, total).
+                Exceptions it raises (e.g. cancellation) abort without committing;
+                it is not called after the commit.
 
         Returns:
             Dictionary with training statistics
         """
         logger.info("Starting initial training dataset build...")
 
+        # STEP 1: Collect candidates from manual edits, rules and representatives
+        if progress_callback:
+            progress_callback("Collecting training candidates...", 0, 3)
+
+        examples, pools = self._collect_candidates()
+        pool_texts = [text for _, texts in pools.values() for text in texts]
+
+        # STEP 2: Encode all candidate texts in batches
+        if progress_callback:
+            progress_callback("Encoding transaction texts...", 1, 3)
+
+        embeddings = self.ai_service.generate_embeddings(
+            [(concepto, movimiento) for _, concepto, movimiento, _ in examples] + pool_texts,
+            progress_callback
+        )
+        pool_embeddings = embeddings[len(examples):]
+        embeddings = embeddings[:len(examples)]
+
+        for category, concepto, movimiento, embedding in self._choose_representatives(
+            examples, embeddings, pools, pool_embeddings
+        ):
+            examples.append(('initial', concepto, movimiento, category))
+            embeddings.append(embedding)
+
         stats = {
             'manual_edits': 0,
             'category_rules': 0,
             'representatives': 0,
-            'total_examples': 0,
+            'total_examples': len(examples),
             'categories_covered': 0
         }
+        stat_keys = {'manual': 'manual_edits', 'rule': 'category_rules', 'initial': 'representatives'}
+        for source, _, _, _ in examples:
+            stats[stat_keys[source]] += 1
+        logger.info(
+            f"Selected {stats['manual_edits']} manual edits, {stats['category_rules']} rule matches "
+            f"and {stats['representatives']} representatives from {len(pool_texts)} candidates"
+        )
 
-        # STEP 1: Learn from manually edited transactions
-        if progress_callback:
-            progress_callback("Learning from manual edits...", 0, 3)
-
-        manual_count = self._learn_from_manual_edits()
-        stats['manual_edits'] = manual_count
-        logger.info(f"Learned from {manual_count} manual edits")
-
-        # STEP 2: Extract patterns from category rules
-        if progress_callback:
-            progress_callback("Extracting patterns from rules...", 1, 3)
-
-        rules_count = self._learn_from_category_rules()
-        stats['category_rules'] = rules_count
-        logger.info(f"Learned from {rules_count} category rules")
-
-        # STEP 3: Sample representative transactions
+        # STEP 3: Save the examples (and new cached embeddings) in one commit
         if progress_callback:
-            progress_callback("Sampling representative transactions...", 2, 3)
-
-        representatives_count = self._sample_representatives()
-        stats['representatives'] = representatives_count
-        logger.info(f"Sampled {representatives_count} representative transactions")
+            progress_callback("Saving training examples...", 2, 3)
+
+        if examples:
+            self.db_session.execute(
+                insert(CategoryTrainingExample),
+                [
+                    {
+                        'project_id': self.project_id,
+                        'concepto': concepto,
+                        'movimiento': movimiento,
+                        'category': category,
+                        'source': source,
+                        'confidence': 1.0,
+                        'embedding': embedding.tobytes()
+                    }
+                    for (source, concepto, movimiento, category), embedding in zip(examples, embeddings)
+                ]
+            )
 
-        # Calculate totals
-        stats['total_examples'] = (
-            stats['manual_edits'] +
-            stats['category_rules'] +
-            stats['representatives']
+        stats['categories_covered'] = (
+            self.db_session.query(func.count(distinct(CategoryTrainingExample.category)))
+            .filter(CategoryTrainingExample.project_id == self.project_id)
+            .scalar()
         )
 
-        # Get unique categories covered
-        training_stats = self.ai_service.get_training_stats()
-        stats['categories_covered'] = len(training_stats.get('categories', {}))
-
+        # Last cancellable point, before anything is committed
         if progress_callback:
             progress_callback("Training complete!", 3, 3)
 
+        self.db_session.commit()
+        self.ai_service.invalidate_cache()
+
         logger.info(f"Initial training complete: {stats}")
         return stats
 
-    def _learn_from_manual_edits(self) -> int:
+    def _collect_candidates(self) -> Tuple[
+        List[Tuple[str, str, Optional[str], str]],
+        Dict[str, Tuple[int, List[Tuple[str, Optional[str]]]]]
+    ]:
         """
-        Learn from transactions that were manually edited.
+        Collect new manual and rule examples and the representative pools.
+
+        Each (concepto, category) pair is learned once, from the first
+        strategy that yields it. Only categories with fewer than
+        SAMPLES_PER_CATEGORY examples, counting the manual and rule ones
+        selected here, get a representative pool.
 
         Returns:
-            Number of training examples created
+            Tuple of:
+            - list of (source, concepto, movimiento, category) examples
+            - category -> (representatives needed, [(concepto, movimiento)]) pools
         """
-        # Get all manually edited transactions
-        manual_transactions = (
-            self.db_session.query(Transaction)
-            .filter(
-                Transaction.project_id == self.project_id,
-                Transaction.categoria_original.isnot(None)
-            )
+        rows = self.db_session.execute(
+            self.CANDIDATE_QUERY,
+            {
+                'project_id': self.project_id,
+                'per_rule': self.EXAMPLES_PER_RULE,
+                'pool_size': self.REPRESENTATIVE_POOL_SIZE,
+                'min_category_size': self.MIN_CATEGORY_SIZE
+            }
+        ).all()
+
+        category_counts = defaultdict(int, (
+            self.db_session.query(CategoryTrainingExample.category, func.count())
+            .filter(CategoryTrainingExample.project_id == self.project_id)
+            .group_by(CategoryTrainingExample.category)
             .all()
-        )
-
-        logger.info(f"Found {len(manual_transactions)} manually edited transactions")
-
-        # Learn from each manual edit
-        count = self.ai_service.retrain_from_transactions(
-            manual_transactions,
-            source='manual'
-        )
-
-        return count
-
-    def _learn_from_category_rules(self) -> int:
+        ))
+
+        selected = {}  # (concepto, category) -> (source, movimiento)
+        samples = defaultdict(dict)  # category -> {concepto: movimiento}
+        for source, concepto, movimiento, category in rows:
+            if source == 'initial':
+                samples[category].setdefault(concepto, movimiento)
+            elif (concepto, category) not in selected:
+                selected[(concepto, category)] = (source, movimiento)
+                category_counts[category] += 1
+
+        pools = {}
+        for category, texts in samples.items():
+            needed = self.SAMPLES_PER_CATEGORY - category_counts[category]
+            texts = [
+                (concepto, movimiento) for concepto, movimiento in texts.items()
+                if (concepto, category) not in selected
+            ]
+            if needed > 0 and texts:
+                pools[category] = (needed, texts)
+
+        examples = [
+            (source, concepto, movimiento, category)
+            for (concepto, category), (source, movimiento) in selected.items()
+        ]
+        return examples, pools
+
+    def _choose_representatives(
+        self,
+        examples: List[Tuple[str, str, Optional[str], str]],
+        embeddings: List[np.ndarray],
+        pools: Dict[str, Tuple[int, List[Tuple[str, Optional[str]]]]],
+        pool_embeddings: List[np.ndarray]
+    ) -> List[Tuple[str, str, Optional[str], np.ndarray]]:
         """
-        Extract patterns from existing category rules.
+        Choose diverse representatives from each category's pool.
+
+        A category's existing examples and the new manual and rule ones
+        count as already covered, so representatives only fill the gaps.
 
-        For each rule, find matching transactions and create training examples.
+        Args:
+            examples: New (source, concepto, movimiento, category) examples
+            embeddings: Embeddings of examples, in the same order
+            pools: Pools returned by _collect_candidates
+            pool_embeddings: Embeddings of all pool texts, in pool order
 
         Returns:
-            Number of training examples created
+            List of (category, concepto, movimiento, embedding) representatives
         """
-        # Get all category rules
-        rules = (
-            self.db_session.query(CategoryRule)
-            .filter(CategoryRule.project_id == self.project_id)
+        if not pools:
+            return []
+
+        known = defaultdict(list)
+        for (_, _, _, category), embedding in zip(examples, embeddings):
+            if category in pools:
+                known[category].append(embedding)
+        existing = (
+            self.db_session.query(CategoryTrainingExample.category, CategoryTrainingExample.embedding)
+            .filter(
+                CategoryTrainingExample.project_id == self.project_id,
+                CategoryTrainingExample.category.in_(pools)
+            )
             .all()
         )
-
-        logger.info(f"Found {len(rules)} category rules")
-
-        count = 0
-
-        for rule in rules:
-            # Find transactions matching this rule
-            matching_transactions = (
-                self.db_session.query(Transaction)
-                .filter(
-                    Transaction.project_id == self.project_id,
-                    Transaction.concepto.contains(rule.pattern)
-                )
-                .limit(5)  # Max 5 examples per rule
-                .all()
-            )
-
-            # Create training examples
-            for transaction in matching_transactions:
-                example = self.ai_service.learn_from_correction(
-                    transaction,
-                    rule.category,
-                    source='rule'
-                )
-                if example:
-                    count += 1
-
-        logger.info(f"Created {count} training examples from rules")
-        return count
-
-    def _sample_representatives(self, samples_per_category: int = 10) -> int:
+        for category, blob in existing:
+            known[category].append(np.frombuffer(blob, dtype=np.float32))
+
+        representatives = []
+        offset = 0
+        for category, (needed, texts) in pools.items():
+            vectors = np.array(pool_embeddings[offset:offset + len(texts)])
+            offset += len(texts)
+            for index in self._diverse_medoids(vectors, known[category], needed):
+                concepto, movimiento = texts[index]
+                representatives.append((category, concepto, movimiento, vectors[index]))
+        return representatives
+
+    @classmethod
+    def _diverse_medoids(cls, vectors: np.ndarray, known: List[np.ndarray], k: int) -> List[int]:
         """
-        Sample representative transactions from each category.
+        Pick up to k diverse rows: one medoid per farthest-point cluster.
 
-        For categories with many transactions but few training examples,
-        create additional training data by sampling diverse transactions.
+        Centers are chosen by farthest-point sampling in cosine distance,
+        starting from the known examples (or the row closest to the pool's
+        mean) and stopping early once every row is within
+        DUPLICATE_SIMILARITY of a center or known example. Each row joins
+        its most similar center; rows closer to a known example join no
+        cluster. Each cluster contributes the member with the highest
+        total similarity to the others.
 
         Args:
-            samples_per_category: Max samples per category
+            vectors: Pool embeddings, one row per candidate
+            known: Embeddings already covering the category
+            k: Maximum number of rows to pick
 
         Returns:
-            Number of training examples created
+            Indices of the chosen rows
         """
-        # Get transaction counts by category
-        category_counts = defaultdict(int)
-        transactions_by_category = defaultdict(list)
-
-        all_transactions = (
-            self.db_session.query(Transaction)
-            .filter(Transaction.project_id == self.project_id)
-            .all()
-        )
-
-        for transaction in all_transactions:
-            category = transaction.categoria
-            category_counts[category] += 1
-            transactions_by_category[category].append(transaction)
-
-        # Get current training example counts
-        training_stats = self.ai_service.get_training_stats()
-        training_by_category = training_stats.get('categories', {})
-
-        count = 0
-
-        # For each category, check if we need more examples
-        for category, transactions in transactions_by_category.items():
-            current_examples = training_by_category.get(category, 0)
-            total_transactions = len(transactions)
-
-            # Skip if enough examples or too few transactions
-            if current_examples >= samples_per_category or total_transactions < 5:
-                continue
-
-            # How many more do we need?
-            needed = min(
-                samples_per_category - current_examples,
-                total_transactions
-            )
-
-            # Sample diverse transactions (spread across time)
-            step = max(1, total_transactions // needed)
-            sampled = transactions[::step][:needed]
-
-            # Create training examples
-            for transaction in sampled:
-                # Skip if already manually edited (already learned)
-                if transaction.is_manually_edited:
-                    continue
-
-                example = self.ai_service.learn_from_correction(
-                    transaction,
-                    category,
-                    source='initial'
-                )
-                if example:
-                    count += 1
-
-        logger.info(f"Sampled {count} representative transactions")
-        return count
-
-    def get_training_readiness(self) -> Dict[str, any]:
+        vectors = normalize_rows(vectors)
+        if known:
+            known_similarity = (vectors @ normalize_rows(np.array(known)).T).max(axis=1)
+        else:
+            known_similarity = np.full(len(vectors), -np.inf)
+
+        centers = []
+        best = known_similarity.copy()  # Similarity to the nearest center or known example
+        while len(centers) < k:
+            if centers or known:
+                pick = int(np.argmin(best))
+                if best[pick] >= cls.DUPLICATE_SIMILARITY:
+                    break
+            else:
+                pick = int(np.argmax(vectors @ vectors.mean(axis=0)))
+            centers.append(pick)
+            best = np.maximum(best, vectors @ vectors[pick])
+
+        medoids = []
+        if not centers:
+            return medoids
+        similarity = vectors @ vectors[centers].T
+        nearest = similarity.argmax(axis=1)
+        owned = similarity.max(axis=1) >= known_similarity
+        for cluster, center in enumerate(centers):
+            members = np.flatnonzero((nearest == cluster) & owned)
+            if len(members) == 0:
+                members = np.array([center])
+            block = vectors[members]
+            medoids.append(int(members[np.argmax((block @ block.T).sum(axis=1))]))
+        return list(dict.fromkeys(medoids))
+
+    def get_training_readiness(self, training_stats: Optional[Dict[str, any]] = None) -> Dict[str, any]:
         """
         Assess readiness for AI categorization.
 
+        Args:
+            training_stats: Result of AICategorizationService.get_training_stats
+                if the caller already has it (queried otherwise)
+
         Returns:
             Dictionary with readiness assessment
         """
@@ -263,7 +386,8 @@ class InitialTrainingService:
         )
 
         # Get current training stats
-        training_stats = self.ai_service.get_training_stats()
+        if training_stats is None:
+            training_stats = self.ai_service.get_training_stats()
         total_examples = training_stats.get('total_examples', 0)
 
         # Determine readiness level
@@ -1,12 +1,17 @@
 """Excel to SQLite migration service."""
-from typing import List
+from typing import Callable, List, Optional
 from pathlib import Path
+from datetime import datetime
 import pandas as pd
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from models.database import DatabaseManager
 from models.project import Project
-from models.transaction import Transaction
+from models.transaction import Transaction, bump_data_version
+from services.aggregate_service import AggregateService
+from services.recurring_detector import RecurringDetector
 from utils.data_processor import DataProcessor
+from utils.merchants import normalize_merchant
 
 class MigrationService:
     """Handles importing Excel files into SQLite database."""
@@ -25,7 +30,9 @@ class MigrationService:
         project_id: int,
         file_paths: List[str],
         skip_duplicates: bool = True,
-        categorization_service = None
+        categorization_service = None,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        session: Optional[Session] = None
     ) -> dict:
         """
         Import Excel files into a project.
@@ -34,12 +41,22 @@ class MigrationService:
             project_id: Target project ID
             file_paths: List of Excel file paths to import
             skip_duplicates: If True, skip transactions with same date+concept+amount
+                (enforced by the unique dedupe_key index, not by loading the project)
             categorization_service: Optional CategorizationService for AI categorization during import
+            progress_callback: Optional callback(message, current, total) called before each file.
+                Exceptions it raises (e.g. cancellation) abort the import without committing.
+            session: Optional session to import into. The caller then owns the
+                transaction: the import is flushed but neither committed nor closed,
+                so it commits or rolls back together with the caller's other work.
 
         Returns:
-            Dictionary with import statistics (imported, skipped, errors)
+            Dictionary with import statistics (imported, skipped, errors).
+            Files that cannot be read are reported in errors; database errors
+            abort the whole import without committing.
         """
-        session = self.db_manager.get_session()
+        owns_session = session is None
+        if owns_session:
+            session = self.db_manager.get_session()
         stats = {
             'imported': 0,
             'skipped': 0,
@@ -52,78 +69,123 @@ class MigrationService:
             if not project:
                 raise ValueError(f"Project with ID {project_id} not found")
 
-            # Get existing transactions for duplicate detection
-            existing_hashes = set()
-            if skip_duplicates:
-                existing = session.query(
-                    Transaction.fecha,
-                    Transaction.concepto,
-                    Transaction.importe
-                ).filter_by(project_id=project_id).all()
-                existing_hashes = {self._transaction_hash(t.fecha, t.concepto, t.importe) for t in existing}
+            aggregates = AggregateService(session, project_id)
+            detector = RecurringDetector(session, project_id)
+            previous_version = detector.get_data_version()
+            inserted_rows = []
 
             # Process each file
-            for file_path in file_paths:
+            for index, file_path in enumerate(file_paths):
+                if progress_callback:
+                    progress_callback(f"Importing {Path(file_path).name}...", index, len(file_paths))
+
                 try:
                     # Load and clean data using existing DataProcessor
                     df = DataProcessor.load_and_clean_data(file_path)
                     # Pass categorization_service to enable AI during import
                     df = DataProcessor.analyze_transactions(df, categorization_service=categorization_service)
 
-                    # Import each transaction
-                    for _, row in df.iterrows():
-                        # Check for duplicates
-                        trans_hash = self._transaction_hash(row['Fecha'], row['Concepto'], row['Importe'])
-                        if skip_duplicates and trans_hash in existing_hashes:
-                            stats['skipped'] += 1
-                            continue
-
-                        # Create transaction with AI metadata
-                        transaction = Transaction(
-                            project_id=project_id,
-                            fecha=row['Fecha'],
-                            concepto=row['Concepto'],
-                            movimiento=row.get('Movimiento', ''),
-                            importe=row['Importe'],
-                            categoria=row['Categoría'],
-                            ai_confidence=row.get('AI_Confidence'),  # Include AI confidence from analysis
-                            categorization_method=row.get('Categorization_Method'),  # Include method
-                            categoria_original=None,  # First import, no manual edit yet
-                            source_file=Path(file_path).name
-                        )
-                        session.add(transaction)
-                        existing_hashes.add(trans_hash)
-                        stats['imported'] += 1
-
+                    rows = self._build_rows(project_id, df, Path(file_path).name, skip_duplicates)
                 except Exception as e:
                     stats['errors'].append(f"{Path(file_path).name}: {str(e)}")
-
-            # Commit all changes
-            session.commit()
-
-            # Update project timestamp
+                    continue
+
+                if not rows:
+                    continue
+
+                # Duplicates are rejected by the unique (project_id, dedupe_key) index,
+                # RETURNING yields only the rows that were actually inserted. The insert
+                # may run as several statements, so a failure aborts the whole import
+                # rather than keeping earlier batches without their aggregate deltas.
+                inserted = self._insert_rows(session, rows)
+
+                for row in inserted:
+                    aggregates.add(row.fecha, row.categoria, row.importe)
+                inserted_rows.extend(inserted)
+
+                stats['imported'] += len(inserted)
+                stats['skipped'] += len(rows) - len(inserted)
+
+            # Commit all changes together with the aggregate deltas, the
+            # updated recurring patterns of the imported merchants and the
+            # project timestamp
+            aggregates.flush()
+            if inserted_rows:
+                # Core inserts bypass the ORM flush hook that bumps the version
+                bump_data_version(session, [project_id])
+            detector.add_transactions(inserted_rows, previous_version)
             project.updated_at = pd.Timestamp.now()
-            session.commit()
+            if owns_session:
+                session.commit()
+            else:
+                session.flush()
 
         finally:
-            session.close()
+            if owns_session:
+                session.close()
 
         return stats
 
-    def _transaction_hash(self, fecha, concepto: str, importe: float) -> str:
+    def _build_rows(self, project_id: int, df: pd.DataFrame, source_file: str, skip_duplicates: bool) -> List[dict]:
+        """
+        Convert an analyzed DataFrame into insertable transaction rows.
+
+        Args:
+            project_id: Target project ID
+            df: DataFrame returned by DataProcessor.analyze_transactions
+            source_file: Original Excel filename
+            skip_duplicates: If True, set dedupe_key so duplicates are rejected
+
+        Returns:
+            List of column dictionaries for the transactions table
+        """
+        now = datetime.utcnow()
+        rows = []
+        for record in df.to_dict('records'):
+            dedupe_key = None
+            if skip_duplicates:
+                dedupe_key = Transaction.compute_dedupe_key(
+                    record['Fecha'],
+                    record['Concepto'],
+                    record['Importe']
+                )
+
+            rows.append({
+                'project_id': project_id,
+                'fecha': record['Fecha'].to_pydatetime(),
+                'concepto': record['Concepto'],
+                'movimiento': record.get('Movimiento', ''),
+                'importe': float(record['Importe']),
+                'categoria': record['Categoría'],
+                'ai_confidence': record.get('AI_Confidence'),  # Include AI confidence from analysis
+                'categorization_method': record.get('Categorization_Method'),  # Include method
+                'categoria_original': None,  # First import, no manual edit yet
+                'dedupe_key': dedupe_key,
+                'merchant_key': normalize_merchant(record['Concepto']),
+                'source_file': source_file,
+                'created_at': now,
+                'updated_at': now,
+            })
+        return rows
+
+    def _insert_rows(self, session: Session, rows: List[dict]) -> list:
         """
-        Generate a hash for duplicate detection.
+        Insert transaction rows, skipping those whose dedupe_key already exists.
 
         Args:
-            fecha: Transaction date
-            concepto: Transaction description
-            importe: Transaction amount
+            session: Database session
+            rows: Column dictionaries from _build_rows
 
         Returns:
-            Hash string
+            Inserted rows (id, fecha, merchant_key, categoria, importe)
         """
-        fecha_str = pd.Timestamp(fecha).strftime('%Y-%m-%d')
-        return f"{fecha_str}|{concepto}|{importe:.2f}"
+        table = Transaction.__table__
+        statement = (
+            sqlite_insert(table)
+            .on_conflict_do_nothing(index_elements=[table.c.project_id, table.c.dedupe_key])
+            .returning(table.c.id, table.c.fecha, table.c.merchant_key, table.c.categoria, table.c.importe)
+        )
+        return session.execute(statement, rows).all()
 
     def export_project_to_excel(self, project_id: int, output_path: str):
         """
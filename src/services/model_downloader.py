@@ -2,10 +2,14 @@
 from pathlib import Path
 import os
 from typing import Optional, Callable
+from utils.lazy_import import lazy_import
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Imports torch; loaded only when a download starts
+sentence_transformers = lazy_import('sentence_transformers')
+
 
 class ModelDownloader:
     """
@@ -68,7 +72,7 @@ class ModelDownloader:
             True if successful, False otherwise
         """
         try:
-            from sentence_transformers import SentenceTransformer
+            SentenceTransformer = sentence_transformers.SentenceTransformer
 
             if self.is_model_downloaded():
                 logger.info("Model already downloaded")
@@ -1,10 +1,13 @@
 """Project lifecycle management service."""
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 from models.database import DatabaseManager
 from models.project import Project
 from models.transaction import Transaction
+from models.recurring_pattern import RecurringPatternRecord
+from services.aggregate_service import AggregateService
 
 class ProjectManager:
     """Manages project lifecycle operations (CRUD, activation, etc.)."""
@@ -93,6 +96,23 @@ class ProjectManager:
         finally:
             session.close()
 
+    def list_projects_with_stats(self) -> List[Tuple[Project, dict]]:
+        """
+        List all projects with their stats, ordered by most recently updated.
+
+        The stats of every project are computed by a single grouped query.
+
+        Returns:
+            List of (project, stats) tuples
+        """
+        session = self.db_manager.get_session()
+        try:
+            projects = session.query(Project).order_by(Project.updated_at.desc()).all()
+            stats = self._query_stats(session)
+            return [(project, stats.get(project.id, self._empty_stats())) for project in projects]
+        finally:
+            session.close()
+
     def delete_project(self, project_id: int) -> bool:
         """
         Delete a project and all its associated data.
@@ -109,6 +129,12 @@ class ProjectManager:
             if not project:
                 return False
 
+            # Aggregates and stored recurring patterns are not covered by ORM cascades
+            AggregateService(session, project_id).clear()
+            session.query(RecurringPatternRecord).filter(
+                RecurringPatternRecord.project_id == project_id
+            ).delete(synchronize_session=False)
+
             session.delete(project)
             session.commit()
             return True
@@ -127,26 +153,54 @@ class ProjectManager:
         """
         session = self.db_manager.get_session()
         try:
-            transactions = session.query(Transaction).filter_by(project_id=project_id).all()
-
-            if not transactions:
-                return {
-                    'transaction_count': 0,
-                    'earliest_date': None,
-                    'latest_date': None,
-                    'total_income': 0.0,
-                    'total_expenses': 0.0,
-                }
-
-            dates = [t.fecha for t in transactions]
-            amounts = [t.importe for t in transactions]
-
-            return {
-                'transaction_count': len(transactions),
-                'earliest_date': min(dates),
-                'latest_date': max(dates),
-                'total_income': sum(a for a in amounts if a > 0),
-                'total_expenses': sum(a for a in amounts if a < 0),
-            }
+            stats = self._query_stats(session, project_id)
+            return stats.get(project_id, self._empty_stats())
         finally:
             session.close()
+
+    def _query_stats(self, session: Session, project_id: int = None) -> Dict[int, dict]:
+        """
+        Compute project stats in SQL, grouped by project.
+
+        Args:
+            session: Database session
+            project_id: Restrict to one project (optional)
+
+        Returns:
+            Dictionary mapping project ID to stats dictionary
+        """
+        query = session.query(
+            Transaction.project_id,
+            func.count(Transaction.id),
+            func.min(Transaction.fecha),
+            func.max(Transaction.fecha),
+            func.sum(case((Transaction.importe > 0, Transaction.importe), else_=0.0)),
+            func.sum(case((Transaction.importe < 0, Transaction.importe), else_=0.0)),
+        )
+
+        if project_id is not None:
+            query = query.filter(Transaction.project_id == project_id)
+
+        rows = query.group_by(Transaction.project_id).all()
+
+        return {
+            row[0]: {
+                'transaction_count': row[1],
+                'earliest_date': row[2],
+                'latest_date': row[3],
+                'total_income': row[4] or 0.0,
+                'total_expenses': row[5] or 0.0,
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        """Stats of a project without transactions."""
+        return {
+            'transaction_count': 0,
+            'earliest_date': None,
+            'latest_date': None,
+            'total_income': 0.0,
+            'total_expenses': 0.0,
+        }
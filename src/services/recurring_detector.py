@@ -1,10 +1,15 @@
 """Recurring transaction detection service."""
-from typing import List, Dict, Optional
+import json
+from typing import Iterable, List, Dict, Optional, Tuple, Callable
 from datetime import datetime, timedelta
-from collections import defaultdict
 from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from models import Transaction
+from models import Project, RecurringPatternRecord, Transaction
+from models.transaction import data_version_recorded
+from utils.merchants import normalize_merchant
 
 
 @dataclass
@@ -13,8 +18,8 @@ class RecurringPattern:
 
     merchant_name: str  # Common merchant identifier
     category: str  # Transaction category
-    frequency: str  # "weekly", "monthly", or "yearly"
-    interval_days: int  # Average days between transactions
+    frequency: str  # "weekly", "biweekly", "monthly", ..., "yearly", or "custom"
+    interval_days: int  # Detected period in days
     average_amount: float  # Average transaction amount
     amount_variance: float  # Variance in amounts (percentage)
     transaction_count: int  # Number of transactions in pattern
@@ -25,28 +30,90 @@ class RecurringPattern:
     is_active: bool  # True if likely still active (recent transaction)
 
 
+@dataclass
+class MerchantColumns:
+    """
+    Transactions grouped into one contiguous, date-ordered segment per merchant.
+
+    Row arrays (ids, dates, amounts, category_codes) are aligned; segment g
+    spans rows starts[g]:starts[g] + counts[g]. category_codes index into
+    categories[g], numbered in order of first appearance within the segment.
+    """
+
+    merchants: List[str]
+    starts: np.ndarray
+    counts: np.ndarray
+    ids: np.ndarray  # int64
+    dates: np.ndarray  # datetime64[ns]
+    amounts: np.ndarray  # float64 absolute amounts
+    category_codes: np.ndarray  # int32
+    categories: List[List[str]]
+
+    def segment(self, group: int) -> slice:
+        """Row slice of a merchant segment."""
+        start = int(self.starts[group])
+        return slice(start, start + int(self.counts[group]))
+
+    def most_common_category(self, group: int) -> str:
+        """Most frequent category of a segment; ties go to the category seen first."""
+        counts = np.bincount(self.category_codes[self.segment(group)])
+        return self.categories[group][int(np.argmax(counts))]
+
+
 class RecurringDetector:
     """
     Detects recurring transaction patterns (subscriptions, bills, etc).
 
     Algorithm:
-    1. Group transactions by merchant name (fuzzy matching)
-    2. For each group, check if transactions occur at regular intervals
+    1. Group transactions by merchant key
+    2. Find each merchant's period from the autocorrelation of its daily
+       occurrence series (see _detect_periods)
     3. Verify amounts are similar (within ±10%)
     4. Require minimum 3 occurrences to establish pattern
-    5. Calculate confidence based on regularity and amount consistency
+    5. Calculate confidence based on period strength and amount consistency
+
+    Transactions are processed as columns: rows are ordered by merchant code
+    (then date), so every merchant is one contiguous segment. Amount
+    statistics for all merchants come from np.add.reduceat, and
+    autocorrelations from one batched FFT, instead of per-group Python loops.
+
+    Detected patterns are stored one per merchant. After the first full
+    scan, imports only re-detect the patterns of their own merchants via
+    add_transactions(), reading those merchants' rows through the
+    (project_id, merchant_key) index. An import therefore costs
+    O(transactions of the merchants it touches), whatever the size of the
+    rest of the project. Periods come from each merchant's whole date
+    series, so a merchant's own history is always re-read in full; no
+    running summary reproduces the full detection exactly.
     """
 
     # Thresholds
     MIN_OCCURRENCES = 3  # Minimum transactions to establish pattern
     AMOUNT_TOLERANCE = 0.10  # ±10% variance in amounts
-    INTERVAL_TOLERANCE = 0.20  # ±20% variance in intervals
     ACTIVE_THRESHOLD_DAYS = 60  # Pattern is "active" if transaction within 60 days
-
-    # Frequency detection (in days)
-    WEEKLY_RANGE = (5, 9)  # 7 days ± 2
-    MONTHLY_RANGE = (25, 35)  # 30 days ± 5
-    YEARLY_RANGE = (350, 380)  # 365 days ± 15
+    MIN_CONFIDENCE = 0.5  # Only confident patterns are returned
+
+    # Period detection (in days)
+    MIN_PERIOD = 5  # Shortest period searched
+    MAX_PERIOD = 400  # Longest period searched
+    PERIOD_TOLERANCE = 0.10  # Intervals within ±10% of the period count for it...
+    MIN_PERIOD_WINDOW = 2  # ...and at least ±2 days
+    MIN_PERIOD_STRENGTH = 0.5  # Weaker autocorrelation peaks are not periodic
+    HARMONIC_RATIO = 0.8  # Shortest lag this close to the strongest peak is the period
+    FFT_CHUNK_CELLS = 1 << 22  # Max (merchants x days) cells per FFT batch
+
+    # (name, period) of named frequencies; other periods are "custom"
+    FREQUENCIES = [
+        ("weekly", 7),
+        ("biweekly", 14),
+        ("monthly", 30),
+        ("bimonthly", 61),
+        ("quarterly", 91),
+        ("semiannual", 182),
+        ("yearly", 365),
+    ]
+
+    DAY = np.timedelta64(1, 'D')
 
     def __init__(self, db_session: Session, project_id: int):
         """
@@ -59,6 +126,10 @@ class RecurringDetector:
         self.db_session = db_session
         self.project_id = project_id
 
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+
     def detect_recurring_patterns(self) -> List[RecurringPattern]:
         """
         Detect all recurring transaction patterns in the project.
@@ -66,241 +137,610 @@ class RecurringDetector:
         Returns:
             List of RecurringPattern objects sorted by confidence
         """
-        # Load all transactions, sorted by date
-        transactions = (
-            self.db_session.query(Transaction)
-            .filter(Transaction.project_id == self.project_id)
-            .order_by(Transaction.fecha.asc())
-            .all()
-        )
+        columns = self.group_by_merchant(*self._load_columns())
+        return self._build_patterns(columns) if columns else []
+
+    def detect_in_columns(
+        self,
+        ids: np.ndarray,
+        fechas: np.ndarray,
+        conceptos: np.ndarray,
+        importes: np.ndarray,
+        categorias: np.ndarray
+    ) -> List[RecurringPattern]:
+        """
+        Detect recurring patterns in column arrays of transactions.
 
-        # Group by merchant
-        merchant_groups = self._group_by_merchant(transactions)
+        Args:
+            ids: Transaction IDs
+            fechas: datetime64 transaction dates, in ascending order
+            conceptos: Transaction descriptions
+            importes: Amounts
+            categorias: Categories
 
-        # Detect patterns in each group
-        patterns = []
-        for merchant_name, txns in merchant_groups.items():
-            if len(txns) >= self.MIN_OCCURRENCES:
-                pattern = self._analyze_pattern(merchant_name, txns)
-                if pattern and pattern.confidence >= 0.5:  # Only return confident patterns
-                    patterns.append(pattern)
+        Returns:
+            List of RecurringPattern objects sorted by confidence
+        """
+        # Normalize each distinct concept once
+        concept_codes, unique_conceptos = pd.factorize(conceptos, use_na_sentinel=False)
+        merchant_keys = np.array([normalize_merchant(concepto) for concepto in unique_conceptos], dtype=object)
+        columns = self.group_by_merchant(ids, fechas, merchant_keys[concept_codes], importes, categorias)
+        return self._build_patterns(columns) if columns else []
 
-        # Sort by confidence (descending)
-        patterns.sort(key=lambda p: p.confidence, reverse=True)
+    def _load_columns(self, merchants: Optional[List[str]] = None) -> tuple:
+        """
+        Load transaction columns sorted by date.
 
-        return patterns
+        Args:
+            merchants: Only load these merchants' transactions (optional)
 
-    def _group_by_merchant(self, transactions: List[Transaction]) -> Dict[str, List[Transaction]]:
+        Returns:
+            Tuple of (ids, fechas, merchant_keys, importes, categorias)
         """
-        Group transactions by merchant name.
+        query = (
+            select(
+                Transaction.id,
+                Transaction.fecha,
+                Transaction.merchant_key,
+                Transaction.importe,
+                Transaction.categoria
+            )
+            .where(Transaction.project_id == self.project_id)
+            .order_by(Transaction.fecha.asc(), Transaction.id.asc())
+        )
+        if merchants is not None:
+            query = query.where(Transaction.merchant_key.in_(merchants))
+        df = pd.read_sql_query(query, self.db_session.connection())
+
+        return (
+            df['id'].to_numpy(dtype='int64'),
+            pd.to_datetime(df['fecha'], format='ISO8601').to_numpy(),
+            df['merchant_key'].to_numpy(dtype=object),
+            df['importe'].to_numpy(dtype='float64'),
+            df['categoria'].to_numpy(dtype=object)
+        )
 
-        Uses fuzzy matching to group similar merchant names together.
+    def group_by_merchant(
+        self,
+        ids: np.ndarray,
+        fechas: np.ndarray,
+        merchant_keys: np.ndarray,
+        importes: np.ndarray,
+        categorias: np.ndarray
+    ) -> Optional[MerchantColumns]:
+        """
+        Group date-ordered transaction columns into merchant segments.
 
         Args:
-            transactions: List of all transactions
+            ids: Transaction IDs
+            fechas: datetime64 transaction dates, in ascending order
+            merchant_keys: Merchant key per transaction (None: no merchant)
+            importes: Amounts
+            categorias: Categories
 
         Returns:
-            Dictionary mapping merchant name to list of transactions
+            MerchantColumns (merchants in order of first appearance), None if
+            no transaction has a merchant
         """
-        groups = defaultdict(list)
+        if len(ids) == 0:
+            return None
 
-        for txn in transactions:
-            # Extract merchant name from concept
-            merchant = self._extract_merchant_name(txn.concepto)
-            if merchant:
-                groups[merchant].append(txn)
+        # Merchant codes numbered by first appearance (-1: no merchant)
+        merchant_codes, merchants = pd.factorize(pd.Series(merchant_keys, dtype=object))
 
-        return groups
+        # Order rows by merchant, keeping date order inside each merchant
+        order = np.argsort(merchant_codes, kind='stable')
+        order = order[merchant_codes[order] >= 0]
+        if len(order) == 0:
+            return None
 
-    def _extract_merchant_name(self, concepto: str) -> Optional[str]:
+        codes = merchant_codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        counts = np.diff(np.r_[starts, len(codes)])
+        category_codes, categories = self._segment_categories(categorias[order], starts, counts)
+
+        return MerchantColumns(
+            merchants=list(merchants[codes[starts]]),
+            starts=starts,
+            counts=counts,
+            ids=np.asarray(ids, dtype='int64')[order],
+            dates=np.asarray(fechas).astype('datetime64[ns]')[order],
+            amounts=np.abs(np.asarray(importes, dtype='float64')[order]),
+            category_codes=category_codes,
+            categories=categories
+        )
+
+    @staticmethod
+    def _segment_categories(categorias: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, List[List[str]]]:
         """
-        Extract a normalized merchant name from transaction concept.
+        Number each segment's categories in order of first appearance.
+
+        Args:
+            categorias: Category per row, rows grouped into segments
+            starts: First row of each segment
+            counts: Rows per segment
 
-        Strategy:
-        1. Find the first significant word (>3 chars)
-        2. Remove common prefixes (PAGO, COMPRA, etc)
-        3. Normalize case
+        Returns:
+            Tuple of (per-row code into its segment's list, category list per segment)
+        """
+        group_of_row = np.repeat(np.arange(len(starts)), counts)
+        global_codes, unique_categories = pd.factorize(categorias, use_na_sentinel=False)
+
+        # One key per (segment, category); order keys by segment, then first row
+        keys = group_of_row * (len(unique_categories) + 1) + global_codes
+        unique_keys, first_rows, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        key_groups = group_of_row[first_rows]
+        by_appearance = np.lexsort((first_rows, key_groups))
+
+        # Local code = rank of the key inside its segment
+        sorted_groups = key_groups[by_appearance]
+        group_starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        ranks = np.arange(len(by_appearance)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(by_appearance)]))
+        local_codes = np.empty(len(unique_keys), dtype=np.int32)
+        local_codes[by_appearance] = ranks
+
+        names = unique_categories[global_codes[first_rows[by_appearance]]]
+        categories = [list(chunk) for chunk in np.split(names, group_starts[1:])]
+        return local_codes[inverse.ravel()], categories
+
+    def _group_statistics(self, columns: MerchantColumns) -> Dict[str, np.ndarray]:
+        """
+        Compute period and amount statistics of every merchant segment.
 
         Args:
-            concepto: Transaction description
+            columns: Grouped transactions
 
         Returns:
-            Normalized merchant name or None
+            Dictionary of per-segment arrays: expected (period in days),
+            frequency (name), average_amount, amount_variance, confidence
+            and is_pattern
         """
-        if not concepto:
-            return None
+        starts, counts = columns.starts, columns.counts
+        group_of_row = np.repeat(np.arange(len(starts)), counts)
 
-        # Remove common prefixes
-        prefixes_to_remove = ['PAGO', 'COMPRA', 'RECIBO', 'CARGO', 'TRANSFERENCIA']
-        words = concepto.upper().split()
+        # Detect periods of the merchants with enough transactions
+        candidates = np.flatnonzero(counts >= self.MIN_OCCURRENCES)
+        periods = np.zeros(len(starts), dtype=np.int64)
+        strengths = np.zeros(len(starts))
+        periods[candidates], strengths[candidates] = self._detect_periods(columns, candidates)
+        expected, frequencies = self._name_periods(periods)
+        is_pattern = (counts >= self.MIN_OCCURRENCES) & (strengths >= self.MIN_PERIOD_STRENGTH)
 
-        # Filter out prefixes and short words
-        significant_words = [
-            w for w in words
-            if len(w) > 3 and w not in prefixes_to_remove and not w.isdigit()
-        ]
+        # Check amount consistency
+        amounts = columns.amounts
+        avg_amounts = np.add.reduceat(amounts, starts) / counts
+        safe_avg = np.where(avg_amounts == 0, 1.0, avg_amounts)
+        amount_variances = np.add.reduceat(np.abs(amounts - avg_amounts[group_of_row]) / safe_avg[group_of_row], starts) / counts
+        amount_variances[avg_amounts == 0] = 1.0
+
+        confidences = np.where(
+            amount_variances > self.AMOUNT_TOLERANCE,
+            0.5,  # Amounts too inconsistent, lower confidence but don't reject
+            self._calculate_confidence(strengths, amount_variances, counts)
+        )
+        is_pattern &= confidences >= self.MIN_CONFIDENCE
+
+        return {
+            'expected': expected,
+            'frequency': frequencies,
+            'average_amount': avg_amounts,
+            'amount_variance': amount_variances,
+            'confidence': confidences,
+            'is_pattern': is_pattern,
+        }
+
+    def _detect_periods(self, columns: MerchantColumns, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the dominant period of merchant segments by autocorrelation.
+
+        Each merchant's transactions are binned into a 0/1 series with one
+        entry per day since its first transaction. Its autocorrelation at lag
+        k counts the pairs of transaction days k days apart; the score of a
+        period p is the number of pairs within p ± window(p), divided by the
+        number of consecutive pairs (days - 1). A strictly periodic merchant
+        scores 1, and a skipped charge only removes one pair, so gaps barely
+        lower the score (unlike the average interval). The score expected
+        from randomly placed days is subtracted and the result rescaled, so
+        the peak strength is 0 for irregular merchants and 1 for exact ones.
 
-        if significant_words:
-            # Use first significant word as merchant name
-            return significant_words[0]
+        The period is the shortest lag whose strength is within HARMONIC_RATIO
+        of the strongest one (multiples of the period score about as high),
+        refined to the centroid of the autocorrelation around it.
 
-        return None
+        Autocorrelations of all merchants are computed with batched FFTs,
+        merchants being bucketed by padded series length.
 
-    def _analyze_pattern(self, merchant_name: str, transactions: List[Transaction]) -> Optional[RecurringPattern]:
+        Args:
+            columns: Grouped transactions
+            groups: Segments to analyze
+
+        Returns:
+            Tuple of (period in days, peak strength 0-1) arrays aligned with groups
         """
-        Analyze a group of transactions to detect recurring pattern.
+        periods = np.zeros(len(groups), dtype=np.int64)
+        strengths = np.zeros(len(groups))
+        if len(groups) == 0:
+            return periods, strengths
+
+        max_lag = self.MAX_PERIOD + self._period_window(self.MAX_PERIOD)
+
+        # Day offset of every row from its merchant's first transaction
+        day_numbers = columns.dates.astype('datetime64[D]').astype(np.int64)
+        starts, counts = columns.starts[groups], columns.counts[groups]
+        spans = day_numbers[starts + counts - 1] - day_numbers[starts] + 1
+
+        # FFT length: power of two holding the series plus max_lag zero padding
+        lengths = 1 << np.ceil(np.log2(spans + max_lag + 1)).astype(np.int64)
+        for length in np.unique(lengths):
+            bucket = np.flatnonzero(lengths == length)
+            chunk_size = max(1, self.FFT_CHUNK_CELLS // int(length))
+            for chunk_start in range(0, len(bucket), chunk_size):
+                chunk = bucket[chunk_start:chunk_start + chunk_size]
+                chunk_starts, chunk_counts = starts[chunk], counts[chunk]
+
+                # Rows of the chunk's segments, concatenated
+                rows = np.repeat(chunk_starts - np.cumsum(np.r_[0, chunk_counts[:-1]]), chunk_counts)
+                rows += np.arange(len(rows))
+                series = np.zeros((len(chunk), int(length)))
+                series[np.repeat(np.arange(len(chunk)), chunk_counts),
+                       day_numbers[rows] - np.repeat(day_numbers[chunk_starts], chunk_counts)] = 1.0
+
+                spectrum = np.fft.rfft(series, axis=1)
+                autocorrelation = np.rint(np.fft.irfft(spectrum * spectrum.conj(), n=int(length), axis=1)[:, :max_lag + 1])
+                periods[chunk], strengths[chunk] = self._strongest_period(autocorrelation, spans[chunk])
+
+        return periods, strengths
+
+    def _strongest_period(self, autocorrelation: np.ndarray, spans: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pick the period of each row of an autocorrelation matrix.
 
         Args:
-            merchant_name: Merchant identifier
-            transactions: List of transactions for this merchant
+            autocorrelation: Pair counts per (merchant, lag); lag 0 holds the number of days
+            spans: Days from first to last transaction (inclusive) per merchant
 
         Returns:
-            RecurringPattern if pattern detected, None otherwise
+            Tuple of (period in days, peak strength 0-1) arrays
         """
-        if len(transactions) < self.MIN_OCCURRENCES:
-            return None
+        merchants = np.arange(len(autocorrelation))
+        days = autocorrelation[:, 0]
+        last_lag = autocorrelation.shape[1] - 1
+        # Prefix sums, so the pairs within lags [low, high] are sums[high + 1] - sums[low]
+        pair_sums = np.pad(np.cumsum(autocorrelation, axis=1), ((0, 0), (1, 0)))
+        lag_sums = np.pad(np.cumsum(autocorrelation * np.arange(last_lag + 1), axis=1), ((0, 0), (1, 0)))
+
+        def window_bounds(period):
+            window = self._period_window(period)
+            return np.clip(period - window, 0, last_lag), np.clip(period + window, 0, last_lag) + 1
+
+        # Strength of every candidate lag. A period cannot exceed the mean
+        # interval (skipped charges only make that longer); longer lags would
+        # let merchants with many irregular days match by chance
+        candidate_lags = np.arange(self.MIN_PERIOD, self.MAX_PERIOD + 1)
+        low, high = window_bounds(candidate_lags)
+        lag_strengths = self._peak_strength(
+            pair_sums[:, high] - pair_sums[:, low],
+            days[:, None], spans[:, None], candidate_lags[None, :]
+        )
+        longest = (spans - 1) / np.maximum(days - 1, 1) * (1 + self.PERIOD_TOLERANCE)
+        lag_strengths[candidate_lags[None, :] > longest[:, None]] = 0.0
+
+        best = lag_strengths.max(axis=1)
+        fundamental = np.argmax(lag_strengths >= self.HARMONIC_RATIO * best[:, None], axis=1)
+        periods = candidate_lags[fundamental].astype(np.float64)
+
+        # Move each period to the centroid of the pairs around it
+        for _ in range(3):
+            low, high = window_bounds(np.rint(periods).astype(np.int64))
+            pairs = pair_sums[merchants, high] - pair_sums[merchants, low]
+            weighted = lag_sums[merchants, high] - lag_sums[merchants, low]
+            periods = np.where(pairs > 0, weighted / np.maximum(pairs, 1), periods)
+
+        periods = np.rint(periods).astype(np.int64)
+        low, high = window_bounds(periods)
+        strengths = self._peak_strength(pair_sums[merchants, high] - pair_sums[merchants, low], days, spans, periods)
+        return periods, np.where(best > 0, strengths, 0.0)
+
+    def _peak_strength(self, pairs, days, spans, period):
+        """
+        Rescale pair counts around a period to a 0-1 peak strength (broadcasting).
 
-        # Sort by date
-        transactions = sorted(transactions, key=lambda t: t.fecha)
+        Args:
+            pairs: Transaction-day pairs within period ± window
+            days: Number of transaction days
+            spans: Days from first to last transaction (inclusive)
+            period: Period in days
 
-        # Calculate intervals between transactions
-        intervals = []
-        for i in range(1, len(transactions)):
-            delta = (transactions[i].fecha - transactions[i-1].fecha).days
-            if delta > 0:  # Ignore same-day duplicates
-                intervals.append(delta)
+        Returns:
+            Peak strength, 0 when no stronger than randomly placed days
+        """
+        window = self._period_window(period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = pairs / np.maximum(days - 1, 1)
+            # Expected score if the same number of days were placed at random
+            chance = days * np.maximum(spans - period, 0) * (2 * window + 1) / spans ** 2
+            peak = np.where(chance < 1, (score - chance) / (1 - chance), 0.0)
+        return np.clip(peak, 0.0, 1.0)
+
+    def _period_window(self, period):
+        """Half-width in days of the interval range that counts for a period."""
+        return np.maximum(self.MIN_PERIOD_WINDOW, np.rint(np.asarray(period) * self.PERIOD_TOLERANCE).astype(np.int64))
+
+    def _name_periods(self, periods: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Snap periods to the nearest named frequency.
 
-        if not intervals:
-            return None
+        Args:
+            periods: Periods in days
 
-        # Calculate average interval
-        avg_interval = sum(intervals) / len(intervals)
+        Returns:
+            Tuple of (interval in days, frequency name) arrays; periods
+            matching no named frequency keep their value and are "custom"
+        """
+        intervals = periods.copy()
+        names = np.full(len(periods), "custom", dtype=object)
+        for name, interval in self.FREQUENCIES:
+            matches = np.abs(periods - interval) <= self._period_window(interval)
+            intervals[matches] = interval
+            names[matches] = name
+        return intervals, names
+
+    def _build_patterns(self, columns: MerchantColumns) -> List[RecurringPattern]:
+        """
+        Turn the merchant segments that qualify into RecurringPattern objects.
 
-        # Detect frequency
-        frequency, expected_interval = self._detect_frequency(avg_interval)
+        Args:
+            columns: Grouped transactions
 
-        if not frequency:
-            return None  # No recognizable pattern
+        Returns:
+            List of RecurringPattern objects sorted by confidence
+        """
+        stats = self._group_statistics(columns)
 
-        # Check interval consistency
-        interval_variance = self._calculate_variance(intervals, expected_interval)
-        if interval_variance > self.INTERVAL_TOLERANCE:
-            return None  # Too much variance in timing
+        now = datetime.now()
+        patterns = []
+        for group in np.flatnonzero(stats['is_pattern']):
+            rows = columns.segment(group)
+            last_date = pd.Timestamp(columns.dates[rows.stop - 1]).to_pydatetime()
+
+            # Check if pattern is still active
+            is_active = (now - last_date).days < self.ACTIVE_THRESHOLD_DAYS
+            interval = int(stats['expected'][group])
+
+            patterns.append(RecurringPattern(
+                merchant_name=columns.merchants[group],
+                category=columns.most_common_category(group),
+                frequency=stats['frequency'][group],
+                interval_days=interval,
+                average_amount=float(stats['average_amount'][group]),
+                amount_variance=float(stats['amount_variance'][group]),
+                transaction_count=int(columns.counts[group]),
+                last_date=last_date,
+                next_expected_date=last_date + timedelta(days=interval) if is_active else None,
+                confidence=float(stats['confidence'][group]),
+                transaction_ids=columns.ids[rows].tolist(),
+                is_active=is_active
+            ))
 
-        # Check amount consistency
-        amounts = [abs(txn.importe) for txn in transactions]
-        avg_amount = sum(amounts) / len(amounts)
-        amount_variance = self._calculate_variance(amounts, avg_amount)
+        # Sort by confidence (descending)
+        patterns.sort(key=lambda p: p.confidence, reverse=True)
 
-        if amount_variance > self.AMOUNT_TOLERANCE:
-            # Amounts too inconsistent, lower confidence but don't reject
-            confidence = 0.5
-        else:
-            # Calculate confidence based on consistency
-            confidence = self._calculate_confidence(interval_variance, amount_variance, len(transactions))
+        return patterns
 
-        # Predict next transaction date
-        last_date = transactions[-1].fecha
-        next_expected = last_date + timedelta(days=expected_interval)
+    # ------------------------------------------------------------------
+    # Stored patterns
+    # ------------------------------------------------------------------
 
-        # Check if pattern is still active
-        days_since_last = (datetime.now() - last_date).days
-        is_active = days_since_last < self.ACTIVE_THRESHOLD_DAYS
+    def get_data_version(self) -> int:
+        """
+        Get the project's current data version.
 
-        # Get category (use most common category)
-        categories = [txn.categoria for txn in transactions]
-        most_common_category = max(set(categories), key=categories.count)
+        Returns:
+            Counter bumped once per write transaction that inserts, deletes
+            or edits transaction data
+        """
+        return self.db_session.query(Project.data_version).filter(
+            Project.id == self.project_id
+        ).scalar() or 0
 
-        return RecurringPattern(
-            merchant_name=merchant_name,
-            category=most_common_category,
-            frequency=frequency,
-            interval_days=expected_interval,
-            average_amount=avg_amount,
-            amount_variance=amount_variance,
-            transaction_count=len(transactions),
-            last_date=last_date,
-            next_expected_date=next_expected if is_active else None,
-            confidence=confidence,
-            transaction_ids=[txn.id for txn in transactions],
-            is_active=is_active
-        )
+    def is_stored_current(self) -> bool:
+        """
+        Check if stored patterns reflect the current data.
 
-    def _detect_frequency(self, avg_interval: float) -> tuple[Optional[str], Optional[int]]:
+        Returns:
+            True if no transaction changed since they were computed
         """
-        Detect frequency pattern from average interval.
+        stored_version, data_version = self.db_session.query(
+            Project.recurring_version, Project.data_version
+        ).filter(Project.id == self.project_id).one()
+        return stored_version is not None and stored_version == data_version
 
-        Args:
-            avg_interval: Average days between transactions
+    def load_stored_patterns(self) -> Tuple[List[RecurringPattern], bool]:
+        """
+        Load the patterns stored by the last detection run.
+
+        Activity is re-evaluated against today's date, since it depends on
+        how long ago the last transaction happened.
 
         Returns:
-            Tuple of (frequency_name, expected_interval_days) or (None, None)
+            Tuple of (patterns sorted by confidence, True if no transaction
+            changed since they were detected)
         """
-        if self.WEEKLY_RANGE[0] <= avg_interval <= self.WEEKLY_RANGE[1]:
-            return ("weekly", 7)
-        elif self.MONTHLY_RANGE[0] <= avg_interval <= self.MONTHLY_RANGE[1]:
-            return ("monthly", 30)
-        elif self.YEARLY_RANGE[0] <= avg_interval <= self.YEARLY_RANGE[1]:
-            return ("yearly", 365)
-        else:
-            return (None, None)
+        records = (
+            self.db_session.query(RecurringPatternRecord)
+            .filter(RecurringPatternRecord.project_id == self.project_id)
+            .order_by(RecurringPatternRecord.confidence.desc(), RecurringPatternRecord.id)
+            .all()
+        )
+        return [self._pattern_from_record(record) for record in records], self.is_stored_current()
 
-    def _calculate_variance(self, values: List[float], expected: float) -> float:
+    def refresh_stored_patterns(
+        self,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None
+    ) -> List[RecurringPattern]:
         """
-        Calculate variance as a percentage.
+        Detect patterns from scratch and store them.
+
+        The data version is read before scanning, so edits made during
+        detection leave the stored result marked as outdated.
 
         Args:
-            values: List of actual values
-            expected: Expected value
+            progress_callback: Optional callback(message, current, total) called
+                before storing; exceptions it raises (e.g. cancellation) abort
+                without storing anything
 
         Returns:
-            Variance as a decimal (0.1 = 10% variance)
+            List of RecurringPattern objects sorted by confidence
         """
-        if not values or expected == 0:
-            return 1.0
+        data_version = self.get_data_version()
+        columns = self.group_by_merchant(*self._load_columns())
+        patterns = self._build_patterns(columns) if columns else []
 
-        deviations = [abs(v - expected) / expected for v in values]
-        return sum(deviations) / len(deviations)
+        if progress_callback:
+            progress_callback("Storing recurring patterns...", 0, 0)
 
-    def _calculate_confidence(self, interval_variance: float, amount_variance: float, count: int) -> float:
+        self.db_session.query(RecurringPatternRecord).filter(
+            RecurringPatternRecord.project_id == self.project_id
+        ).delete(synchronize_session=False)
+        self.db_session.add_all(self._record_from_pattern(pattern) for pattern in patterns)
+        self._set_stored_version(data_version)
+        self.db_session.commit()
+
+        return patterns
+
+    def add_transactions(self, transactions: Iterable, previous_version: int) -> None:
         """
-        Calculate confidence score for a recurring pattern.
+        Re-detect the patterns of the merchants of newly inserted transactions.
 
-        Args:
-            interval_variance: Variance in intervals (0-1)
-            amount_variance: Variance in amounts (0-1)
-            count: Number of transactions
+        Only those merchants' transactions are read: the cost is
+        O(transactions of the touched merchants), independent of the other
+        merchants. Does nothing if the stored result was already outdated
+        before the import (the next refresh rebuilds everything). Call it in
+        the same transaction as the insert, after inserting; the inserts must
+        be that transaction's only transaction changes. The caller commits.
 
-        Returns:
-            Confidence score 0-1
+        Args:
+            transactions: Inserted rows with a merchant_key
+            previous_version: get_data_version() read before inserting
         """
-        # Base confidence from consistency
-        interval_score = max(0, 1 - (interval_variance / self.INTERVAL_TOLERANCE))
-        amount_score = max(0, 1 - (amount_variance / self.AMOUNT_TOLERANCE))
+        merchants = list(dict.fromkeys(txn.merchant_key for txn in transactions if txn.merchant_key))
 
-        # Bonus for more data points (up to 10 transactions)
-        count_bonus = min(count / 10, 1.0) * 0.2
+        data_version = self.get_data_version()
+        stored_version = self.db_session.query(Project.recurring_version).filter(
+            Project.id == self.project_id
+        ).scalar()
+        if stored_version is None or stored_version != previous_version:
+            return  # Something else changed since the last detection
 
-        # Weighted average
-        confidence = (interval_score * 0.5 + amount_score * 0.3 + count_bonus)
+        if merchants:
+            columns = self.group_by_merchant(*self._load_columns(merchants))
+            patterns = self._build_patterns(columns) if columns else []
+
+            self.db_session.query(RecurringPatternRecord).filter(
+                RecurringPatternRecord.project_id == self.project_id,
+                RecurringPatternRecord.merchant_name.in_(merchants)
+            ).delete(synchronize_session=False)
+            self.db_session.add_all(self._record_from_pattern(pattern) for pattern in patterns)
 
-        return min(confidence, 1.0)
+        self._set_stored_version(data_version)
+        self.db_session.flush()
 
     def get_pattern_by_merchant(self, merchant_name: str) -> Optional[RecurringPattern]:
         """
         Get recurring pattern for a specific merchant.
 
+        Reads the stored pattern by key. If transactions changed since the
+        stored patterns were detected, only this merchant's transactions are
+        read and detected instead; the stored patterns are left for the next
+        refresh.
+
         Args:
             merchant_name: Merchant identifier
 
         Returns:
             RecurringPattern or None if not found
         """
-        patterns = self.detect_recurring_patterns()
-        for pattern in patterns:
-            if pattern.merchant_name.lower() == merchant_name.lower():
-                return pattern
-        return None
+        merchant_name = merchant_name.upper()
+        if not self.is_stored_current():
+            columns = self.group_by_merchant(*self._load_columns([merchant_name]))
+            patterns = self._build_patterns(columns) if columns else []
+            return patterns[0] if patterns else None
+
+        record = self.db_session.query(RecurringPatternRecord).filter(
+            RecurringPatternRecord.project_id == self.project_id,
+            RecurringPatternRecord.merchant_name == merchant_name
+        ).first()
+        return self._pattern_from_record(record) if record else None
+
+    def _set_stored_version(self, data_version: int) -> None:
+        """Record the data version stored patterns reflect."""
+        self.db_session.query(Project).filter(Project.id == self.project_id).update(
+            {Project.recurring_version: data_version}, synchronize_session=False
+        )
+        # Further edits in this transaction must outdate what was just stored
+        data_version_recorded(self.db_session, self.project_id)
+
+    def _pattern_from_record(self, record: RecurringPatternRecord) -> RecurringPattern:
+        """Convert a stored pattern, re-evaluating activity against today's date."""
+        is_active = (datetime.now() - record.last_date).days < self.ACTIVE_THRESHOLD_DAYS
+        return RecurringPattern(
+            merchant_name=record.merchant_name,
+            category=record.category,
+            frequency=record.frequency,
+            interval_days=record.interval_days,
+            average_amount=record.average_amount,
+            amount_variance=record.amount_variance,
+            transaction_count=record.transaction_count,
+            last_date=record.last_date,
+            next_expected_date=record.last_date + timedelta(days=record.interval_days) if is_active else None,
+            confidence=record.confidence,
+            transaction_ids=json.loads(record.transaction_ids),
+            is_active=is_active
+        )
+
+    def _record_from_pattern(self, pattern: RecurringPattern) -> RecurringPatternRecord:
+        """Convert a detected pattern into a stored record."""
+        return RecurringPatternRecord(
+            project_id=self.project_id,
+            merchant_name=pattern.merchant_name,
+            category=pattern.category,
+            frequency=pattern.frequency,
+            interval_days=pattern.interval_days,
+            average_amount=pattern.average_amount,
+            amount_variance=pattern.amount_variance,
+            transaction_count=pattern.transaction_count,
+            last_date=pattern.last_date,
+            confidence=pattern.confidence,
+            transaction_ids=json.dumps(pattern.transaction_ids)
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _calculate_confidence(self, period_strength, amount_variance, count):
+        """
+        Calculate confidence scores for recurring patterns.
+
+        Args:
+            period_strength: Autocorrelation peak strength (0-1), scalar or array
+            amount_variance: Variance in amounts (0-1), scalar or array
+            count: Number of transactions, scalar or array
+
+        Returns:
+            Confidence score 0-1 (array for array inputs)
+        """
+        # Base confidence from consistency
+        interval_score = np.clip(period_strength, 0, 1)
+        amount_score = np.maximum(0, 1 - (amount_variance / self.AMOUNT_TOLERANCE))
+
+        # Bonus for more data points (up to 10 transactions)
+        count_bonus = np.minimum(count / 10, 1.0) * 0.2
+
+        # Weighted average
+        confidence = (interval_score * 0.5 + amount_score * 0.3 + count_bonus)
+
+        return np.minimum(confidence, 1.0)
 
     def mark_as_ignored(self, pattern: RecurringPattern) -> None:
         """
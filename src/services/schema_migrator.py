@@ -0,0 +1,395 @@
+"""Versioned database schema migrations."""
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import Column, Float, Integer, String, Text, inspect, text
+
+from models.database import Base, DatabaseManager
+from models.movement_type import MovementType
+from models.transaction import Transaction
+from services.aggregate_service import AggregateService
+from utils.merchants import normalize_merchant
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SchemaMigrator:
+    """
+    Brings an existing database up to the current schema version.
+
+    Each migration step is a method taking an Alembic ``Operations`` object.
+    Steps are idempotent: the step is committed first and its version is
+    then recorded in a short transaction of its own, so an interrupted
+    upgrade re-runs the failed step. The applied version is recorded in the
+    ``schema_version`` table; when it is current, startup costs a single
+    query and Alembic is never imported.
+
+    Data backfills are set-based UPDATE statements applied in batches of
+    BATCH_SIZE rows, each committed on its own to keep write transactions
+    short.
+
+    Usage:
+        SchemaMigrator(db_manager).upgrade()
+    """
+
+    VERSION_TABLE = 'schema_version'
+    BATCH_SIZE = 5000
+
+    # Indexes declared on the models after their tables were first created,
+    # (name, table, columns)
+    PERFORMANCE_INDEXES = [
+        ('idx_project_method', 'transactions', ['project_id', 'categorization_method']),
+        ('idx_project_concepto', 'transactions', ['project_id', 'concepto']),
+    ]
+
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize schema migrator.
+
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_manager = db_manager
+        self.engine = db_manager.engine
+
+    @property
+    def migrations(self) -> List[Tuple[int, str, Callable]]:
+        """Ordered (version, description, step) list of all migrations."""
+        return [
+            (1, "AI categorization and tags columns", self._add_transaction_columns),
+            (2, "Movement type and categorization method backfill", self._backfill_transaction_metadata),
+            (3, "Training example index names", self._rename_training_indexes),
+            (4, "Persisted duplicate-detection key", self._add_dedupe_key),
+            (5, "Monthly category totals backfill", self._backfill_monthly_totals),
+            (6, "Performance indexes", self._create_performance_indexes),
+            (7, "Project data version and stored recurring patterns", self._add_data_version),
+            (8, "Persisted merchant key", self._add_merchant_key),
+            (9, "Recurring period detection", self._invalidate_recurring_patterns),
+            (10, "Training statistics index", self._add_training_stats_index),
+        ]
+
+    @property
+    def latest_version(self) -> int:
+        """Version the database ends up at after upgrade()."""
+        return self.migrations[-1][0]
+
+    def current_version(self) -> Optional[int]:
+        """
+        Read the applied schema version.
+
+        Returns:
+            Applied version, or None if the database has never been versioned
+        """
+        with self.engine.connect() as connection:
+            if not inspect(connection).has_table(self.VERSION_TABLE):
+                return None
+            return connection.execute(
+                text(f"SELECT MAX(version) FROM {self.VERSION_TABLE}")
+            ).scalar() or 0
+
+    def upgrade(self) -> int:
+        """
+        Apply all pending migrations.
+
+        Returns:
+            Number of migration steps applied
+        """
+        current = self.current_version()
+        if current is not None and current >= self.latest_version:
+            return 0
+
+        is_new_database = not inspect(self.engine).has_table('transactions')
+
+        # New tables (and their indexes) come straight from the models
+        Base.metadata.create_all(bind=self.engine)
+        self._ensure_version_table()
+
+        if is_new_database:
+            # create_all already produced the latest schema
+            self._set_version(self.latest_version)
+            logger.info(f"Created database schema at version {self.latest_version}")
+            return 0
+
+        from alembic.migration import MigrationContext
+        from alembic.operations import Operations
+
+        applied = 0
+        for version, description, step in self.migrations:
+            if current is not None and version <= current:
+                continue
+
+            logger.info(f"Applying schema migration {version}: {description}")
+            with self.engine.connect() as connection:
+                operations = Operations(MigrationContext.configure(connection))
+                step(operations)
+                connection.commit()
+            self._set_version(version)
+            applied += 1
+
+        logger.info(f"Database schema upgraded to version {self.latest_version}")
+        return applied
+
+    def _ensure_version_table(self) -> None:
+        """Create the version table if needed."""
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {self.VERSION_TABLE} ("
+                "version INTEGER PRIMARY KEY, "
+                "applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            ))
+
+    def _set_version(self, version: int) -> None:
+        """Record an applied version in its own transaction."""
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(f"INSERT OR IGNORE INTO {self.VERSION_TABLE} (version) VALUES (:version)"),
+                {'version': version}
+            )
+
+    def _run_batched(self, connection, statement: str, params: dict = None) -> int:
+        """
+        Repeat a batched UPDATE until it stops matching rows.
+
+        Each batch is committed on its own, so the statement must only match
+        rows that are still pending.
+
+        Args:
+            connection: Connection of the running step
+            statement: UPDATE restricted with ``LIMIT :batch_size`` in a subquery
+            params: Extra bind parameters
+
+        Returns:
+            Total number of updated rows
+        """
+        params = dict(params or {}, batch_size=self.BATCH_SIZE)
+        total = 0
+        while True:
+            updated = connection.execute(text(statement), params).rowcount
+            connection.commit()
+            total += updated
+            if updated < self.BATCH_SIZE:
+                return total
+
+    @staticmethod
+    def _columns(connection, table: str) -> set:
+        """Get the column names of a table."""
+        return {column['name'] for column in inspect(connection).get_columns(table)}
+
+    # ------------------------------------------------------------------
+    # Migration steps
+    # ------------------------------------------------------------------
+
+    def _add_transaction_columns(self, op) -> None:
+        """Add the AI metadata and tags columns to older transaction tables."""
+        existing = self._columns(op.get_bind(), 'transactions')
+        columns = [
+            Column('ai_confidence', Float, nullable=True),
+            Column('categorization_method', String(20), nullable=True),
+            Column('movement_type_enum', String(50), nullable=True),
+            Column('tags', Text, nullable=True),
+        ]
+        for column in columns:
+            if column.name not in existing:
+                op.add_column('transactions', column)
+                logger.info(f"Added column transactions.{column.name}")
+
+    def _backfill_transaction_metadata(self, op) -> None:
+        """Fill movement_type_enum and categorization_method for existing rows."""
+        connection = op.get_bind()
+
+        # Map every distinct movement text once, then update through a join table
+        movements = connection.execute(text(
+            "SELECT DISTINCT movimiento FROM transactions "
+            "WHERE movimiento IS NOT NULL AND movement_type_enum IS NULL"
+        )).scalars().all()
+
+        if movements:
+            connection.execute(text(
+                "CREATE TEMP TABLE movement_type_map (movimiento TEXT PRIMARY KEY, enum_value TEXT NOT NULL)"
+            ))
+            connection.execute(
+                text("INSERT INTO movement_type_map (movimiento, enum_value) VALUES (:movimiento, :enum_value)"),
+                [
+                    {'movimiento': movimiento, 'enum_value': MovementType.from_text(movimiento).value}
+                    for movimiento in movements
+                ]
+            )
+            updated = self._run_batched(connection, """
+                UPDATE transactions
+                SET movement_type_enum = (
+                    SELECT enum_value FROM movement_type_map
+                    WHERE movement_type_map.movimiento = transactions.movimiento
+                )
+                WHERE id IN (
+                    SELECT id FROM transactions
+                    WHERE movement_type_enum IS NULL AND movimiento IS NOT NULL
+                    LIMIT :batch_size
+                )
+            """)
+            connection.execute(text("DROP TABLE movement_type_map"))
+            logger.info(f"Mapped {len(movements)} movement types on {updated} transactions")
+
+        # Rows categorized before AI support came from keywords, or were edited by hand
+        updated = self._run_batched(connection, """
+            UPDATE transactions
+            SET categorization_method = CASE
+                WHEN categoria_original IS NULL THEN 'keyword' ELSE 'manual'
+            END
+            WHERE id IN (
+                SELECT id FROM transactions
+                WHERE categorization_method IS NULL
+                LIMIT :batch_size
+            )
+        """)
+        logger.info(f"Initialized categorization method on {updated} transactions")
+
+    def _rename_training_indexes(self, op) -> None:
+        """
+        Give the training example index its own name.
+
+        It used to be created as idx_project_category, colliding with the
+        transactions index of the same name (SQLite index names are global).
+        """
+        connection = op.get_bind()
+        owner = connection.execute(text(
+            "SELECT tbl_name FROM sqlite_master WHERE type = 'index' AND name = 'idx_project_category'"
+        )).scalar()
+
+        if owner == 'category_training_examples':
+            op.drop_index('idx_project_category', table_name='category_training_examples')
+            owner = None
+        if owner is None:
+            op.create_index('idx_project_category', 'transactions', ['project_id', 'categoria'])
+
+        op.create_index(
+            'idx_training_project_category', 'category_training_examples',
+            ['project_id', 'category'], if_not_exists=True
+        )
+
+    def _add_dedupe_key(self, op) -> None:
+        """Add, backfill and uniquely index transactions.dedupe_key."""
+        connection = op.get_bind()
+        if 'dedupe_key' not in self._columns(connection, 'transactions'):
+            op.add_column('transactions', Column('dedupe_key', String(16), nullable=True))
+
+        # Compute keys in SQL with the same hash as the importer
+        connection.connection.driver_connection.create_function(
+            'dedupe_key',
+            3,
+            lambda fecha, concepto, importe: Transaction.compute_dedupe_key(fecha, concepto or '', importe or 0.0),
+            deterministic=True
+        )
+
+        updated = self._run_batched(connection, """
+            UPDATE transactions
+            SET dedupe_key = dedupe_key(fecha, concepto, importe)
+            WHERE id IN (
+                SELECT id FROM transactions
+                WHERE dedupe_key IS NULL
+                LIMIT :batch_size
+            )
+        """)
+        logger.info(f"Backfilled dedupe_key for {updated} transactions")
+
+        # Only the oldest row of each duplicate group keeps the key; NULLs are
+        # allowed by the unique index (rows imported with skip_duplicates=False)
+        result = connection.execute(text("""
+            UPDATE transactions SET dedupe_key = NULL
+            WHERE dedupe_key IS NOT NULL
+              AND id NOT IN (
+                  SELECT MIN(id) FROM transactions
+                  WHERE dedupe_key IS NOT NULL
+                  GROUP BY project_id, dedupe_key
+              )
+        """))
+        if result.rowcount:
+            logger.info(f"Cleared dedupe_key on {result.rowcount} existing duplicate transactions")
+
+        op.create_index(
+            'uq_project_dedupe_key', 'transactions',
+            ['project_id', 'dedupe_key'], unique=True, if_not_exists=True
+        )
+
+    def _backfill_monthly_totals(self, op) -> None:
+        """Build monthly_category_totals for projects that have none yet."""
+        connection = op.get_bind()
+        project_ids = connection.execute(text("""
+            SELECT DISTINCT project_id FROM transactions
+            WHERE project_id NOT IN (SELECT DISTINCT project_id FROM monthly_category_totals)
+        """)).scalars().all()
+
+        # One project per transaction, with the same query AggregateService rebuilds with
+        for project_id in project_ids:
+            connection.execute(AggregateService.REBUILD_QUERY, {'project_id': project_id})
+            connection.commit()
+        logger.info(f"Backfilled monthly category totals for {len(project_ids)} projects")
+
+    def _create_performance_indexes(self, op) -> None:
+        """Create the indexes used by the hot read paths."""
+        for name, table, columns in self.PERFORMANCE_INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+    def _add_data_version(self, op) -> None:
+        """
+        Add the project data version columns.
+
+        The recurring_patterns table itself is created by create_all; existing
+        projects start with no stored patterns, so they are detected once.
+        """
+        existing = self._columns(op.get_bind(), 'projects')
+        columns = [
+            Column('data_version', Integer, nullable=False, server_default='0'),
+            Column('recurring_version', Integer, nullable=True),
+        ]
+        for column in columns:
+            if column.name not in existing:
+                op.add_column('projects', column)
+                logger.info(f"Added column projects.{column.name}")
+
+    def _add_merchant_key(self, op) -> None:
+        """
+        Add, backfill and index transactions.merchant_key.
+
+        Stored recurring results are keyed by merchant, so they are
+        invalidated and rebuilt from the new keys on the next refresh.
+        """
+        connection = op.get_bind()
+        if 'merchant_key' not in self._columns(connection, 'transactions'):
+            op.add_column('transactions', Column('merchant_key', String(100), nullable=True))
+
+        # Compute keys in SQL with the same normalizer as the importer
+        connection.connection.driver_connection.create_function(
+            'merchant_key', 1, normalize_merchant, deterministic=True
+        )
+
+        # Rows without a merchant keep NULL, so backfill by id range
+        # instead of "WHERE merchant_key IS NULL"
+        last_id = connection.execute(text("SELECT COALESCE(MAX(id), 0) FROM transactions")).scalar()
+        updated = 0
+        for start in range(0, last_id, self.BATCH_SIZE):
+            updated += connection.execute(
+                text("""
+                    UPDATE transactions SET merchant_key = merchant_key(concepto)
+                    WHERE id > :start AND id <= :end
+                """),
+                {'start': start, 'end': start + self.BATCH_SIZE}
+            ).rowcount
+            connection.commit()
+        logger.info(f"Backfilled merchant_key for {updated} transactions")
+
+        op.create_index(
+            'idx_project_merchant', 'transactions',
+            ['project_id', 'merchant_key'], if_not_exists=True
+        )
+        op.execute("UPDATE projects SET recurring_version = NULL")
+
+    def _invalidate_recurring_patterns(self, op) -> None:
+        """Make stored recurring patterns outdated so they are detected again."""
+        op.execute("UPDATE projects SET recurring_version = NULL")
+
+    def _add_training_stats_index(self, op) -> None:
+        """Cover the training statistics GROUP BY so it never reads example rows."""
+        op.create_index(
+            'idx_training_stats', 'category_training_examples',
+            ['project_id', 'category', 'source', 'times_used'], if_not_exists=True
+        )
+
@@ -2,10 +2,20 @@
 from typing import List, Optional
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, exists, func, select
 from models import Transaction
 
 
+def _tag_values():
+    """
+    Table-valued json_each() over a transaction's tags (SQLite JSON1).
+
+    json_each() raises on malformed JSON, so callers must also require
+    json_valid(tags) where they expand it, like get_tags() tolerates such rows.
+    """
+    return func.json_each(Transaction.tags).table_valued('value')
+
+
 class SearchService:
     """
     Provides advanced search and filtering capabilities for transactions.
@@ -99,25 +109,28 @@ class SearchService:
         if categories:
             query = query.filter(Transaction.categoria.in_(categories))
 
-        # Execute query
-        results = query.all()
-
-        # Apply tag filter (post-query since tags are JSON)
+        # Apply tag filter (any match) by expanding the JSON array in SQL
         if tags:
-            results = [
-                txn for txn in results
-                if any(tag in txn.get_tags() for tag in tags)
-            ]
-
-        # Sort results
-        if sort_by == "fecha":
-            results.sort(key=lambda t: t.fecha, reverse=sort_desc)
-        elif sort_by == "importe":
-            results.sort(key=lambda t: abs(t.importe), reverse=sort_desc)
-        elif sort_by == "categoria":
-            results.sort(key=lambda t: t.categoria, reverse=sort_desc)
+            tag_values = _tag_values()
+            query = query.filter(
+                Transaction.tags.isnot(None),
+                exists(
+                    select(tag_values.c.value)
+                    .where(func.json_valid(Transaction.tags), tag_values.c.value.in_(tags))
+                )
+            )
 
-        return results
+        # Sort in SQL
+        sort_columns = {
+            "fecha": Transaction.fecha,
+            "importe": func.abs(Transaction.importe),
+            "categoria": Transaction.categoria
+        }
+        if sort_by in sort_columns:
+            sort_column = sort_columns[sort_by]
+            query = query.order_by(sort_column.desc() if sort_desc else sort_column.asc(), Transaction.id)
+
+        return query.all()
 
     def get_all_categories(self) -> List[str]:
         """
@@ -142,18 +155,20 @@ class SearchService:
         Returns:
             Sorted list of tag names
         """
-        transactions = (
-            self.db_session.query(Transaction)
-            .filter(Transaction.project_id == self.project_id)
+        tag_values = _tag_values()
+        tags = (
+            self.db_session.query(tag_values.c.value)
+            .select_from(Transaction)
+            .join(tag_values, func.json_valid(Transaction.tags))
+            .filter(
+                Transaction.project_id == self.project_id,
+                Transaction.tags.isnot(None)
+            )
+            .distinct()
             .all()
         )
 
-        # Extract all tags
-        all_tags = set()
-        for txn in transactions:
-            all_tags.update(txn.get_tags())
-
-        return sorted(all_tags)
+        return sorted(tag[0] for tag in tags)
 
     def quick_search(self, text: str, limit: int = 50) -> List[Transaction]:
         """
@@ -0,0 +1,272 @@
+"""Compaction of near-duplicate AI training examples."""
+from typing import Callable, Dict, List, Optional
+from collections import defaultdict
+import numpy as np
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from models import CategoryTrainingExample
+from services.ai_categorization_service import AICategorizationService
+from utils.logger import setup_logger
+from utils.vectors import normalize_rows
+
+logger = setup_logger(__name__)
+
+
+class TrainingCompactionService:
+    """
+    Removes near-duplicate training examples within each category.
+
+    Every categorization compares the transaction against all training
+    examples, so near-identical rows from manual corrections, rules and
+    initial sampling only make the similarity scan slower. Examples whose
+    embeddings are more similar than DUPLICATE_SIMILARITY are merged into
+    the one kept: its usage statistics absorb theirs and they are deleted.
+
+    The kept example is the most trusted one (manual, then rule, then
+    initial), then the most used, then the oldest.
+
+    Usage:
+        report = TrainingCompactionService(session, project_id).compact()
+    """
+
+    DUPLICATE_SIMILARITY = 0.98  # Cosine similarity above which examples are merged
+    BLOCK_SIZE = 1024  # Rows per block of the similarity matrix
+    HOLDOUT_SIZE = 500  # Transactions used to measure accuracy before and after
+    DELETE_BATCH_SIZE = 500  # Ids per DELETE statement (SQLite variable limit)
+
+    SOURCE_PRIORITY = {'manual': 0, 'rule': 1, 'initial': 2}
+
+    # Evenly spaced transactions whose category has training examples and
+    # whose text is not itself a training example
+    HOLDOUT_QUERY = text("""
+        SELECT concepto, movimiento, categoria
+        FROM (
+            SELECT concepto, movimiento, categoria,
+                   ROW_NUMBER() OVER (ORDER BY id) - 1 AS position,
+                   COUNT(*) OVER () AS total
+            FROM transactions t
+            WHERE project_id = :project_id
+              AND categoria IN (
+                  SELECT category FROM category_training_examples WHERE project_id = :project_id
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM category_training_examples e
+                  WHERE e.project_id = :project_id AND e.concepto = t.concepto
+              )
+        )
+        WHERE position % MAX(1, total / :size) = 0
+          AND position / MAX(1, total / :size) < :size
+    """)
+
+    def __init__(self, db_session: Session, project_id: int):
+        """
+        Initialize training compaction service.
+
+        Args:
+            db_session: SQLAlchemy database session
+            project_id: Current project ID
+        """
+        self.db_session = db_session
+        self.project_id = project_id
+        self.ai_service = AICategorizationService(db_session, project_id)
+
+    def compact(
+        self,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        dry_run: bool = False
+    ) -> Dict[str, any]:
+        """
+        Merge and delete near-duplicate training examples.
+
+        Args:
+            progress_callback: Optional callback(message, current, total).
+                Exceptions it raises (e.g. cancellation) abort without committing;
+                it is not called after the commit.
+            dry_run: Report what would change without changing anything
+                (held-out embeddings are not cached either)
+
+        Returns:
+            Dictionary with the example counts and similarity matrix sizes
+            before and after, and the accuracy on held-out transactions
+            before and after (None when there are no held-out transactions)
+        """
+        logger.info(f"Starting training set compaction (dry run: {dry_run})...")
+
+        # STEP 1: Load example embeddings (the only full read of the table)
+        if progress_callback:
+            progress_callback("Loading training examples...", 0, 4)
+
+        rows = (
+            self.db_session.query(
+                CategoryTrainingExample.id,
+                CategoryTrainingExample.category,
+                CategoryTrainingExample.source,
+                CategoryTrainingExample.times_used,
+                CategoryTrainingExample.last_used,
+                CategoryTrainingExample.embedding
+            )
+            .filter(CategoryTrainingExample.project_id == self.project_id)
+            .all()
+        )
+        rows.sort(key=lambda row: (
+            row.category, self.SOURCE_PRIORITY.get(row.source, len(self.SOURCE_PRIORITY)),
+            -row.times_used, row.id
+        ))
+        if rows:
+            vectors = normalize_rows(np.array(
+                [np.frombuffer(row.embedding, dtype=np.float32) for row in rows]
+            ))
+        else:
+            vectors = np.empty((0, self.ai_service.EMBEDDING_DIM), dtype=np.float32)
+        categories = np.array([row.category for row in rows], dtype=object)
+
+        # STEP 2: Find near-duplicates within each category
+        if progress_callback:
+            progress_callback("Finding near-duplicates...", 1, 4)
+
+        merged = {}  # Kept row index -> indices of its duplicates
+        by_category = defaultdict(list)
+        for index, row in enumerate(rows):
+            by_category[row.category].append(index)
+        for indices in by_category.values():
+            indices = np.array(indices)
+            for keeper, duplicates in self._find_duplicates(vectors[indices]).items():
+                merged[indices[keeper]] = indices[duplicates]
+
+        removed = np.zeros(len(rows), dtype=bool)
+        for duplicates in merged.values():
+            removed[duplicates] = True
+
+        # STEP 3: Measure the accuracy impact on held-out transactions
+        if progress_callback:
+            progress_callback("Evaluating on held-out transactions...", 2, 4)
+
+        holdout = self.db_session.execute(
+            self.HOLDOUT_QUERY, {'project_id': self.project_id, 'size': self.HOLDOUT_SIZE}
+        ).all()
+        accuracy_before = accuracy_after = None
+        if holdout and len(rows):
+            holdout_vectors = normalize_rows(np.array(self.ai_service.generate_embeddings(
+                [(concepto, movimiento) for concepto, movimiento, _ in holdout],
+                progress_callback
+            )))
+            labels = np.array([categoria for _, _, categoria in holdout], dtype=object)
+            accuracy_before = self._accuracy(holdout_vectors, labels, vectors, categories)
+            accuracy_after = self._accuracy(
+                holdout_vectors, labels, vectors[~removed], categories[~removed]
+            )
+
+        # STEP 4: Merge usage statistics into the kept examples and delete the rest
+        if progress_callback:
+            progress_callback("Saving compacted training set...", 3, 4)
+
+        if merged and not dry_run:
+            self.db_session.execute(
+                update(CategoryTrainingExample),
+                [
+                    {
+                        'id': rows[keeper].id,
+                        'times_used': sum(rows[i].times_used for i in (keeper, *duplicates)),
+                        'last_used': max(
+                            (rows[i].last_used for i in (keeper, *duplicates) if rows[i].last_used),
+                            default=None
+                        )
+                    }
+                    for keeper, duplicates in merged.items()
+                ]
+            )
+            removed_ids = [rows[i].id for i in np.flatnonzero(removed)]
+            for start in range(0, len(removed_ids), self.DELETE_BATCH_SIZE):
+                (
+                    self.db_session.query(CategoryTrainingExample)
+                    .filter(CategoryTrainingExample.id.in_(removed_ids[start:start + self.DELETE_BATCH_SIZE]))
+                    .delete(synchronize_session=False)
+                )
+
+        # Last cancellable point, before anything is committed
+        if progress_callback:
+            progress_callback("Compaction complete!", 4, 4)
+
+        if dry_run:
+            self.db_session.rollback()
+        else:
+            # Also keeps the held-out embeddings cached
+            self.db_session.commit()
+            self.ai_service.invalidate_cache()
+
+        kept = int(len(rows) - removed.sum())
+        row_bytes = vectors.shape[1] * np.dtype(np.float32).itemsize
+        report = {
+            'examples_before': len(rows),
+            'examples_after': kept,
+            'removed': len(rows) - kept,
+            'matrix_mb_before': len(rows) * row_bytes / 1e6,
+            'matrix_mb_after': kept * row_bytes / 1e6,
+            'holdout_size': len(holdout),
+            'accuracy_before': accuracy_before,
+            'accuracy_after': accuracy_after,
+            'dry_run': dry_run
+        }
+
+        logger.info(f"Training set compaction complete: {report}")
+        return report
+
+    def _find_duplicates(self, vectors: np.ndarray) -> Dict[int, List[int]]:
+        """
+        Group near-duplicate rows, computing the similarity matrix blockwise.
+
+        Rows are visited in order; each row not yet merged keeps every later
+        unmerged row more similar than DUPLICATE_SIMILARITY as its duplicate.
+
+        Args:
+            vectors: Unit-length embeddings of one category, most trusted first
+
+        Returns:
+            Kept row index -> indices of the rows merged into it
+        """
+        removed = np.zeros(len(vectors), dtype=bool)
+        merged = {}
+        for start in range(0, len(vectors), self.BLOCK_SIZE):
+            similarity = vectors[start:start + self.BLOCK_SIZE] @ vectors.T
+            for offset, row in enumerate(similarity):
+                index = start + offset
+                if removed[index]:
+                    continue
+                duplicates = np.flatnonzero(row > self.DUPLICATE_SIMILARITY)
+                duplicates = duplicates[(duplicates > index) & ~removed[duplicates]]
+                if len(duplicates):
+                    removed[duplicates] = True
+                    merged[index] = duplicates.tolist()
+        return merged
+
+    def _accuracy(
+        self,
+        holdout: np.ndarray,
+        labels: np.ndarray,
+        vectors: np.ndarray,
+        categories: np.ndarray
+    ) -> float:
+        """
+        Accuracy of the AI categorizer's scoring on held-out transactions.
+
+        Scores each category like AICategorizationService.categorize_with_confidence:
+        a weighted sum of its best TOP_MATCH_WEIGHTS matches.
+
+        Args:
+            holdout: Unit-length held-out embeddings
+            labels: Their categories
+            vectors: Unit-length training example embeddings
+            categories: Category of each training example
+
+        Returns:
+            Fraction of held-out transactions assigned their category
+        """
+        weights = np.array(self.ai_service.TOP_MATCH_WEIGHTS)
+        names = np.unique(categories)
+        scores = np.empty((len(holdout), len(names)))
+        for column, name in enumerate(names):
+            similarity = holdout @ vectors[categories == name].T
+            top = -np.sort(-similarity, axis=1)[:, :len(weights)]
+            scores[:, column] = top @ weights[:top.shape[1]]
+        return float(np.mean(names[scores.argmax(axis=1)] == labels))
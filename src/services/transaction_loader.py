@@ -0,0 +1,133 @@
+"""Columnar loader for project transactions."""
+from typing import Dict
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from models.database import DatabaseManager
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TransactionLoader:
+    """
+    Loads a project's transactions straight into a typed DataFrame.
+
+    Runs a single SELECT instead of materializing ORM objects, and lets
+    SQLite aggregate the JSON tags array so no per-row decoding happens in
+    Python.
+    """
+
+    # Tags are aggregated with json_each; invalid JSON is treated as no tags,
+    # matching Transaction.get_tags()
+    LOAD_QUERY = text("""
+        SELECT
+            t.id AS id,
+            t.fecha AS "Fecha",
+            t.concepto AS "Concepto",
+            COALESCE(t.movimiento, '') AS "Movimiento",
+            t.importe AS "Importe",
+            t.categoria AS "Categoría",
+            t.ai_confidence AS "AI_Confidence",
+            t.categorization_method AS "Categorization_Method",
+            CASE
+                WHEN t.tags IS NOT NULL AND json_valid(t.tags) THEN
+                    (SELECT group_concat(j.value, ', ') FROM json_each(t.tags) AS j)
+            END AS "Tags",
+            COALESCE(t.source_file, '') AS "Source"
+        FROM transactions AS t
+        WHERE t.project_id = :project_id
+        ORDER BY t.fecha DESC, t.id DESC
+    """)
+
+    CATEGORICAL_COLUMNS = ['Categoría', 'Movimiento', 'Categorization_Method']
+
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize transaction loader.
+
+        Args:
+            db_manager: Database manager instance
+        """
+        self.db_manager = db_manager
+
+    def load_dataframe(self, project_id: int) -> pd.DataFrame:
+        """
+        Load all transactions of a project, newest first.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            DataFrame indexed by transaction id with datetime64 'Fecha',
+            float 'Importe'/'AI_Confidence', categorical
+            'Categoría'/'Movimiento'/'Categorization_Method' columns and a
+            categorical 'Periodo' ("YYYY-MM", categories in chronological order).
+            Empty DataFrame if the project has no transactions.
+        """
+        with self.db_manager.engine.connect() as connection:
+            df = pd.read_sql_query(
+                self.LOAD_QUERY,
+                connection,
+                params={'project_id': project_id},
+                index_col='id'
+            )
+
+        if df.empty:
+            return pd.DataFrame()
+
+        df['Fecha'] = pd.to_datetime(df['Fecha'], format='ISO8601')
+        df['Importe'] = df['Importe'].astype('float64')
+        df['AI_Confidence'] = df['AI_Confidence'].astype('float64')
+        df['Tags'] = df['Tags'].fillna('')
+        for column in self.CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype('category')
+        df['Periodo'] = self.month_periods(df['Fecha'])
+
+        logger.info(f"Loaded {len(df)} transactions for project {project_id}")
+        return df
+
+    @staticmethod
+    def month_periods(fechas: pd.Series) -> pd.Categorical:
+        """
+        Compute the "YYYY-MM" month of every date without formatting each row.
+
+        Dates are truncated to months with numpy and only the distinct months
+        are turned into strings.
+
+        Args:
+            fechas: datetime64 Series
+
+        Returns:
+            Categorical with chronologically ordered month categories
+        """
+        months = fechas.to_numpy().astype('datetime64[M]')
+        uniques, codes = np.unique(months, return_inverse=True)
+        return pd.Categorical.from_codes(codes, categories=[str(month) for month in uniques])
+
+    @staticmethod
+    def build_month_index(df: pd.DataFrame) -> Dict[str, slice]:
+        """
+        Map each month to the rows it occupies.
+
+        Rows are loaded sorted by date, so every month is a contiguous run and
+        filtering by month becomes a positional slice.
+
+        Args:
+            df: DataFrame returned by load_dataframe
+
+        Returns:
+            Dictionary of "YYYY-MM" -> slice of row positions (for df.iloc)
+        """
+        if df.empty:
+            return {}
+
+        codes = df['Periodo'].cat.codes.to_numpy()
+        categories = df['Periodo'].cat.categories
+        starts = np.flatnonzero(np.diff(codes)) + 1
+        bounds = np.concatenate(([0], starts, [len(codes)]))
+        return {
+            categories[codes[start]]: slice(int(start), int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        }
@@ -385,7 +385,8 @@ class DataProcessor:
         """Generate monthly summary of transactions.
 
         Args:
-            df: DataFrame with transaction data
+            df: DataFrame with transaction data, or pre-aggregated monthly
+                category totals (AggregateService.get_totals())
 
         Returns:
             DataFrame with monthly aggregated data
@@ -393,6 +394,18 @@ class DataProcessor:
         Raises:
             ValueError: If required columns are missing
         """
+        if "Total" in df.columns:
+            validate_dataframe_columns(df, ["Periodo", "Total", "Cantidad"])
+            months = pd.to_datetime(df["Periodo"], format="%Y-%m").dt.strftime("%B %Y")
+            monthly_data = df.groupby(months.rename("Fecha"), sort=False).agg({
+                "Total": "sum",
+                "Cantidad": "sum"
+            }).reset_index()
+            monthly_data.columns = pd.MultiIndex.from_tuples(
+                [("Fecha", ""), ("Importe", "sum"), ("Importe", "count")]
+            )
+            return monthly_data
+
         validate_dataframe_columns(df, ["Fecha", "Importe"])
 
         monthly_data = df.groupby(df["Fecha"].dt.strftime("%B %Y")).agg({
@@ -405,7 +418,8 @@ class DataProcessor:
         """Generate category summary of transactions.
 
         Args:
-            df: DataFrame with transaction data
+            df: DataFrame with transaction data, or pre-aggregated monthly
+                category totals (AggregateService.get_totals())
 
         Returns:
             DataFrame with category aggregated data
@@ -413,9 +427,20 @@ class DataProcessor:
         Raises:
             ValueError: If required columns are missing
         """
+        if "Total" in df.columns:
+            validate_dataframe_columns(df, ["Categoría", "Total", "Cantidad"])
+            category_data = df.groupby("Categoría").agg({
+                "Total": "sum",
+                "Cantidad": "sum"
+            }).reset_index()
+            category_data.columns = pd.MultiIndex.from_tuples(
+                [("Categoría", ""), ("Importe", "sum"), ("Importe", "count")]
+            )
+            return category_data
+
         validate_dataframe_columns(df, ["Categoría", "Importe"])
 
-        category_data = df.groupby("Categoría").agg({
+        category_data = df.groupby("Categoría", observed=True).agg({
             "Importe": ["sum", "count"]
         }).reset_index()
         return category_data
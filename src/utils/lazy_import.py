@@ -0,0 +1,59 @@
+"""Lazy module proxies for heavy dependencies."""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Lets a module keep the usual ``pd.DataFrame`` / ``go.Figure`` style while
+    deferring the import cost of pandas, plotly or sentence-transformers until
+    code actually uses them. Import errors surface at that first access.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize lazy module.
+
+        Args:
+            name: Absolute module name, e.g. 'plotly.graph_objects'
+        """
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        """Import the real module (once) and return it."""
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes the proxy itself does not have
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Get a module, importing it only when one of its attributes is used.
+
+    Args:
+        name: Absolute module name
+
+    Returns:
+        The module itself if it is already imported, otherwise a LazyModule proxy
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -1,48 +1,109 @@
 """Logging configuration for the application."""
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import threading
 from pathlib import Path
 
+LOG_DIR = Path("logs")
+LOG_FILE = "app.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate app.log at 5 MB...
+LOG_BACKUP_COUNT = 3  # ...keeping app.log.1 to app.log.3
 
-def setup_logger(name: str = __name__) -> logging.Logger:
-    """Setup application logger with file and console handlers.
+# Environment variable overriding the log level (e.g. DEBUG, WARNING)
+LOG_LEVEL_ENV = "SPENDSIGHT_LOG_LEVEL"
+DEFAULT_LOG_LEVEL = logging.INFO
+
+# Third-party loggers that would flood app.log at INFO; they only log from WARNING
+THIRD_PARTY_LOGGERS = (
+    'sqlalchemy', 'alembic', 'PIL', 'matplotlib', 'urllib3',
+    'sentence_transformers', 'transformers', 'huggingface_hub', 'filelock',
+)
+
+_listener = None
+_lock = threading.Lock()
 
-    Args:
-        name: Logger name (typically __name__ from calling module)
+
+def get_log_level() -> int:
+    """
+    Get the configured log level.
 
     Returns:
-        Configured logger instance
+        Level from SPENDSIGHT_LOG_LEVEL (name or number), INFO if unset or invalid
+    """
+    value = os.environ.get(LOG_LEVEL_ENV, "").strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper()) if value else None
+    return level if isinstance(level, int) else DEFAULT_LOG_LEVEL
+
+
+def _configure() -> None:
     """
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    Install the process-wide logging pipeline (once).
 
-    # Create logger
-    logger = logging.getLogger(name)
+    The root logger gets a single QueueHandler, so logging calls only put
+    records on a queue; a QueueListener thread writes them to a rotating
+    log file and, from WARNING up, to the console. Third-party libraries
+    propagate to the same root logger, so THIRD_PARTY_LOGGERS are raised
+    to WARNING.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        # Create logs directory if it doesn't exist
+        LOG_DIR.mkdir(exist_ok=True)
+
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_DIR / LOG_FILE,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(formatter)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.WARNING)
+        console_handler.setFormatter(formatter)
 
-    # Avoid adding handlers multiple times
-    if logger.handlers:
-        return logger
+        log_queue = queue.SimpleQueue()
+        level = get_log_level()
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        for name in THIRD_PARTY_LOGGERS:
+            logging.getLogger(name).setLevel(max(level, logging.WARNING))
 
-    logger.setLevel(logging.INFO)
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        # Flush queued records on exit
+        atexit.register(_listener.stop)
 
-    # File handler
-    file_handler = logging.FileHandler(log_dir / "app.log")
-    file_handler.setLevel(logging.INFO)
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.WARNING)
+def setup_logger(name: str = __name__) -> logging.Logger:
+    """Get an application logger.
 
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    Module loggers have no handlers of their own: records propagate to the
+    root logger's queue pipeline (see _configure). Use %-style arguments,
+    e.g. ``logger.debug("Matched %s", pattern)``, in hot paths so messages
+    are only formatted when the level is enabled.
 
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    Args:
+        name: Logger name (typically __name__ from calling module)
 
-    return logger
+    Returns:
+        Logger instance
+    """
+    _configure()
+    return logging.getLogger(name)
@@ -0,0 +1,62 @@
+"""Merchant normalization for transaction concepts."""
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Words BBVA puts in front of (or around) the merchant name
+BBVA_PREFIXES = frozenset({
+    'PAGO', 'PAGOS', 'COMPRA', 'COMPRAS', 'RECIBO', 'RECIBOS', 'CARGO', 'ADEUDO',
+    'ABONO', 'TRANSFERENCIA', 'TRANSF', 'BIZUM', 'TARJETA', 'DEVOLUCION',
+    'DEVOLUCIÓN', 'DOMICILIACION', 'DOMICILIACIÓN', 'FAVOR', 'RECIBIDA',
+    'REALIZADA', 'EMITIDA', 'INMEDIATA', 'CREDITO', 'CRÉDITO', 'DEBITO', 'DÉBITO',
+})
+
+# Location suffixes BBVA appends to card payments
+CITY_SUFFIXES = frozenset({
+    'MADRID', 'BARCELONA', 'VALENCIA', 'SEVILLA', 'MALAGA', 'MÁLAGA', 'BILBAO',
+    'ZARAGOZA', 'ALICANTE', 'MURCIA', 'PALMA', 'GRANADA', 'CORDOBA', 'CÓRDOBA',
+    'VALLADOLID', 'VIGO', 'GIJON', 'GIJÓN', 'CORUÑA', 'CORUNA', 'ESPAÑA', 'ESPANA',
+    'SPAIN', 'LUXEMBOURG', 'DUBLIN', 'IRELAND',
+})
+
+_WORD = re.compile(r'[^\W_]+')
+# Card numbers (masked or not), dates and references split into digit/X runs
+_NUMERIC = re.compile(r'[\dX]+')
+
+MIN_WORD_LENGTH = 4
+
+
+@lru_cache(maxsize=65536)
+def normalize_merchant(concepto: str) -> Optional[str]:
+    """
+    Get the merchant key of a transaction concept.
+
+    The concept is split into words at punctuation and whitespace; card
+    numbers, dates and other digit runs (including masked ``XXXX1234``
+    parts), BBVA prefixes such as PAGO or COMPRA, words shorter than
+    MIN_WORD_LENGTH and trailing city names are dropped. The first remaining
+    word, uppercased, is the merchant key. It always appears in the concept,
+    so it can also be used as a case-insensitive substring rule pattern.
+
+    Results are memoized: imports and detection call this for every row, and
+    bank exports repeat the same concepts many times.
+
+    Args:
+        concepto: Transaction description
+
+    Returns:
+        Merchant key, or None if the concept has no merchant-like word
+    """
+    if not isinstance(concepto, str):
+        return None
+
+    words = [
+        word for word in _WORD.findall(concepto.upper())
+        if len(word) >= MIN_WORD_LENGTH
+        and word not in BBVA_PREFIXES
+        and not _NUMERIC.fullmatch(word)
+    ]
+    while words and words[-1] in CITY_SUFFIXES:
+        words.pop()
+
+    return words[0] if words else None
@@ -0,0 +1,119 @@
+"""Cached column sort orders for DataFrame-backed views."""
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+
+class SortCache:
+    """
+    Sorts a DataFrame by one column at a time, reusing computed orders.
+
+    The first sort on a column runs one stable argsort over its typed values
+    (datetime, float, category ranks); the descending order is derived from
+    the ascending one by reversing its runs of equal keys, without another
+    argsort over the values. Ties keep their original relative order and
+    missing values (NaN, NaT, None) come last in both directions, matching
+    DataFrame.sort_values(kind='stable'). Repeated sorts reuse the cached
+    order and only reorder rows with DataFrame.take.
+
+    A cache belongs to one DataFrame: build a new one when the data changes.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize sort cache.
+
+        Args:
+            df: DataFrame to sort
+        """
+        self.df = df
+        self._orders: Dict[str, np.ndarray] = {}
+
+    def order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Get the row positions that sort the DataFrame by a column.
+
+        Args:
+            column: Column name
+            ascending: Sort direction
+
+        Returns:
+            Array of row positions
+        """
+        key = (column, ascending)
+        if key not in self._orders:
+            if ascending:
+                self._orders[key] = self._ascending_order(self.df[column])
+            else:
+                self._orders[key] = self._descending_order(column)
+        return self._orders[key]
+
+    def _ascending_order(self, series: pd.Series) -> np.ndarray:
+        """Stable ascending order with missing values last."""
+        missing = series.isna().to_numpy()
+        present = np.flatnonzero(~missing)
+        values = self._sort_key(series)[present]
+        return np.concatenate([present[np.argsort(values, kind='stable')], np.flatnonzero(missing)])
+
+    def _descending_order(self, column: str) -> np.ndarray:
+        """Stable descending order derived from the cached ascending one."""
+        ascending = self.order(column, True)
+        series = self.df[column]
+        count = int(series.notna().sum())
+        if count == 0:
+            return ascending
+
+        present = ascending[:count]
+        keys = self._sort_key(series)[present]
+        # Number the runs of equal keys, then put the runs in reverse order;
+        # rows within a run keep their ascending (original) order
+        runs = np.cumsum(np.r_[True, keys[1:] != keys[:-1]])
+        return np.concatenate([present[np.argsort(-runs, kind='stable')], ascending[count:]])
+
+    def invalidate(self, *columns: str) -> None:
+        """
+        Forget cached orders after values of some columns changed in place.
+
+        Args:
+            *columns: Column names whose orders are stale
+        """
+        for key in [key for key in self._orders if key[0] in columns]:
+            del self._orders[key]
+
+    def sorted(self, column: str, ascending: bool = True) -> pd.DataFrame:
+        """
+        Get the DataFrame sorted by a column.
+
+        Args:
+            column: Column name
+            ascending: Sort direction
+
+        Returns:
+            Reordered DataFrame (index labels are preserved)
+        """
+        return self.df.take(self.order(column, ascending))
+
+    @staticmethod
+    def _sort_key(series: pd.Series) -> np.ndarray:
+        """
+        Convert a column into an array numpy can argsort.
+
+        Unordered categoricals sort by category value, so categories added
+        after loading (appended at the end) still sort alphabetically;
+        ordered ones keep their declared order. Text sorts as strings.
+        Keys of missing values are placeholders: callers order them apart.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            if series.cat.ordered:
+                return codes
+            # Rank of each category among the sorted category values
+            rank = np.empty(len(series.cat.categories), dtype=np.int64)
+            rank[series.cat.categories.argsort()] = np.arange(len(rank))
+            keys = np.full(len(codes), -1, dtype=np.int64)
+            valid = codes >= 0
+            keys[valid] = rank[codes[valid]]
+            return keys
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+            return series.to_numpy()
+        return series.fillna('').astype(str).to_numpy()
@@ -0,0 +1,111 @@
+"""Startup profiling: import times and time to first window."""
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import List, Optional, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class StartupProfiler:
+    """
+    Records how long each module import takes, like ``python -X importtime``.
+
+    While installed, a meta path finder wraps the loader of every module
+    found by the regular finders so that executing the module is timed.
+    Nested imports are attributed to the importing module's cumulative time
+    only, giving the same self/cumulative breakdown as -X importtime.
+    Built-in and frozen modules (loaded before the profiler anyway) are not
+    timed.
+
+    Usage:
+        profiler = StartupProfiler()
+        profiler.install()
+        ...
+        root.after_idle(lambda: profiler.report("main window"))
+    """
+
+    def __init__(self):
+        """Initialize startup profiler; wall times are measured from here."""
+        self.started_at = time.perf_counter()
+        # (module, self µs, cumulative µs, nesting depth) in completion order
+        self.imports: List[Tuple[str, int, int, int]] = []
+        self._reported = 0
+        self._children: List[float] = []  # Child time per module being executed
+        self._finder: Optional[_TimingFinder] = None
+
+    def install(self) -> None:
+        """Start timing imports."""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def report(self, milestone: str) -> None:
+        """
+        Log the wall time to a milestone and the imports since the last report.
+
+        Args:
+            milestone: What just became visible, e.g. "project selector"
+        """
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        imports = self.imports[self._reported:]
+        self._reported = len(self.imports)
+
+        # Time spent in top-level imports (nested ones are included in them)
+        import_ms = sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000
+        logger.info(
+            f"Startup: {milestone} shown after {elapsed_ms:.0f} ms "
+            f"({len(imports)} modules imported in {import_ms:.0f} ms)"
+        )
+
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for module, self_us, cumulative_us, depth in imports:
+            lines.append(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth}{module}")
+        logger.info("Import breakdown before %s:\n%s", milestone, "\n".join(lines))
+
+    def _timed_exec(self, name: str, exec_module, module) -> None:
+        """Execute a module, recording its self and cumulative import time."""
+        depth = len(self._children)
+        self._children.append(0.0)
+        started = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - started
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += cumulative
+            self.imports.append((name, int((cumulative - children) * 1e6), int(cumulative * 1e6), depth))
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path finder that times the modules the other finders find."""
+
+    def __init__(self, profiler: StartupProfiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            # Built-in and frozen importers are shared classes; leave them alone
+            loader = spec.loader
+            if loader is not None and not isinstance(loader, type) and hasattr(loader, 'exec_module'):
+                exec_module = loader.exec_module
+                loader.exec_module = (
+                    lambda module, _exec=exec_module: self.profiler._timed_exec(fullname, _exec, module)
+                )
+            return spec
+        return None
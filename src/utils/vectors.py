@@ -0,0 +1,16 @@
+"""Vector helpers for embedding arrays."""
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale rows to unit length (zero rows stay zero).
+
+    Args:
+        vectors: 2-D array with one vector per row
+
+    Returns:
+        Array of the same shape with unit-length rows
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
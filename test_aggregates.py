@@ -0,0 +1,130 @@
+"""Test incremental maintenance of monthly/category aggregates."""
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import Base, DatabaseManager, Project, Transaction, MonthlyCategoryTotal
+from services.aggregate_service import AggregateService
+from utils.data_processor import DataProcessor
+
+
+def _create_database(db_path):
+    """Create a database with the tables these tests need."""
+    db_manager = DatabaseManager(db_path)
+    Base.metadata.create_all(
+        db_manager.engine,
+        tables=[
+            Project.__table__,
+            Transaction.__table__,
+            MonthlyCategoryTotal.__table__,
+        ]
+    )
+    return db_manager
+
+
+def _totals_by_cell(aggregates):
+    """Read aggregates as {(month, category): (total, count, income, expense)}."""
+    totals = aggregates.get_totals()
+    return {
+        (row.Periodo, row.Categoría): (
+            round(row.Total, 2), row.Cantidad, round(row.Ingresos, 2), round(row.Gastos, 2)
+        )
+        for row in totals.itertuples(index=False)
+    }
+
+
+def test_incremental_matches_rebuild():
+    """Incremental deltas must produce the same table as a full rebuild."""
+    print("\n" + "=" * 60)
+    print("Testing incremental aggregates")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = _create_database(os.path.join(temp_dir, 'test.db'))
+        session = db_manager.get_session()
+
+        project = Project(name="Aggregates")
+        session.add(project)
+        session.commit()
+
+        aggregates = AggregateService(session, project.id)
+
+        rows = [
+            (datetime(2024, 1, 5), "MERCADONA", -40.0, "🛒 Supermercado"),
+            (datetime(2024, 1, 20), "NOMINA", 1500.0, "💰 Ingreso"),
+            (datetime(2024, 2, 3), "MERCADONA", -35.5, "🛒 Supermercado"),
+            (datetime(2024, 2, 10), "DEVOLUCION AMAZON", 20.0, "📦 Amazon"),
+            (datetime(2024, 2, 11), "AMAZON", -60.0, "📦 Amazon"),
+        ]
+        transactions = []
+        for fecha, concepto, importe, categoria in rows:
+            txn = Transaction(
+                project_id=project.id,
+                fecha=fecha,
+                concepto=concepto,
+                importe=importe,
+                categoria=categoria
+            )
+            session.add(txn)
+            aggregates.add(txn.fecha, txn.categoria, txn.importe)
+            transactions.append(txn)
+        aggregates.flush()
+        session.commit()
+
+        totals = _totals_by_cell(aggregates)
+        assert totals[("2024-02", "📦 Amazon")] == (-40.0, 2, 20.0, -60.0)
+        print("✓ Import deltas applied")
+
+        # Move the last Amazon expense to another category
+        txn = transactions[-1]
+        aggregates.move(txn.fecha, txn.importe, txn.categoria, "❓ Otros")
+        txn.categoria = "❓ Otros"
+
+        # Delete the January income
+        removed = transactions[1]
+        aggregates.remove(removed.fecha, removed.categoria, removed.importe)
+        session.delete(removed)
+
+        aggregates.flush()
+        session.commit()
+
+        incremental = _totals_by_cell(aggregates)
+        assert ("2024-01", "💰 Ingreso") not in incremental
+        assert incremental[("2024-02", "📦 Amazon")] == (20.0, 1, 20.0, 0.0)
+        print("✓ Category move and delete applied")
+
+        aggregates.rebuild()
+        session.commit()
+        assert _totals_by_cell(aggregates) == incremental
+        print("✓ Incremental totals match full rebuild")
+
+        # Summaries from aggregates keep the transaction-level shape
+        category_summary = DataProcessor.get_category_summary(aggregates.get_totals())
+        assert ("Importe", "sum") in category_summary.columns
+        monthly_summary = DataProcessor.get_monthly_summary(aggregates.get_totals())
+        assert list(monthly_summary[("Fecha", "")]) == ["January 2024", "February 2024"]
+        print("✓ DataProcessor summaries accept aggregates")
+
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_incremental_matches_rebuild()
+        print("\nAll aggregate tests passed ✓")
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,147 @@
+"""Test duplicate detection during Excel import."""
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import DatabaseManager, Transaction, MonthlyCategoryTotal
+from services.migration_service import MigrationService
+from services.project_manager import ProjectManager
+
+
+ROWS = [
+    (datetime(2024, 1, 5), "RECIBO NETFLIX", "Recibo", -12.99),
+    (datetime(2024, 1, 7), "MERCADONA MADRID", "Pago con tarjeta", -54.30),
+    (datetime(2024, 1, 31), "NOMINA ACME", "Transferencia recibida", 1500.0),
+]
+
+
+def write_bbva_export(path, rows):
+    """Write rows as a 10-column BBVA account export."""
+    header = ["ID", "F.Valor", "Fecha", "Concepto", "Movimiento", "Importe",
+              "Divisa", "Disponible", "Divisa", "Observaciones"]
+    sheet = [["Informe BBVA"] + [None] * 9] + [[None] * 10] * 3 + [header]
+    for index, (fecha, concepto, movimiento, importe) in enumerate(rows):
+        sheet.append([index, fecha, fecha, concepto, movimiento, importe, "EUR", 1000.0, "EUR", ""])
+    pd.DataFrame(sheet).to_excel(path, sheet_name="Informe BBVA", header=False, index=False)
+
+
+def test_import_skips_duplicates():
+    """Re-imported rows are skipped per project, unless duplicate detection is off."""
+    print("\n" + "=" * 60)
+    print("Testing import duplicate detection")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        db_manager.create_tables()
+        project_manager = ProjectManager(db_manager)
+        migration_service = MigrationService(db_manager)
+
+        first = project_manager.create_project("First")
+        second = project_manager.create_project("Second")
+        unchecked = project_manager.create_project("Unchecked")
+
+        export = os.path.join(temp_dir, 'export.xlsx')
+        write_bbva_export(export, ROWS)
+
+        stats = migration_service.import_excel_to_project(first.id, [export])
+        assert stats == {'imported': 3, 'skipped': 0, 'errors': []}, stats
+
+        stats = migration_service.import_excel_to_project(first.id, [export])
+        assert stats == {'imported': 0, 'skipped': 3, 'errors': []}, stats
+
+        # Duplicate keys are only unique within a project
+        stats = migration_service.import_excel_to_project(second.id, [export])
+        assert stats == {'imported': 3, 'skipped': 0, 'errors': []}, stats
+
+        for _ in range(2):
+            stats = migration_service.import_excel_to_project(unchecked.id, [export], skip_duplicates=False)
+            assert stats == {'imported': 3, 'skipped': 0, 'errors': []}, stats
+
+        session = db_manager.get_session()
+
+        def transactions(project_id):
+            return session.query(Transaction).filter(Transaction.project_id == project_id).all()
+
+        assert len(transactions(first.id)) == 3
+        assert len(transactions(second.id)) == 3
+        expected_key = Transaction.compute_dedupe_key(*[ROWS[0][i] for i in (0, 1, 3)])
+        assert expected_key in {txn.dedupe_key for txn in transactions(first.id)}
+
+        stored = transactions(unchecked.id)
+        assert len(stored) == 6
+        assert all(txn.dedupe_key is None for txn in stored)
+
+        # Skipped rows are not counted in the aggregates
+        totals = session.query(MonthlyCategoryTotal.count).filter(
+            MonthlyCategoryTotal.project_id == first.id
+        ).all()
+        assert sum(row.count for row in totals) == 3
+
+        print("✅ Import duplicate detection test passed!")
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_failed_insert_aborts_import():
+    """A database error while inserting keeps none of the import's rows."""
+    print("\n" + "=" * 60)
+    print("Testing failed import insert")
+    print("=" * 60)
+
+    class FailingMigrationService(MigrationService):
+        """Fails the insert of the second file."""
+
+        calls = 0
+
+        def _insert_rows(self, session, rows):
+            self.calls += 1
+            if self.calls == 2:
+                raise RuntimeError("disk I/O error")
+            return super()._insert_rows(session, rows)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        db_manager.create_tables()
+        project = ProjectManager(db_manager).create_project("Failing")
+
+        exports = [os.path.join(temp_dir, 'first.xlsx'), os.path.join(temp_dir, 'second.xlsx')]
+        write_bbva_export(exports[0], ROWS[:2])
+        write_bbva_export(exports[1], ROWS[2:])
+
+        try:
+            FailingMigrationService(db_manager).import_excel_to_project(project.id, exports)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Insert failure was swallowed")
+
+        session = db_manager.get_session()
+        for model in (Transaction, MonthlyCategoryTotal):
+            assert session.query(model).filter(model.project_id == project.id).count() == 0, \
+                f"{model.__name__} rows were committed"
+
+        print("✅ Failed import insert test passed!")
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_import_skips_duplicates()
+    test_failed_insert_aborts_import()
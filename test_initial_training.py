@@ -0,0 +1,148 @@
+"""Test the batched initial training build."""
+import sys
+import os
+import re
+import zlib
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import (
+    Base, DatabaseManager, Project, Transaction, CategoryRule,
+    CategoryTrainingExample, TransactionEmbedding
+)
+from services.initial_training_service import InitialTrainingService
+
+
+class FakeModel:
+    """
+    Stands in for the sentence-transformers model; counts encode calls.
+
+    Texts differing only in digits get the same random vector, so
+    "COMPRA MERCADONA 1" and "COMPRA MERCADONA 2" are duplicates.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        self.encoded += len(texts)
+        return np.array([
+            np.random.default_rng(zlib.crc32(re.sub(r'\d', '', text).encode())).normal(size=8)
+            for text in texts
+        ], dtype=np.float32)
+
+
+def test_build_initial_training_batches_work():
+    """Examples come from edits, rules and samples with one encode and no duplicates."""
+    print("\n" + "=" * 60)
+    print("Testing batched initial training")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        Base.metadata.create_all(
+            db_manager.engine,
+            tables=[
+                Project.__table__, Transaction.__table__, CategoryRule.__table__,
+                CategoryTrainingExample.__table__, TransactionEmbedding.__table__
+            ]
+        )
+        session = db_manager.get_session()
+
+        project = Project(name="Training")
+        session.add(project)
+        session.commit()
+
+        start = datetime(2024, 1, 1)
+        for i in range(40):
+            session.add(Transaction(
+                project_id=project.id, fecha=start + timedelta(days=i), importe=-10.0,
+                concepto=f"COMPRA {'LIDL' if i % 4 == 0 else 'MERCADONA'} {i}",
+                movimiento="Pago con tarjeta", categoria="🛒 Supermercado"
+            ))
+        for i in range(8):
+            session.add(Transaction(
+                project_id=project.id, fecha=start + timedelta(days=i), importe=-9.99,
+                concepto=f"RECIBO NETFLIX {i}", categoria="Otros"
+            ))
+        edited = Transaction(
+            project_id=project.id, fecha=start, importe=-50.0,
+            concepto="GASOLINERA REPSOL", categoria="🚗 Transporte", categoria_original="Otros"
+        )
+        session.add(edited)
+        session.add(CategoryRule(project_id=project.id, pattern="netflix", category="🎬 Ocio"))
+        session.commit()
+
+        service = InitialTrainingService(session, project.id)
+        model = FakeModel()
+        service.ai_service._model = model
+
+        # A cancel at the last progress call leaves nothing committed
+        class Cancelled(Exception):
+            pass
+
+        def cancel_at_end(message, current, total):
+            if message == "Training complete!":
+                raise Cancelled()
+
+        try:
+            service.build_initial_training(cancel_at_end)
+            assert False, "The last progress call is made"
+        except Cancelled:
+            session.rollback()
+        assert session.query(CategoryTrainingExample).count() == 0
+        assert session.query(TransactionEmbedding).count() == 0
+        model.calls = model.encoded = 0
+        progress = []
+        stats = service.build_initial_training(lambda msg, cur, total: progress.append(msg))
+        print(f"Stats: {stats}, encode calls: {model.calls}")
+
+        assert stats['manual_edits'] == 1
+        assert stats['category_rules'] == service.EXAMPLES_PER_RULE, "Rule matches are capped"
+        # One medoid per distinct merchant: Mercadona and Lidl, and Netflix in Otros
+        assert stats['representatives'] == 3, stats
+        assert stats['total_examples'] == session.query(CategoryTrainingExample).count()
+        assert stats['categories_covered'] == 4
+        assert model.calls == 1, "All texts are encoded in one batch"
+        assert progress[-1] == "Training complete!"
+
+        samples = sorted(
+            re.sub(r'\d', '', example.concepto).strip() for example in
+            session.query(CategoryTrainingExample).filter_by(category="🛒 Supermercado")
+        )
+        assert samples == ["COMPRA LIDL", "COMPRA MERCADONA"], samples
+        # Manual, rule and pool texts are encoded once
+        assert model.encoded == 1 + 40 + 8, model.encoded
+        assert session.query(TransactionEmbedding).count() == model.encoded
+
+        training_stats = service.ai_service.get_training_stats()
+        assert training_stats['total_examples'] == stats['total_examples']
+        assert training_stats['sources'] == {'manual': 1, 'rule': 5, 'initial': 3}, training_stats
+        assert training_stats['categories']["🛒 Supermercado"] == 2
+        assert service.get_training_readiness(training_stats)['readiness'] == 'potential'
+
+        # A second build finds only duplicates of the examples, all cached
+        stats = service.build_initial_training()
+        assert stats['total_examples'] == 0, stats
+        assert model.calls == 1
+
+        print("✅ Initial training test passed!")
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_build_initial_training_batches_work()
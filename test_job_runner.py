@@ -0,0 +1,118 @@
+"""Test background job execution, progress delivery and cancellation."""
+import sys
+import os
+import time
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import DatabaseManager, Project
+from gui.job_runner import JobRunner
+
+
+class ManualRoot:
+    """Minimal stand-in for Tk: runs after() callbacks when pumped."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.thread = threading.current_thread()
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def pump(self, runner, timeout=5.0):
+        """Run scheduled callbacks until the runner is idle."""
+        deadline = time.time() + timeout
+        while runner.busy and time.time() < deadline:
+            callbacks, self.scheduled = self.scheduled, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.01)
+
+
+def test_job_runner():
+    """Jobs run off the Tk thread and report back through the queue."""
+    print("\n" + "=" * 60)
+    print("Testing job runner")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        db_manager.create_tables()
+        root = ManualRoot()
+        runner = JobRunner(root, db_manager)
+        events = []
+
+        def create_project(ctx):
+            assert threading.current_thread() is not root.thread
+            for step in range(3):
+                ctx.progress("Working...", step, 3)
+            ctx.session.add(Project(name="From job"))
+            ctx.session.commit()
+            return ctx.session.query(Project).count()
+
+        runner.submit(
+            "create-project",
+            create_project,
+            on_progress=lambda message, current, total: events.append(('progress', current)),
+            on_done=lambda result: events.append(('done', result))
+        )
+        root.pump(runner)
+        assert events == [('progress', 0), ('progress', 1), ('progress', 2), ('done', 1)]
+        print("✓ Progress and result delivered in order")
+
+        # Cancelled jobs roll back their session
+        started = threading.Event()
+        release = threading.Event()
+
+        def cancellable(ctx):
+            ctx.session.add(Project(name="Cancelled"))
+            ctx.session.flush()
+            started.set()
+            release.wait(5)
+            ctx.progress("Still working...", 1, 2)
+            ctx.session.commit()
+
+        job = runner.submit(
+            "cancellable",
+            cancellable,
+            on_done=lambda result: events.append(('done', result)),
+            on_cancelled=lambda: events.append(('cancelled', None))
+        )
+        started.wait(5)
+        job.cancel()
+        release.set()
+        root.pump(runner)
+        assert events[-1] == ('cancelled', None)
+
+        session = db_manager.get_session()
+        assert session.query(Project).filter_by(name="Cancelled").count() == 0
+        session.close()
+        print("✓ Cancellation rolls back the job session")
+
+        runner.submit("failing", lambda ctx: 1 / 0, on_error=lambda e: events.append(('error', type(e))))
+        root.pump(runner)
+        assert events[-1] == ('error', ZeroDivisionError)
+        print("✓ Errors delivered to on_error")
+
+        runner.shutdown()
+        db_manager.close()
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_job_runner()
+        print("\nAll job runner tests passed ✓")
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
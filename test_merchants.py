@@ -0,0 +1,45 @@
+"""Test merchant key normalization."""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from utils.merchants import normalize_merchant
+from services.categorization_service import CategorizationService
+
+
+def test_normalize_merchant():
+    """Card numbers, dates, BBVA prefixes and city suffixes never become the key."""
+    print("\n" + "=" * 60)
+    print("Testing merchant normalization")
+    print("=" * 60)
+
+    cases = [
+        ("RECIBO NETFLIX", "NETFLIX"),
+        ("NETFLIX MADRID", "NETFLIX"),
+        ("Pago con tarjeta 12/03/2024 4940XXXXXXXX1234 Mercadona Malaga", "MERCADONA"),
+        ("COMPRA AMAZON.ES S.L. BK8HHH12HHH EUR", "AMAZON"),
+        ("TRANSFERENCIA A FAVOR DE JUAN GARCIA", "JUAN"),
+        ("COMPRA TARJ. *1234 EN MADRID", "TARJ"),
+        ("PAGO EN MADRID", None),
+        ("BAR 24", None),
+        ("", None),
+        (None, None),
+    ]
+    for concepto, expected in cases:
+        key = normalize_merchant(concepto)
+        print(f"{concepto!r:70} -> {key}")
+        assert key == expected, f"{concepto!r}: expected {expected}, got {key}"
+
+    # Rule patterns are the lowercased key, which occurs in the concept
+    service = CategorizationService(db_session=None, project_id=None, enable_ai=False)
+    concepto = "Compra Amazon.es Marketplace"
+    pattern = service._extract_pattern(concepto)
+    assert pattern == "amazon" and pattern in concepto.lower()
+
+    print("✅ Merchant normalization test passed!")
+
+
+if __name__ == "__main__":
+    test_normalize_merchant()
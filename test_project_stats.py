@@ -0,0 +1,142 @@
+"""Test the grouped project stats query."""
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import DatabaseManager, Transaction, MonthlyCategoryTotal, RecurringPatternRecord
+from services.aggregate_service import AggregateService
+from services.project_manager import ProjectManager
+from services.recurring_detector import RecurringDetector
+
+
+def test_project_stats():
+    """Stats are grouped per project, and projects without transactions get empty stats."""
+    print("\n" + "=" * 60)
+    print("Testing project stats")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        db_manager.create_tables()
+        project_manager = ProjectManager(db_manager)
+
+        busy = project_manager.create_project("Busy")
+        other = project_manager.create_project("Other")
+        empty = project_manager.create_project("Empty")
+
+        session = db_manager.get_session()
+        for project_id, fecha, importe in [
+            (busy.id, datetime(2024, 1, 5), 1500.0),
+            (busy.id, datetime(2024, 3, 1), -40.5),
+            (busy.id, datetime(2024, 2, 10), -9.5),
+            (other.id, datetime(2023, 6, 1), -100.0),
+        ]:
+            session.add(Transaction(
+                project_id=project_id, fecha=fecha, concepto="MOVIMIENTO", importe=importe,
+                categoria="Otros"
+            ))
+        session.commit()
+
+        stats = project_manager._query_stats(session)
+        print(f"All stats: {stats}")
+        assert set(stats) == {busy.id, other.id}, "Projects without transactions have no row"
+        assert stats[busy.id] == {
+            'transaction_count': 3,
+            'earliest_date': datetime(2024, 1, 5),
+            'latest_date': datetime(2024, 3, 1),
+            'total_income': 1500.0,
+            'total_expenses': -50.0,
+        }, stats[busy.id]
+        assert stats[other.id]['total_income'] == 0.0, "No positive amounts sum to zero"
+        assert stats[other.id]['total_expenses'] == -100.0
+
+        assert project_manager._query_stats(session, other.id) == {other.id: stats[other.id]}
+        assert project_manager._query_stats(session, empty.id) == {}
+
+        assert project_manager.get_project_stats(busy.id) == stats[busy.id]
+        assert project_manager.get_project_stats(empty.id) == {
+            'transaction_count': 0,
+            'earliest_date': None,
+            'latest_date': None,
+            'total_income': 0.0,
+            'total_expenses': 0.0,
+        }
+
+        listed = {
+            project.name: project_stats
+            for project, project_stats in project_manager.list_projects_with_stats()
+        }
+        assert listed == {
+            "Busy": stats[busy.id],
+            "Other": stats[other.id],
+            "Empty": project_manager.get_project_stats(empty.id),
+        }, listed
+        assert len(project_manager.list_projects()) == 3
+
+        print("✅ Project stats test passed!")
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_delete_project_removes_derived_rows():
+    """Deleting a project also deletes its aggregates and stored recurring patterns."""
+    print("\n" + "=" * 60)
+    print("Testing project deletion")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        db_manager.create_tables()
+        project_manager = ProjectManager(db_manager)
+
+        deleted = project_manager.create_project("Deleted")
+        kept = project_manager.create_project("Kept")
+
+        session = db_manager.get_session()
+        for project_id in (deleted.id, kept.id):
+            for month in range(1, 6):
+                session.add(Transaction(
+                    project_id=project_id, fecha=datetime(2024, month, 3), concepto="RECIBO NETFLIX",
+                    importe=-12.99, categoria="🎬 Ocio"
+                ))
+            session.commit()
+            AggregateService(session, project_id).ensure_built()
+            RecurringDetector(session, project_id).refresh_stored_patterns()
+
+        def count(model, project_id):
+            return session.query(model).filter(model.project_id == project_id).count()
+
+        assert count(RecurringPatternRecord, deleted.id) == 1
+        assert count(MonthlyCategoryTotal, deleted.id) == 5
+        session.close()
+
+        assert project_manager.delete_project(deleted.id)
+
+        session = db_manager.get_session()
+        for model in (MonthlyCategoryTotal, RecurringPatternRecord):
+            assert count(model, deleted.id) == 0, f"{model.__name__} rows left behind"
+        assert count(RecurringPatternRecord, kept.id) == 1
+        assert count(MonthlyCategoryTotal, kept.id) == 5
+
+        print("✅ Project deletion test passed!")
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_project_stats()
+    test_delete_project_removes_derived_rows()
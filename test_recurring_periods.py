@@ -0,0 +1,53 @@
+"""Test autocorrelation-based period detection in RecurringDetector."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from services.recurring_detector import RecurringDetector
+
+
+def test_periods_with_gaps():
+    """Periods other than weekly/monthly/yearly are found, and skipped charges do not break detection."""
+    print("\n" + "=" * 60)
+    print("Testing recurring period detection")
+    print("=" * 60)
+
+    rng = np.random.default_rng(7)
+    start = pd.Timestamp('2023-01-05')
+    schedules = {
+        # Months 3 and 7 skipped: the average interval is no longer monthly
+        "RECIBO GIMNASIO": [start + pd.DateOffset(months=m) for m in range(14) if m not in (3, 7)],
+        "PAGO GUARDERIA": [start + pd.Timedelta(days=14 * k + int(rng.integers(-1, 2))) for k in range(20)],
+        "RECIBO SEGURO": [start + pd.DateOffset(months=3 * k) for k in range(6)],
+        "CARGO LAVANDERIA": [start + pd.Timedelta(days=45 * k) for k in range(8)],
+        "COMPRA MERCADONA": [start + pd.Timedelta(days=int(d)) for d in rng.integers(0, 700, 40)],
+    }
+    rows = sorted((fecha, concepto) for concepto, fechas in schedules.items() for fecha in fechas)
+
+    detector = RecurringDetector(db_session=None, project_id=None)
+    patterns = detector.detect_in_columns(
+        np.arange(1, len(rows) + 1),
+        np.array([fecha for fecha, _ in rows], dtype='datetime64[ns]'),
+        np.array([concepto for _, concepto in rows], dtype=object),
+        np.full(len(rows), -20.0),
+        np.full(len(rows), "🏠 Hogar", dtype=object)
+    )
+    found = {p.merchant_name: (p.frequency, p.interval_days) for p in patterns}
+    print(f"Found: {found}")
+
+    assert found["GIMNASIO"] == ("monthly", 30)
+    assert found["GUARDERIA"] == ("biweekly", 14)
+    assert found["SEGURO"] == ("quarterly", 91)
+    assert found["LAVANDERIA"] == ("custom", 45)
+    assert "MERCADONA" not in found, "Irregular purchases are not recurring"
+
+    print("✅ Recurring period detection test passed!")
+
+
+if __name__ == "__main__":
+    test_periods_with_gaps()
@@ -0,0 +1,218 @@
+"""Test persisted recurring patterns and the project data version."""
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import Base, DatabaseManager, Project, Transaction, RecurringPatternRecord
+from services.recurring_detector import RecurringDetector
+
+
+def test_stored_patterns_follow_data_version():
+    """Stored patterns stay current until transaction data changes."""
+    print("\n" + "=" * 60)
+    print("Testing stored recurring patterns")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        Base.metadata.create_all(
+            db_manager.engine,
+            tables=[Project.__table__, Transaction.__table__, RecurringPatternRecord.__table__]
+        )
+        session = db_manager.get_session()
+
+        project = Project(name="Recurring")
+        session.add(project)
+        session.commit()
+
+        start = datetime.now() - timedelta(days=150)
+        for month in range(5):
+            session.add(Transaction(
+                project_id=project.id,
+                fecha=start + timedelta(days=30 * month),
+                concepto="RECIBO NETFLIX",
+                importe=-12.99,
+                categoria="🎬 Ocio"
+            ))
+        session.commit()
+
+        detector = RecurringDetector(session, project.id)
+        assert detector.get_data_version() == 1, "One bump per write transaction, not per row"
+
+        patterns, is_current = detector.load_stored_patterns()
+        assert patterns == [] and not is_current, "Nothing stored before the first run"
+
+        detected = detector.refresh_stored_patterns()
+        patterns, is_current = detector.load_stored_patterns()
+        print(f"Stored: {[(p.merchant_name, p.frequency) for p in patterns]}")
+        assert is_current
+        assert [p.merchant_name for p in patterns] == [p.merchant_name for p in detected] == ["NETFLIX"]
+        assert patterns[0].transaction_ids == detected[0].transaction_ids
+        assert patterns[0].is_active and patterns[0].next_expected_date is not None
+
+        # Tag edits do not affect detection
+        txn = session.query(Transaction).first()
+        txn.set_tags(["streaming"])
+        session.commit()
+        assert detector.load_stored_patterns()[1], "Tag edits keep stored patterns current"
+
+        # Amount edits do, once per transaction however many rows change
+        for other in session.query(Transaction).all():
+            other.importe = -13.99
+        session.commit()
+        assert not detector.load_stored_patterns()[1], "Data edits outdate stored patterns"
+        assert detector.get_data_version() == 2
+
+        # A version recorded mid-transaction is outdated by later edits in it
+        txn.importe = -14.99
+        session.flush()
+        detector._set_stored_version(detector.get_data_version())
+        txn.importe = -15.99
+        session.commit()
+        assert not detector.is_stored_current(), "Edits after recording a version outdate it"
+
+        # Rows without a project reach the database's NOT NULL check untouched
+        session.add(Transaction(fecha=start, concepto="SIN PROYECTO", importe=-1.0, categoria="Otros"))
+        try:
+            session.flush()
+            assert False, "project_id is required"
+        except IntegrityError:
+            session.rollback()
+
+        print("✅ Stored recurring patterns test passed!")
+
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_add_transactions_updates_touched_merchants():
+    """Incremental updates on import match a full detection."""
+    print("\n" + "=" * 60)
+    print("Testing incremental recurring updates")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        Base.metadata.create_all(
+            db_manager.engine,
+            tables=[Project.__table__, Transaction.__table__, RecurringPatternRecord.__table__]
+        )
+        session = db_manager.get_session()
+
+        project = Project(name="Incremental")
+        session.add(project)
+        session.commit()
+
+        def add(concepto, fecha, importe, categoria="🎬 Ocio"):
+            txn = Transaction(project_id=project.id, fecha=fecha, concepto=concepto,
+                              importe=importe, categoria=categoria)
+            session.add(txn)
+            return txn
+
+        start = datetime.now() - timedelta(days=200)
+        for month in range(4):
+            add("RECIBO NETFLIX", start + timedelta(days=30 * month), -12.99)
+            add("PAGO GIMNASIO", start + timedelta(days=30 * month + 3), -30.0, "🏃 Deporte")
+        add("COMPRA SPOTIFY", start + timedelta(days=90), -9.99)
+        session.commit()
+
+        detector = RecurringDetector(session, project.id)
+        detector.refresh_stored_patterns()
+
+        # Count the rows each detection reads
+        loaded_rows = []
+        load_columns = detector._load_columns
+
+        def counting_load_columns(merchants=None):
+            columns = load_columns(merchants)
+            loaded_rows.append(len(columns[0]))
+            return columns
+
+        detector._load_columns = counting_load_columns
+        gym_before = detector.get_pattern_by_merchant("gimnasio")
+        assert gym_before is not None and gym_before.transaction_count == 4
+
+        # Import: new months for Netflix, an out-of-order Spotify history
+        new = [add("RECIBO NETFLIX", start + timedelta(days=30 * month), -12.99) for month in (4, 5)]
+        new += [add("COMPRA SPOTIFY", start + timedelta(days=30 * month), -9.99, "🎵 Música")
+                for month in (0, 1, 2, 4)]
+        version = detector.get_data_version()
+        session.flush()
+        detector.add_transactions(new, version)
+        session.commit()
+        assert loaded_rows == [6 + 5], "Only the Netflix and Spotify rows are read, not the gym's"
+
+        patterns, is_current = detector.load_stored_patterns()
+        expected = detector.detect_recurring_patterns()
+        print(f"Stored: {[(p.merchant_name, p.transaction_count) for p in patterns]}")
+        assert is_current, "Incremental update keeps stored patterns current"
+        assert sorted(p.merchant_name for p in patterns) == sorted(p.merchant_name for p in expected)
+        for pattern in expected:
+            stored = detector.get_pattern_by_merchant(pattern.merchant_name)
+            assert stored.transaction_ids == pattern.transaction_ids
+            assert stored.category == pattern.category
+            assert abs(stored.amount_variance - pattern.amount_variance) < 1e-9
+            assert abs(stored.confidence - pattern.confidence) < 1e-9
+
+        assert detector.get_pattern_by_merchant("SPOTIFY").transaction_count == 5
+        assert detector.get_pattern_by_merchant("GIMNASIO").transaction_ids == gym_before.transaction_ids
+
+        # Updates are skipped once something else outdated the stored result
+        session.query(Transaction).first().importe = -14.99
+        session.commit()
+        version = detector.get_data_version()
+        later = [add("RECIBO NETFLIX", start + timedelta(days=180), -12.99)]
+        session.flush()
+        detector.add_transactions(later, version)
+        session.commit()
+        assert not detector.is_stored_current(), "Stale results are left for a full refresh"
+
+        # The getter detects just the requested merchant instead of refreshing everything
+        loaded_rows.clear()
+        netflix = detector.get_pattern_by_merchant("netflix")
+        assert loaded_rows == [7], loaded_rows
+        assert not detector.is_stored_current()
+        expected = {p.merchant_name: p for p in detector.detect_recurring_patterns()}["NETFLIX"]
+        assert netflix.transaction_ids == expected.transaction_ids
+
+        # After deletes and a refresh, imports read the merchant's current rows
+        session.delete(later[0])
+        session.delete(new[0])
+        session.commit()
+        detector.refresh_stored_patterns()
+        version = detector.get_data_version()
+        later = [add("RECIBO NETFLIX", start + timedelta(days=210), -12.99)]
+        session.flush()
+        detector.add_transactions(later, version)
+        session.commit()
+        assert detector.is_stored_current()
+        netflix = detector.get_pattern_by_merchant("NETFLIX")
+        expected = {p.merchant_name: p for p in detector.detect_recurring_patterns()}["NETFLIX"]
+        assert netflix.transaction_ids == expected.transaction_ids
+        assert new[0].id not in netflix.transaction_ids and later[0].id in netflix.transaction_ids
+
+        print("✅ Incremental recurring updates test passed!")
+
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_stored_patterns_follow_data_version()
+    test_add_transactions_updates_touched_merchants()
@@ -0,0 +1,145 @@
+"""Test upgrading a pre-versioned database with SchemaMigrator."""
+import sys
+import os
+import sqlite3
+import tempfile
+import shutil
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import DatabaseManager
+from services.schema_migrator import SchemaMigrator
+from utils.merchants import normalize_merchant
+
+
+# Schema of databases created before AI categorization and schema versioning
+LEGACY_SCHEMA = """
+    CREATE TABLE projects (
+        id INTEGER NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        description TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL
+    );
+    CREATE TABLE transactions (
+        id INTEGER NOT NULL PRIMARY KEY,
+        project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+        fecha DATETIME NOT NULL,
+        concepto TEXT NOT NULL,
+        movimiento VARCHAR(50),
+        importe FLOAT NOT NULL,
+        categoria VARCHAR(100) NOT NULL,
+        categoria_original VARCHAR(100),
+        source_file VARCHAR(255),
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL
+    );
+    CREATE INDEX idx_project_date ON transactions (project_id, fecha);
+    CREATE INDEX ix_transactions_categoria ON transactions (categoria);
+"""
+
+# (project_id, fecha, concepto, movimiento, importe, categoria, categoria_original)
+LEGACY_TRANSACTIONS = [
+    (1, '2024-01-05 00:00:00.000000', 'RECIBO NETFLIX', 'Recibo', -12.99, 'Ocio', None),
+    (1, '2024-01-05 00:00:00.000000', 'RECIBO NETFLIX', 'Recibo', -12.99, 'Ocio', None),
+    (1, '2024-01-07 00:00:00.000000', 'COMPRA MERCADONA MADRID', 'Pago con tarjeta', -54.3, 'Supermercado', None),
+    (1, '2024-02-01 00:00:00.000000', 'NOMINA ACME', 'Transferencia recibida', 1500.0, 'Salario', 'Otros'),
+    (2, '2024-01-05 00:00:00.000000', 'RECIBO NETFLIX', 'Recibo', -12.99, 'Ocio', None),
+]
+
+
+def create_legacy_database(db_path):
+    """Write a database in the pre-versioned schema."""
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.executescript(LEGACY_SCHEMA)
+        connection.executemany(
+            "INSERT INTO projects (id, name, created_at, updated_at) "
+            "VALUES (?, ?, '2024-01-01 00:00:00', '2024-01-01 00:00:00')",
+            [(1, 'Main'), (2, 'Other')]
+        )
+        connection.executemany(
+            "INSERT INTO transactions (project_id, fecha, concepto, movimiento, importe, categoria, "
+            "categoria_original, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, '2024-01-01 00:00:00', '2024-01-01 00:00:00')",
+            LEGACY_TRANSACTIONS
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def test_upgrade_legacy_database():
+    """All steps apply once, backfill the new columns and create the indexes."""
+    print("\n" + "=" * 60)
+    print("Testing schema migration of a legacy database")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    db_manager = None
+    connection = None
+    try:
+        db_path = os.path.join(temp_dir, 'legacy.db')
+        create_legacy_database(db_path)
+
+        db_manager = DatabaseManager(db_path)
+        migrator = SchemaMigrator(db_manager)
+        migrator.BATCH_SIZE = 2  # Several committed batches per backfill
+
+        assert migrator.current_version() is None
+        assert migrator.upgrade() == 10
+        assert migrator.current_version() == 10
+        assert migrator.upgrade() == 0, "A current database applies no steps"
+
+        connection = sqlite3.connect(db_path)
+
+        rows = connection.execute(
+            "SELECT id, concepto, dedupe_key, merchant_key, movement_type_enum, categorization_method "
+            "FROM transactions ORDER BY id"
+        ).fetchall()
+        assert len(rows) == len(LEGACY_TRANSACTIONS)
+
+        # Only the oldest row of a duplicate group keeps its key
+        assert rows[0][2] is not None and rows[1][2] is None, rows[:2]
+        assert all(row[2] is not None for row in rows[2:])
+        assert rows[4][2] == rows[0][2], "Duplicate keys are unique per project only"
+
+        for _, concepto, _, merchant_key, movement_type, method in rows:
+            assert merchant_key == normalize_merchant(concepto)
+            assert movement_type is not None
+        assert [row[5] for row in rows] == ['keyword', 'keyword', 'keyword', 'manual', 'keyword']
+
+        totals = dict(connection.execute(
+            "SELECT project_id || ':' || month || ':' || category, count FROM monthly_category_totals"
+        ).fetchall())
+        assert totals == {
+            '1:2024-01:Ocio': 2,
+            '1:2024-01:Supermercado': 1,
+            '1:2024-02:Salario': 1,
+            '2:2024-01:Ocio': 1,
+        }, totals
+
+        project_columns = {row[1] for row in connection.execute("PRAGMA table_info(projects)")}
+        assert {'data_version', 'recurring_version'} <= project_columns
+
+        indexes = {
+            name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        for name in ('uq_project_dedupe_key', 'idx_project_merchant', 'idx_project_category',
+                     'idx_project_method', 'idx_project_concepto', 'idx_training_project_category',
+                     'idx_training_stats'):
+            assert name in indexes, f"Missing index {name}"
+
+        print("✅ Schema migration test passed!")
+    finally:
+        if connection:
+            connection.close()
+        if db_manager:
+            db_manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_upgrade_legacy_database()
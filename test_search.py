@@ -0,0 +1,92 @@
+"""Test SQL-side tag handling in SearchService."""
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import Base, DatabaseManager, Project, Transaction
+from services.search_service import SearchService
+
+
+def test_tag_search():
+    """Tag listing and tag filters must match the JSON arrays stored per transaction."""
+    print("\n" + "=" * 60)
+    print("Testing tag search")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        Base.metadata.create_all(
+            db_manager.engine,
+            tables=[Project.__table__, Transaction.__table__]
+        )
+        session = db_manager.get_session()
+
+        project = Project(name="Search")
+        other = Project(name="Other")
+        session.add_all([project, other])
+        session.commit()
+
+        rows = [
+            (project.id, datetime(2024, 1, 5), "MERCADONA", -40.0, ["food"]),
+            (project.id, datetime(2024, 1, 20), "HOTEL", -300.0, ["vacation", "work"]),
+            (project.id, datetime(2024, 2, 3), "TAXI", -25.0, ["work"]),
+            (project.id, datetime(2024, 2, 10), "NOMINA", 1500.0, []),
+            (other.id, datetime(2024, 2, 11), "AMAZON", -60.0, ["other-project"]),
+        ]
+        for project_id, fecha, concepto, importe, tags in rows:
+            txn = Transaction(
+                project_id=project_id,
+                fecha=fecha,
+                concepto=concepto,
+                importe=importe,
+                categoria="Test"
+            )
+            txn.set_tags(tags)
+            session.add(txn)
+        session.commit()
+
+        search_service = SearchService(session, project.id)
+
+        tags = search_service.get_all_tags()
+        print(f"Tags: {tags}")
+        assert tags == ["food", "vacation", "work"]
+
+        results = search_service.search(tags=["work"])
+        print(f"Tagged 'work': {[txn.concepto for txn in results]}")
+        assert [txn.concepto for txn in results] == ["TAXI", "HOTEL"]
+
+        results = search_service.search(tags=["food", "vacation"], sort_by="importe")
+        assert [txn.concepto for txn in results] == ["HOTEL", "MERCADONA"]
+
+        results = search_service.search(sort_by="fecha", sort_desc=False)
+        assert [txn.concepto for txn in results] == ["MERCADONA", "HOTEL", "TAXI", "NOMINA"]
+
+        # Rows whose tags are not valid JSON are skipped, not fatal
+        for concepto, raw_tags in [("EMPTY", ''), ("BROKEN", '["work"')]:
+            session.add(Transaction(
+                project_id=project.id, fecha=datetime(2024, 3, 1), concepto=concepto,
+                importe=-1.0, categoria="Test", tags=raw_tags
+            ))
+        session.commit()
+        assert search_service.get_all_tags() == ["food", "vacation", "work"]
+        results = search_service.search(tags=["work"])
+        assert [txn.concepto for txn in results] == ["TAXI", "HOTEL"]
+
+        print("✅ Tag search test passed!")
+
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_tag_search()
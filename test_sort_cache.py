@@ -0,0 +1,93 @@
+"""Test cached, stable DataFrame column sorting."""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from utils.sort_cache import SortCache
+
+
+def test_sort_cache_matches_stable_sort():
+    """Cached orders must match pandas' stable sort in both directions."""
+    print("\n" + "=" * 60)
+    print("Testing sort cache")
+    print("=" * 60)
+
+    df = pd.DataFrame(
+        {
+            'Fecha': pd.to_datetime(['2024-01-02', '2024-01-01', '2024-01-02', '2024-01-03']),
+            'Importe': [-10.0, 25.5, -10.0, 3.0],
+            'Categoría': pd.Categorical(['🛒 Supermercado', '💰 Ingreso', '🛒 Supermercado', '📦 Amazon']),
+            'Concepto': ['MERCADONA', 'NOMINA', 'MERCADONA', 'AMAZON'],
+        },
+        index=[101, 102, 103, 104]
+    )
+    cache = SortCache(df)
+
+    for column in df.columns:
+        for ascending in (True, False):
+            expected = df.sort_values(column, ascending=ascending, kind='stable').index
+            assert list(cache.sorted(column, ascending).index) == list(expected), (column, ascending)
+    print("✓ Orders match stable sort_values")
+
+    # Ties keep their original order in both directions
+    assert list(cache.sorted('Importe', False).index[-2:]) == [101, 103]
+    assert cache.order('Importe', True) is cache.order('Importe', True)
+    print("✓ Ties are stable and orders are cached")
+
+
+def test_sort_cache_puts_missing_values_last():
+    """NaN, NaT and None sort last in both directions, like sort_values."""
+    df = pd.DataFrame(
+        {
+            'Fecha': pd.to_datetime(['2024-01-02', None, '2024-01-01', '2024-01-02', None]),
+            'Importe': [3.0, float('nan'), -1.0, 3.0, 7.0],
+            'Categoría': pd.Categorical(['Ocio', None, 'Comida', 'Ocio', 'Comida']),
+            'Concepto': ['B', None, 'A', 'B', 'C'],
+        },
+        index=[1, 2, 3, 4, 5]
+    )
+    cache = SortCache(df)
+
+    for column in df.columns:
+        for ascending in (True, False):
+            expected = df.sort_values(column, ascending=ascending, kind='stable').index
+            assert list(cache.sorted(column, ascending).index) == list(expected), (column, ascending)
+    print("✓ Missing values sort last in both directions")
+
+
+def test_sort_after_edit_to_new_category():
+    """A category added by an edit sorts by value, not at the end."""
+    df = pd.DataFrame(
+        {'Categoría': pd.Categorical(['Comida', 'Transporte', 'Ocio', 'Comida'])},
+        index=[1, 2, 3, 4]
+    )
+    cache = SortCache(df)
+    cache.order('Categoría')
+
+    # Patch the loaded frame like MainWindow.on_transaction_changed does
+    df['Categoría'] = df['Categoría'].cat.add_categories(['Hogar'])
+    df.loc[2, 'Categoría'] = 'Hogar'
+    cache.invalidate('Categoría')
+
+    by_value = df['Categoría'].astype(str)
+    for ascending in (True, False):
+        expected = by_value.sort_values(ascending=ascending, kind='stable').index
+        assert list(cache.sorted('Categoría', ascending).index) == list(expected), ascending
+    print("✓ Categories added after loading sort alphabetically")
+
+
+if __name__ == "__main__":
+    try:
+        test_sort_cache_matches_stable_sort()
+        test_sort_cache_puts_missing_values_last()
+        test_sort_after_edit_to_new_category()
+        print("\nAll sort cache tests passed ✓")
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,66 @@
+"""Test lazy heavy imports and the startup profiler."""
+import sys
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).parent.resolve() / 'src'
+
+# Add src to path
+sys.path.insert(0, str(SRC))
+
+from utils.lazy_import import LazyModule, lazy_import
+
+
+def test_project_selector_imports_stay_light():
+    """The project selector path must not import pandas, numpy or plotly."""
+    print("\n" + "=" * 60)
+    print("Testing startup imports")
+    print("=" * 60)
+
+    # Fresh interpreter: this test process already imported everything
+    code = (
+        "import sys\n"
+        "from utils.startup_profiler import StartupProfiler\n"
+        "profiler = StartupProfiler()\n"
+        "profiler.install()\n"
+        "import models.database, services.schema_migrator, gui.project_selector\n"
+        "heavy = [m for m in ('pandas', 'numpy', 'plotly', 'sentence_transformers') if m in sys.modules]\n"
+        "timed = {name for name, _, _, _ in profiler.imports}\n"
+        "profiler.report('project selector')\n"
+        "print(heavy, 'gui.project_selector' in timed, 'sqlalchemy' in timed)\n"
+    )
+    # Run outside the source tree so the app's logs/ lands in a temp directory
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get('PYTHONPATH')])))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=temp_dir, env=env, capture_output=True, text=True, check=True
+        )
+    output = result.stdout.strip().splitlines()[-1]
+    print(f"Heavy modules, profiled: {output}")
+    assert output == "[] True True", output
+
+    print("✅ Startup imports test passed!")
+
+
+def test_lazy_module_loads_on_first_use():
+    """A lazy module imports the real one on first attribute access."""
+    assert lazy_import('os') is sys.modules['os'], "Already imported modules are returned as is"
+
+    proxy = LazyModule('this_module_does_not_exist')
+    try:
+        proxy.anything
+    except ImportError:
+        pass
+    else:
+        raise AssertionError("Missing modules fail on first use")
+
+    colorsys_proxy = LazyModule('colorsys')
+    assert colorsys_proxy.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    print("✅ Lazy module test passed!")
+
+
+if __name__ == "__main__":
+    test_project_selector_imports_stay_light()
+    test_lazy_module_loads_on_first_use()
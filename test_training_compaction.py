@@ -0,0 +1,132 @@
+"""Test merging near-duplicate AI training examples."""
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from models import (
+    Base, DatabaseManager, Project, Transaction, CategoryTrainingExample, TransactionEmbedding
+)
+from services.training_compaction_service import TrainingCompactionService
+
+RNG = np.random.default_rng(7)
+VECTORS = {name: RNG.normal(size=8).astype(np.float32) for name in ('a', 'b', 'c')}
+
+
+def near(name: str) -> np.ndarray:
+    """A vector almost identical to one of VECTORS."""
+    return VECTORS[name] + RNG.normal(scale=1e-3, size=8).astype(np.float32)
+
+
+class FakeModel:
+    """Stands in for the sentence-transformers model: "PAGO A 1" encodes near a."""
+
+    def encode(self, texts, **kwargs):
+        return np.array([near(text.split()[1].lower()) for text in texts])
+
+
+def test_compaction_merges_near_duplicates():
+    """Near-duplicates within a category are merged into the most trusted example."""
+    print("\n" + "=" * 60)
+    print("Testing training set compaction")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+    session = None
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'test.db'))
+        Base.metadata.create_all(
+            db_manager.engine,
+            tables=[
+                Project.__table__, Transaction.__table__,
+                CategoryTrainingExample.__table__, TransactionEmbedding.__table__
+            ]
+        )
+        session = db_manager.get_session()
+
+        project = Project(name="Compaction")
+        session.add(project)
+        session.commit()
+
+        last_used = datetime(2024, 5, 1)
+        # (concepto, category, source, times_used, last_used, vector)
+        examples = [
+            ("MERCADONA 1", "A", 'initial', 4, last_used, near('a')),
+            ("MERCADONA 2", "A", 'manual', 1, None, near('a')),
+            ("MERCADONA 3", "A", 'rule', 2, None, near('a')),
+            ("LIDL", "A", 'initial', 0, None, near('c')),
+            ("NETFLIX 1", "B", 'initial', 0, None, near('b')),
+            ("NETFLIX 2", "B", 'rule', 3, None, near('b')),
+            # Same vector as the A examples but another category: kept
+            ("MERCADONA 4", "B", 'initial', 0, None, near('a')),
+        ]
+        for concepto, category, source, times_used, used_at, vector in examples:
+            example = CategoryTrainingExample(
+                project_id=project.id, concepto=concepto, category=category,
+                source=source, times_used=times_used, last_used=used_at
+            )
+            example.set_embedding(vector)
+            session.add(example)
+        for i in range(6):
+            session.add(Transaction(
+                project_id=project.id, fecha=datetime(2024, 1, 1), importe=-1.0,
+                concepto=f"PAGO {'A' if i % 2 else 'B'} {i}", categoria='A' if i % 2 else 'B'
+            ))
+        session.commit()
+
+        service = TrainingCompactionService(session, project.id)
+        service.ai_service._model = FakeModel()
+
+        report = service.compact(dry_run=True)
+        print(f"Dry run: {report}")
+        assert report['removed'] == 3, report
+        assert session.query(CategoryTrainingExample).count() == len(examples)
+        assert session.query(TransactionEmbedding).count() == 0, "Dry runs cache nothing"
+
+        # A cancel at the last progress call leaves everything uncommitted
+        class Cancelled(Exception):
+            pass
+
+        def cancel_at_end(message, current, total):
+            if message == "Compaction complete!":
+                raise Cancelled()
+
+        try:
+            service.compact(cancel_at_end)
+            assert False, "The last progress call is made"
+        except Cancelled:
+            session.rollback()
+        assert session.query(CategoryTrainingExample).count() == len(examples)
+
+        report = service.compact()
+        print(f"Report: {report}")
+        assert report['examples_before'] == 7 and report['examples_after'] == 4
+        assert report['matrix_mb_after'] < report['matrix_mb_before']
+        assert report['holdout_size'] == 6
+        assert report['accuracy_before'] == report['accuracy_after'] == 1.0
+
+        kept = {e.concepto: e for e in session.query(CategoryTrainingExample)}
+        assert sorted(kept) == ["LIDL", "MERCADONA 2", "MERCADONA 4", "NETFLIX 2"], sorted(kept)
+        # The manual example absorbed the usage of the examples merged into it
+        assert kept["MERCADONA 2"].times_used == 7
+        assert kept["MERCADONA 2"].last_used == last_used
+        assert kept["NETFLIX 2"].times_used == 3
+
+        assert service.compact()['removed'] == 0, "Compaction is idempotent"
+
+        print("✅ Training compaction test passed!")
+    finally:
+        if session:
+            session.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_compaction_merges_near_duplicates()